@@ -14,15 +14,81 @@ Usage:
 from __future__ import annotations
 
 import json
+import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import numpy as np
 from rich.console import Console
 from rich.table import Table
 
 from src.core.signature import Signature
 from src.library.manager import LibraryManager
-from src.scoring.engine import ScoringEngine
+
+# Per-signature solver budgets. Backtest first runs every signature with the
+# fast budget and re-runs only those that timed out with the full one.
+FAST_Z3_TIMEOUT_MS = 2000
+FAST_MACE4_TIMEOUT = 2
+Z3_TIMEOUT_MS = 30000
+MACE4_TIMEOUT = 30
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _loads(data: bytes) -> dict:
+    """Parse a discovery file's bytes, using orjson when installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dumps(obj: dict) -> bytes:
+    """Serialize a discovery with 2-space indent, using orjson when installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode()
+
+
+def _solver_key(sig: Signature) -> str:
+    """Key identifying everything about `sig` that the model finders see.
+
+    Unlike the fingerprint (which only captures shape), this includes
+    operation names/domains and the exact axiom equations, so two
+    discoveries with equal keys are guaranteed the same spectrum.
+    """
+    return json.dumps([
+        [s.name for s in sig.sorts],
+        [[op.name, list(op.domain), op.codomain] for op in sig.operations],
+        [[a.kind.value, repr(a.equation)] for a in sig.axioms],
+    ])
+
+
+def _write_discovery(item: tuple[Path, dict, bytes]) -> bool:
+    """Write one updated discovery file.
+
+    The payload is written to a sibling ``.json.tmp`` file and renamed over
+    the original, so a crash mid-write never leaves a truncated discovery.
+
+    Returns True if the file was rewritten; False if the serialized content
+    is byte-identical to what is on disk (nothing to write) or on error.
+    """
+    path, payload, current = item
+    new_bytes = _dumps(payload)
+    if new_bytes == current:
+        return False
+    tmp = path.with_suffix(".json.tmp")
+    try:
+        tmp.write_bytes(new_bytes)
+        os.replace(tmp, path)
+    except OSError:
+        tmp.unlink(missing_ok=True)
+        return False
+    return True
 
 
 def run_backtest(
@@ -60,85 +126,129 @@ def run_backtest(
 
     console.print(f"\n[bold]Backtesting {len(discoveries)} discoveries[/bold] (max_size={max_size})\n")
 
+    # Imported here so early exits (no discoveries, unknown --id) skip it
+    from src.scoring.engine import ScoringEngine
+
     scorer = ScoringEngine()
 
     # Build fingerprint set excluding discovered structures themselves,
     # so each discovery is still "novel" relative to known structures
     # (not penalized for its own existence in the library).
-    known_fps = set(library.known_fingerprints())
-
-    table = Table(title="Backtest Results")
-    table.add_column("ID", style="cyan", no_wrap=True)
-    table.add_column("Name", style="white", max_width=30)
-    table.add_column("Orig Score", justify="right")
-    table.add_column("New Score", justify="right")
-    table.add_column("Delta", justify="right")
-    table.add_column("Models", justify="right")
-    table.add_column("Status", justify="center")
+    known_fps = library.known_fingerprints_frozen()
 
     results = []
-    # Track which discovery files to update on PASS
-    updates: list[tuple[dict, float, dict]] = []  # (disc_data, new_score, new_breakdown)
+    # Table rows, collected during both phases and rendered once at the end
+    rows: list[tuple[str, ...]] = []
+    # Row positions and scores of re-scored discoveries, for the delta column
+    scored_rows: list[int] = []
+    orig_scores: list[float] = []
+    new_scores: list[float] = []
+    # Track which discovery files to update on PASS, as parallel columns
+    update_ids: list[str] = []
+    update_orig: list[float] = []
+    update_scores: list[float] = []
+    update_breakdowns: list[dict] = []
 
     discovered_dir = Path(library_path) / "discovered"
 
     # Phase 1: Parse all signatures, collecting valid ones for parallel spectrum computation
-    parsed: list[tuple[int, dict, Signature]] = []  # (index, disc, sig)
-    for i, disc in enumerate(discoveries):
+    # (disc, sig, id, name, orig_score, orig_had_models, own_fp): per-discovery
+    # fields are read once here and reused in Phase 3.
+    parsed: list[tuple[dict, Signature, str, str, float, bool, str | None]] = []
+    for disc in discoveries:
         disc_id = disc.get("id", "?")
         disc_name = disc.get("name", "?")
         orig_score = disc.get("score", 0.0)
 
         try:
             sig = Signature.from_dict(disc["signature"])
-            parsed.append((i, disc, sig))
+            parsed.append((
+                disc, sig, disc_id, disc_name, orig_score,
+                disc.get("score_breakdown", {}).get("has_models", 0) > 0,
+                disc.get("fingerprint"),
+            ))
         except Exception as e:
             results.append({"status": "FAIL", "id": disc_id, "reason": f"parse error: {e}"})
-            table.add_row(
+            rows.append((
                 disc_id, disc_name,
                 f"{orig_score:.3f}", "ERR", "—", "—",
                 "[red]FAIL[/red]",
-            )
+            ))
             console.print(f"  [red]{disc_id}: Failed to reconstruct signature: {e}[/red]")
 
     # Phase 2: Compute spectra in parallel for all valid signatures
     if parsed:
-        from src.solvers.parallel import parallel_compute_spectra
-
-        z3_timeout_ms = 30000
-        mace4_timeout = 30
-        work_items = [
-            (sig, 2, max_size, 10, z3_timeout_ms, mace4_timeout)
-            for _, _, sig in parsed
-        ]
-
+        from src.solvers.parallel import iter_compute_spectra
+
+        # Solve each distinct signature once; discoveries that share a
+        # signature (under different names/IDs) reuse the same spectrum.
+        keys = [_solver_key(sig) for _, sig, *_ in parsed]
+        unique: dict[str, Signature] = {}
+        for key, (_, sig, *_) in zip(keys, parsed):
+            unique.setdefault(key, sig)
+        unique_keys = list(unique)
+        unique_sigs = list(unique.values())
+
+        # A single signature (e.g. --id) is solved in-process: no pool spawn
+        # or pickling for the common interactive case.
+        if len(unique_sigs) == 1:
+            workers = 1
         if workers and workers > 1:
             console.print(f"  [dim]Using {workers} parallel workers[/dim]")
 
-        spectra = parallel_compute_spectra(work_items, max_workers=workers)
+        # Two-tier timeouts: nearly every signature solves well within the
+        # short budget, so only the ones that time out are retried with the
+        # full budget instead of every signature paying for a stuck size.
+        # Backtest only needs model counts, so each spectrum's Cayley tables
+        # are dropped as soon as its worker finishes.
+        spectra_by_pos: list = [None] * len(unique_sigs)
+        fast_items = [
+            (sig, 2, max_size, 10, FAST_Z3_TIMEOUT_MS, FAST_MACE4_TIMEOUT)
+            for sig in unique_sigs
+        ]
+        for i, sp in iter_compute_spectra(fast_items, max_workers=workers):
+            sp.models_by_size.clear()
+            spectra_by_pos[i] = sp
+        retry = [i for i, sp in enumerate(spectra_by_pos) if sp.any_timed_out()]
+        if retry:
+            console.print(
+                f"  [dim]Retrying {len(retry)} timed-out signature(s) "
+                f"with {Z3_TIMEOUT_MS // 1000}s timeout[/dim]"
+            )
+            slow_items = [
+                (unique_sigs[i], 2, max_size, 10, Z3_TIMEOUT_MS, MACE4_TIMEOUT)
+                for i in retry
+            ]
+            for j, sp in iter_compute_spectra(slow_items, max_workers=workers):
+                sp.models_by_size.clear()
+                spectra_by_pos[retry[j]] = sp
+
+        by_key = dict(zip(unique_keys, spectra_by_pos))
+        spectra = [by_key[key] for key in keys]
+
+        # Known fingerprints plus every sibling discovery's, built once.
+        all_fps = known_fps.union(
+            d["fingerprint"] for d in discoveries if d.get("fingerprint")
+        )
+
+        # Re-score against known + sibling fingerprints, excluding each
+        # discovery's own, so is_novel stays 1.0 for genuinely novel structures.
+        breakdowns = scorer.score_many(
+            [sig for _, sig, *_ in parsed],
+            spectra,
+            all_fps,
+            exclude_fingerprints=[
+                own_fp if own_fp and own_fp not in known_fps else None
+                for *_, own_fp in parsed
+            ],
+        )
 
         # Phase 3: Post-process results
-        for (_, disc, sig), spectrum in zip(parsed, spectra):
-            disc_id = disc.get("id", "?")
-            disc_name = disc.get("name", "?")
-            orig_score = disc.get("score", 0.0)
-
+        for (
+            disc, sig, disc_id, disc_name, orig_score, orig_had_models, own_fp,
+        ), spectrum, new_score_bd in zip(parsed, spectra, breakdowns):
             total_models = spectrum.total_models()
-            orig_had_models = disc.get("score_breakdown", {}).get("has_models", 0) > 0
-
-            # Re-score using only known fingerprints (not other discoveries),
-            # so is_novel stays 1.0 for genuinely novel structures.
-            # Add sibling discovery fingerprints but exclude this one's own.
-            scoring_fps = set(known_fps)
-            own_fp = disc.get("fingerprint")
-            for other in discoveries:
-                other_fp = other.get("fingerprint")
-                if other_fp and other_fp != own_fp:
-                    scoring_fps.add(other_fp)
-
-            new_score_bd = scorer.score(sig, spectrum, scoring_fps)
             new_score = new_score_bd.total
-            delta = new_score - orig_score
 
             # Determine status
             if orig_had_models and total_models == 0 and not spectrum.any_timed_out():
@@ -158,7 +268,10 @@ def run_backtest(
                 status_str = "[green]PASS[/green]"
                 reason = ""
                 # Queue score update for all passing discoveries
-                updates.append((disc, new_score, new_score_bd.to_dict()))
+                update_ids.append(disc_id)
+                update_orig.append(orig_score)
+                update_scores.append(new_score)
+                update_breakdowns.append(new_score_bd.to_dict())
 
             results.append({"status": status, "id": disc_id, "reason": reason})
 
@@ -170,42 +283,87 @@ def run_backtest(
             else:
                 models_str = f"0{timeout_note}"
 
-            delta_str = f"{delta:+.3f}" if delta != 0 else "0.000"
-
-            table.add_row(
+            # Delta column is filled in below, once all scores are known
+            scored_rows.append(len(rows))
+            orig_scores.append(orig_score)
+            new_scores.append(new_score)
+            rows.append((
                 disc_id, disc_name,
-                f"{orig_score:.3f}", f"{new_score:.3f}", delta_str,
+                f"{orig_score:.3f}", f"{new_score:.3f}", "",
                 models_str, status_str,
-            )
+            ))
+
+    # Score drift for every re-scored discovery, computed in one pass
+    deltas = np.subtract(new_scores, orig_scores)
+    for row_idx, delta in zip(scored_rows, deltas):
+        delta_str = f"{delta:+.3f}" if delta != 0 else "0.000"
+        row = rows[row_idx]
+        rows[row_idx] = row[:4] + (delta_str,) + row[5:]
 
+    table = Table(title="Backtest Results")
+    table.add_column("ID", style="cyan", no_wrap=True)
+    table.add_column("Name", style="white", max_width=30)
+    table.add_column("Orig Score", justify="right")
+    table.add_column("New Score", justify="right")
+    table.add_column("Delta", justify="right")
+    table.add_column("Models", justify="right")
+    table.add_column("Status", justify="center")
+    for row in rows:
+        table.add_row(*row)
     console.print(table)
 
     # Summary
-    n_pass = sum(1 for r in results if r["status"] == "PASS")
-    n_warn = sum(1 for r in results if r["status"] == "WARN")
-    n_fail = sum(1 for r in results if r["status"] == "FAIL")
+    statuses = np.array([r["status"] for r in results], dtype=str)
+    n_pass = int(np.count_nonzero(statuses == "PASS"))
+    n_warn = int(np.count_nonzero(statuses == "WARN"))
+    n_fail = int(np.count_nonzero(statuses == "FAIL"))
 
     console.print(f"\n[bold]Summary:[/bold] {n_pass} PASS, {n_warn} WARN, {n_fail} FAIL")
 
     # Update scores for passing discoveries
-    if updates and not dry_run:
-        updated_count = 0
-        for disc_data, new_score, new_breakdown in updates:
-            if abs(new_score - disc_data.get("score", 0)) > 0.0001:
-                disc_data["score"] = new_score
-                disc_data["score_breakdown"] = new_breakdown
-                # Write back to file
-                for f in discovered_dir.glob("disc_*.json"):
+    if update_ids and not dry_run:
+        changed = np.abs(np.subtract(update_scores, update_orig)) > 0.0001
+        pending = np.flatnonzero(changed).tolist()
+
+        # Index discovery files by ID once, so each update is a single
+        # targeted write instead of a rescan of the whole directory.
+        id_to_path: dict[str, Path] = {}
+        id_to_data: dict[str, dict] = {}
+        id_to_raw: dict[str, bytes] = {}
+        if pending:
+            with os.scandir(discovered_dir) as entries:
+                for entry in entries:
+                    if not (entry.name.startswith("disc_") and entry.name.endswith(".json")):
+                        continue
                     try:
-                        file_data = json.loads(f.read_text())
-                        if file_data.get("id") == disc_data.get("id"):
-                            file_data["score"] = new_score
-                            file_data["score_breakdown"] = new_breakdown
-                            f.write_text(json.dumps(file_data, indent=2))
-                            updated_count += 1
-                            break
+                        with open(entry.path, "rb") as fh:
+                            raw = fh.read()
+                        file_data = _loads(raw)
                     except (json.JSONDecodeError, OSError):
                         continue
+                    file_id = file_data.get("id")
+                    if file_id and file_id not in id_to_path:
+                        id_to_path[file_id] = Path(entry.path)
+                        id_to_data[file_id] = file_data
+                        id_to_raw[file_id] = raw
+
+        batch: list[tuple[Path, dict, bytes]] = []
+        for i in pending:
+            disc_id = update_ids[i]
+            f = id_to_path.get(disc_id)
+            if f is None:
+                continue
+            file_data = id_to_data[disc_id]
+            file_data["score"] = update_scores[i]
+            file_data["score_breakdown"] = update_breakdowns[i]
+            batch.append((f, file_data, id_to_raw[disc_id]))
+
+        # Writes are I/O-bound: overlap them on threads (the GIL is released
+        # during the write syscalls).
+        updated_count = 0
+        if batch:
+            with ThreadPoolExecutor(max_workers=min(32, len(batch))) as executor:
+                updated_count = sum(executor.map(_write_discovery, batch))
         if updated_count:
             console.print(f"[green]Updated scores for {updated_count} discovery(ies).[/green]")
 
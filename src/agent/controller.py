@@ -11,27 +11,144 @@ Requires the Claude Code CLI: npm install -g @anthropic-ai/claude-code
 
 from __future__ import annotations
 
+import hashlib
+import heapq
 import json
 import os
+import queue
 import re
 import subprocess
 import threading
 import time
-from dataclasses import dataclass, field
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from operator import itemgetter
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, TextIO
 
 from rich.console import Console
+from rich.markup import escape
 from rich.panel import Panel
 from rich.table import Table
 
 from src.agent.tools import ToolExecutor
 from src.library.manager import LibraryManager
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import anthropic
+    ANTHROPIC_AVAILABLE = True
+except ImportError:
+    ANTHROPIC_AVAILABLE = False
+
 console = Console()
 
 
-@dataclass
+def _loads(data: str | bytes) -> Any:
+    """Parse JSON from Claude, using orjson when installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _scan_json_object(text: str, complete_only: bool = False) -> str | None:
+    """Return the first balanced ``{...}`` in ``text``, with trailing commas dropped.
+
+    One pass over the characters, tracking open brackets and whether we
+    are inside a string. A comma followed only by whitespace before a
+    closing bracket is left out, so ``{"a": [1,],}`` comes back as
+    ``{"a": [1]}``. If the text ends before the object closes (a reply
+    cut off mid-stream), it is cut back to the last complete member and
+    the open brackets are closed, unless ``complete_only`` is set, in
+    which case None is returned. Also None if no object starts.
+    """
+    start = text.find("{")
+    if start == -1:
+        return None
+
+    drop: list[int] = []
+    stack: list[str] = []
+    # Where the object could be cut and closed, and the brackets open there
+    safe_end, safe_stack = start + 1, ["}"]
+    in_string = False
+    escaped = False
+    comma = -1
+    end = -1
+    for i in range(start, len(text)):
+        c = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif c == "\\":
+                escaped = True
+            elif c == '"':
+                in_string = False
+            continue
+        if c == '"':
+            in_string = True
+            comma = -1
+        elif c == "{" or c == "[":
+            stack.append("}" if c == "{" else "]")
+            comma = -1
+            safe_end, safe_stack = i + 1, stack[:]
+        elif c == "}" or c == "]":
+            if comma != -1:
+                drop.append(comma)
+                comma = -1
+            stack.pop()
+            if not stack:
+                end = i + 1
+                break
+            safe_end, safe_stack = i + 1, stack[:]
+        elif c == ",":
+            comma = i
+            safe_end, safe_stack = i, stack[:]
+        elif c not in " \t\r\n":
+            comma = -1
+
+    closing = ""
+    if end == -1:
+        if complete_only:
+            return None
+        end = safe_end
+        closing = "".join(reversed(safe_stack))
+
+    pieces = []
+    prev = start
+    for i in drop:
+        if i >= end:
+            break
+        pieces.append(text[prev:i])
+        prev = i + 1
+    pieces.append(text[prev:end])
+    pieces.append(closing)
+    return "".join(pieces)
+
+
+def _json_reply_done() -> Callable[[str], bool]:
+    """A stop predicate for streamed replies: true once the first JSON object closes.
+
+    The object can only close on a ``}``, so the text is rescanned only
+    when a new one has arrived since the last call.
+    """
+    checked = 0
+
+    def done(text: str) -> bool:
+        nonlocal checked
+        new_brace = text.find("}", checked) != -1
+        checked = len(text)
+        return new_brace and _scan_json_object(text, complete_only=True) is not None
+
+    return done
+
+
+@dataclass(slots=True)
 class CycleReport:
     """Summary of one research cycle."""
 
@@ -47,7 +164,7 @@ class CycleReport:
     agent_reasoning: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class AgentConfig:
     """Configuration for the agent."""
 
@@ -63,6 +180,21 @@ class AgentConfig:
     ])
     exclude_moves: list[str] = field(default_factory=list)
     workers: int = field(default_factory=lambda: min(os.cpu_count() or 4, 8))
+    # Cycle reports kept in memory (AgentController.history) for prompt context;
+    # the Claude sessions are also restarted every this many cycles
+    history_window: int = 3
+    # Race Mace4 against Z3 on every model size (only when Mace4 is installed)
+    portfolio_solving: bool = False
+    cache_claude: bool = True
+    # Reuse complete model spectra from library/cache/spectra/ across sessions
+    cache_spectra: bool = True
+    skip_empty_interpret: bool = True
+    # Reuse a stored plan when goal, library size and the previous cycle's
+    # top candidates match, skipping the PLAN call
+    cache_plans: bool = False
+    # "cli" drives the Claude Code CLI; "sdk" calls the Messages API directly;
+    # "batch" goes through the Message Batches API (half price, slow turnaround)
+    backend: str = "cli"
 
 
 SYSTEM_PROMPT = """\
@@ -94,6 +226,37 @@ mathematical concepts by exploring the space of algebraic signatures.
 {goal}"""
 
 
+# Per-phase cap on the Claude text kept in CycleReport.agent_reasoning
+_MAX_REASONING = 8000
+
+# Cycle report templates, filled with str.format_map by _write_report_md
+_REPORT_HEADER = """\
+# Research Cycle {cycle_number}
+
+**Goal:** {goal}
+**Duration:** {duration:.1f}s
+**Model:** {model} (effort: {effort})
+
+## Statistics
+- Candidates generated: {generated}
+- Candidates with models: {with_models}
+- Discoveries added: {n_discoveries}
+- Conjectures: {n_conjectures}
+"""
+
+_REPORT_CANDIDATE = """
+### {name}
+- Move: {move}
+- Parents: {parents}
+- Score: {score}
+{spectrum}"""
+
+# Cached Claude responses expire a day after they were written; past
+# _CACHE_MAX_ENTRIES the least recently used ones are evicted
+_CACHE_TTL_SECONDS = 24 * 3600
+_CACHE_MAX_ENTRIES = 10_000
+
+
 def _format_elapsed(seconds: float) -> str:
     """Format elapsed time as a human-readable string."""
     if seconds < 60:
@@ -102,15 +265,368 @@ def _format_elapsed(seconds: float) -> str:
     return f"{m}m{s:02d}s"
 
 
+class _ClaudeSession:
+    """A long-lived Claude CLI process speaking the stream-json protocol.
+
+    Spawning ``claude --print`` costs several seconds of Node.js startup per
+    call. This keeps one process alive for the whole run: each prompt is
+    written to stdin as a ``user`` message, and stdout is read until the
+    terminal ``result`` event for that turn arrives. The session keeps the
+    conversation, so later prompts see earlier plans and analyses.
+    """
+
+    # The conversation lives in the CLI process, so a turn answered from
+    # elsewhere (the response cache) cannot be added to it
+    can_replay = False
+
+    def __init__(self, cmd: list[str], env: dict[str, str] | None = None):
+        self._proc = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            bufsize=0,
+            env=env,
+        )
+        self._events: queue.Queue[dict | None] = queue.Queue()
+        # True while the previous turn is still streaming after an early return
+        self._unfinished = False
+        # stderr is drained continuously so a chatty CLI can never block on a full pipe
+        self._stderr: deque[str] = deque(maxlen=20)
+        threading.Thread(target=self._read_stdout, daemon=True).start()
+        threading.Thread(target=self._read_stderr, daemon=True).start()
+
+    def _read_stdout(self) -> None:
+        """Forward each JSON event line from stdout; None marks EOF.
+
+        stdout is read as raw bytes and each line goes straight to the JSON
+        parser, so no text decoding layer sits in between.
+        """
+        assert self._proc.stdout is not None
+        for line in self._proc.stdout:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                self._events.put(_loads(line))
+            except json.JSONDecodeError:
+                continue
+        self._events.put(None)
+
+    def _read_stderr(self) -> None:
+        """Keep the last few stderr lines for error messages."""
+        assert self._proc.stderr is not None
+        for line in self._proc.stderr:
+            self._stderr.append(line.decode(errors="replace"))
+
+    def send(
+        self,
+        prompt: str,
+        timeout: float = 600,
+        stop: Callable[[str], bool] | None = None,
+        on_text: Callable[[str], None] | None = None,
+    ) -> str:
+        """Send one user turn and block until its ``result`` event arrives.
+
+        Text deltas are accumulated as they stream in and passed to
+        ``on_text`` (the full text so far), which is also called about once
+        a second while no events arrive. If ``stop`` is given, it is called
+        with the text so far after each delta, and the call returns as soon
+        as it is true, without waiting for the rest of the turn; the
+        leftover events are discarded at the next send.
+        """
+        assert self._proc.stdin is not None
+        deadline = time.monotonic() + timeout
+        if self._unfinished:
+            self._drain_turn(deadline, timeout)
+
+        message = {
+            "type": "user",
+            "message": {"role": "user", "content": prompt},
+        }
+        try:
+            self._proc.stdin.write((json.dumps(message) + "\n").encode())
+            self._proc.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            raise RuntimeError(f"Claude CLI session closed: {self._stderr_tail()}") from e
+
+        text = ""
+        chunks: list[str] = []
+        tick = 1.0 if on_text is not None else None
+        while True:
+            event = self._next_event(deadline, timeout, tick)
+            if event is None:
+                on_text(text)
+                continue
+            kind = event.get("type")
+            if kind == "stream_event":
+                delta = event.get("event", {}).get("delta", {})
+                if delta.get("type") != "text_delta":
+                    continue
+                text += delta.get("text", "")
+                if on_text is not None:
+                    on_text(text)
+                if stop is not None and stop(text):
+                    self._unfinished = True
+                    return text
+            elif kind == "assistant":
+                for block in event.get("message", {}).get("content", []):
+                    if block.get("type") == "text":
+                        chunks.append(block.get("text", ""))
+            elif kind == "result":
+                if event.get("is_error"):
+                    raise RuntimeError(f"Claude CLI error: {event.get('result', '')}"[:500])
+                result = event.get("result")
+                return result if isinstance(result, str) else text or "".join(chunks)
+
+    def _next_event(
+        self, deadline: float, timeout: float, tick: float | None = None,
+    ) -> dict | None:
+        """Wait for the next stdout event, raising on timeout or process exit.
+
+        With ``tick``, returns None after that many idle seconds instead of
+        waiting the full timeout, so the caller can refresh its display.
+        """
+        remaining = deadline - time.monotonic()
+        try:
+            if remaining <= 0:
+                raise queue.Empty
+            event = self._events.get(timeout=min(remaining, tick) if tick else remaining)
+        except queue.Empty:
+            if tick and time.monotonic() < deadline:
+                return None
+            raise subprocess.TimeoutExpired(self._proc.args, timeout)
+        if event is None:
+            raise RuntimeError(
+                f"Claude CLI exited (code {self._proc.poll()}): {self._stderr_tail()}"
+            )
+        return event
+
+    def _drain_turn(self, deadline: float, timeout: float) -> None:
+        """Discard the rest of a turn that send() returned from early."""
+        while self._next_event(deadline, timeout).get("type") != "result":
+            pass
+        self._unfinished = False
+
+    def _stderr_tail(self) -> str:
+        """The last 500 characters the CLI wrote to stderr."""
+        return "".join(self._stderr).strip()[-500:]
+
+    def close(self, timeout: float = 10) -> None:
+        """Close stdin so the CLI exits, killing it if it does not."""
+        if self._proc.stdin is not None and not self._proc.stdin.closed:
+            try:
+                self._proc.stdin.close()
+            except OSError:
+                pass
+        try:
+            self._proc.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            self._proc.kill()
+            self._proc.wait()
+
+
+class _SDKSession:
+    """Same interface as _ClaudeSession, backed by the Anthropic Python SDK.
+
+    Talks to the Messages API directly, so there is no CLI process at all.
+    The conversation is kept client-side to match the CLI session.
+    Requires ``pip install .[anthropic-sdk]`` and ``ANTHROPIC_API_KEY``.
+    """
+
+    MAX_TOKENS = 16000
+    can_replay = True
+
+    def __init__(self, model: str, system: str, client: Any = None):
+        if client is None:
+            if not ANTHROPIC_AVAILABLE:
+                raise RuntimeError(
+                    "anthropic package not installed. Install: pip install .[anthropic-sdk]"
+                )
+            client = anthropic.Anthropic()
+        self._client = client
+        self._model = model
+        self._system = system
+        self._messages: list[dict[str, str]] = []
+        # Set by close(), which may run on another thread while send() waits
+        self._closed = threading.Event()
+        self._stream: Any = None
+
+    def send(
+        self,
+        prompt: str,
+        timeout: float = 600,
+        stop: Callable[[str], bool] | None = None,
+        on_text: Callable[[str], None] | None = None,
+    ) -> str:
+        """Send one user turn and return the streamed reply (see _ClaudeSession.send)."""
+        messages = self._messages + [{"role": "user", "content": prompt}]
+        text = ""
+        try:
+            with self._client.messages.stream(
+                **self._request_params(messages), timeout=timeout,
+            ) as stream:
+                self._stream = stream
+                if self._closed.is_set():
+                    raise RuntimeError("Claude session closed")
+                for delta in stream.text_stream:
+                    text += delta
+                    if on_text is not None:
+                        on_text(text)
+                    if stop is not None and stop(text):
+                        break
+        except Exception as e:
+            if self._closed.is_set():
+                raise RuntimeError("Claude session closed") from e
+            if ANTHROPIC_AVAILABLE and isinstance(e, anthropic.APIError):
+                raise RuntimeError(f"Anthropic API error: {e}"[:500]) from e
+            raise
+        finally:
+            self._stream = None
+        if self._closed.is_set():
+            raise RuntimeError("Claude session closed")
+        self._messages = messages + [{"role": "assistant", "content": text}]
+        return text
+
+    def conversation(self) -> list[dict[str, str]]:
+        """The turns so far, oldest first."""
+        return self._messages
+
+    def replay(self, prompt: str, reply: str) -> None:
+        """Add a turn answered without the API, as if it had been sent."""
+        self._messages = self._messages + [
+            {"role": "user", "content": prompt},
+            {"role": "assistant", "content": reply},
+        ]
+
+    def _request_params(self, messages: list[dict[str, str]]) -> dict[str, Any]:
+        """Messages API parameters, with prompt-cache breakpoints.
+
+        The system prompt and the newest user turn are marked cacheable, so
+        the next turn reads the whole conversation so far from the cache
+        instead of paying full price for it again.
+        """
+        *earlier, last = messages
+        return {
+            "model": self._model,
+            "max_tokens": self.MAX_TOKENS,
+            "system": [{
+                "type": "text", "text": self._system,
+                "cache_control": {"type": "ephemeral"},
+            }],
+            "messages": earlier + [{
+                "role": last["role"],
+                "content": [{
+                    "type": "text", "text": last["content"],
+                    "cache_control": {"type": "ephemeral"},
+                }],
+            }],
+        }
+
+    def close(self, timeout: float = 10) -> None:
+        """Abort any request in flight on another thread and drop the conversation."""
+        self._closed.set()
+        stream = self._stream
+        if stream is not None:
+            try:
+                stream.close()
+            except Exception:
+                pass
+        self._messages = []
+
+
+class _BatchSession(_SDKSession):
+    """_SDKSession that sends each turn through the Message Batches API.
+
+    Batched requests are billed at half price but may take up to an hour
+    (at most a day) to complete, so ``timeout`` is not applied and the
+    reply arrives whole rather than streamed. ``on_text`` is called on
+    every poll so the caller's progress display stays live.
+    """
+
+    POLL_SECONDS = 30.0
+
+    def send(
+        self,
+        prompt: str,
+        timeout: float = 600,
+        stop: Callable[[str], bool] | None = None,
+        on_text: Callable[[str], None] | None = None,
+    ) -> str:
+        """Submit one user turn as a single-request batch and wait for it."""
+        messages = self._messages + [{"role": "user", "content": prompt}]
+        batches = self._client.messages.batches
+        try:
+            batch = batches.create(requests=[{
+                "custom_id": f"turn-{len(messages) // 2 + 1}",
+                "params": self._request_params(messages),
+            }])
+            next_poll = time.monotonic() + self.POLL_SECONDS
+            while batch.processing_status != "ended":
+                if on_text is not None:
+                    on_text("")
+                if self._closed.wait(min(1.0, self.POLL_SECONDS)):
+                    batches.cancel(batch.id)
+                    raise RuntimeError(f"Claude session closed; batch {batch.id} canceled")
+                if time.monotonic() >= next_poll:
+                    batch = batches.retrieve(batch.id)
+                    next_poll = time.monotonic() + self.POLL_SECONDS
+            entry = next(iter(batches.results(batch.id)), None)
+        except Exception as e:
+            if ANTHROPIC_AVAILABLE and isinstance(e, anthropic.APIError):
+                raise RuntimeError(f"Anthropic API error: {e}"[:500]) from e
+            raise
+
+        if entry is None or entry.result.type != "succeeded":
+            status = entry.result.type if entry is not None else "missing"
+            raise RuntimeError(f"Batch {batch.id} request {status}")
+        text = "".join(
+            block.text for block in entry.result.message.content if block.type == "text"
+        )
+        self._messages = messages + [{"role": "assistant", "content": text}]
+        return text
+
+
 class AgentController:
     """Orchestrates the Claude CLI-driven mathematical discovery loop."""
 
+    _REPORT_NAME_RE = re.compile(r"cycle_(\d+)_report\.md")
+
     def __init__(self, config: AgentConfig, library: LibraryManager):
         self.config = config
         self.library = library
-        self.tools = ToolExecutor(library)
-        self.history: list[CycleReport] = []
+        self.tools = ToolExecutor(
+            library,
+            portfolio=config.portfolio_solving,
+            cache_spectra=config.cache_spectra,
+        )
+        # Only the latest cycles feed the prompts; older ones are on disk
+        self.history: deque[CycleReport] = deque(maxlen=max(1, config.history_window))
         self._cycle_start: float = 0.0
+        # The system prompt is built once per goal (see _system_prompt); it
+        # is passed to the CLI only when a session starts.
+        self._system_goal = config.goal
+        self._system = SYSTEM_PROMPT.format(goal=config.goal)
+        # Environment for CLI subprocesses, built once. CLAUDECODE is dropped
+        # to allow spawning from inside an existing Claude Code session.
+        self._child_env = {k: v for k, v in os.environ.items() if k != "CLAUDECODE"}
+        # One Claude session per role ("plan", "interpret"), keyed with its system prompt
+        self._sessions: dict[str, tuple[str, _ClaudeSession | _SDKSession]] = {}
+        self._planner: ThreadPoolExecutor | None = None
+        self._next_plan: Future[str] | None = None
+        self._next_plan_key = ""
+        self._report_queue: queue.SimpleQueue[CycleReport | None] | None = None
+
+    def _system_prompt(self) -> str:
+        """The system prompt for the current goal, rebuilt only if the goal changed.
+
+        An unchanged prompt keeps the Claude sessions (and any prompt
+        cache on the API side) valid from cycle to cycle.
+        """
+        if self._system_goal != self.config.goal:
+            self._system_goal = self.config.goal
+            self._system = SYSTEM_PROMPT.format(goal=self.config.goal)
+        return self._system
 
     def _log(self, msg: str, style: str = "") -> None:
         """Print a timestamped log line relative to cycle start."""
@@ -121,62 +637,238 @@ class AgentController:
         else:
             console.print(f"{ts} {msg}")
 
-    def _call_claude(self, prompt: str, system: str, label: str = "Thinking") -> str:
-        """Call the Claude CLI with a live spinner showing elapsed time."""
+    def _get_session(self, role: str, system: str) -> _ClaudeSession | _SDKSession:
+        """Return the running session for ``role``, (re)starting it if the system prompt changed."""
+        current = self._sessions.get(role)
+        if current is not None and current[0] == system:
+            return current[1]
+        self._close_session(role)
+
+        if self.config.backend in ("sdk", "batch"):
+            session_cls = _BatchSession if self.config.backend == "batch" else _SDKSession
+            session = session_cls(self.config.model, system)
+            self._sessions[role] = (system, session)
+            return session
+
         cmd = [
             "claude", "--print",
             "--model", self.config.model,
             "--effort", self.config.effort,
-            "--output-format", "text",
+            "--input-format", "stream-json",
+            "--output-format", "stream-json",
+            "--include-partial-messages",
+            "--verbose",
             "--tools", "",
             "--no-session-persistence",
             "--system-prompt", system,
         ]
 
-        # Allow spawning from inside an existing Claude Code session
-        env = os.environ.copy()
-        env.pop("CLAUDECODE", None)
+        session = _ClaudeSession(cmd, env=self._child_env)
+        self._sessions[role] = (system, session)
+        return session
+
+    def _rotate_sessions(self, cycle_num: int, system: str) -> None:
+        """Restart both sessions at the start of every ``history_window``-th cycle.
+
+        A session keeps its whole conversation, so without this each turn
+        would cost more than the last for the rest of the run. Prompts
+        already carry the last ``history_window`` cycles, so nothing older
+        is lost. Called once this cycle's plan has arrived, when neither
+        session has a request in flight; the new processes start right away
+        so their startup overlaps EXECUTE.
+        """
+        window = max(1, self.config.history_window)
+        if cycle_num == 1 or (cycle_num - 1) % window or not self._sessions:
+            return
+        self._close_session()
+        for role in ("plan", "interpret"):
+            self._get_session(role, system)
+
+    def _close_session(self, role: str | None = None) -> None:
+        """Shut down the session for ``role``, or every session when role is None."""
+        roles = [role] if role is not None else list(self._sessions)
+        for r in roles:
+            entry = self._sessions.pop(r, None)
+            if entry is not None:
+                entry[1].close()
+
+    def _call_claude(
+        self,
+        prompt: str,
+        system: str,
+        label: str = "Thinking",
+        role: str = "plan",
+        background: bool = False,
+        stop_at_json: bool = False,
+    ) -> str:
+        """Call the Claude CLI with a live spinner showing elapsed time.
+
+        The response streams in; with ``stop_at_json`` the call returns as
+        soon as the reply's first JSON object closes, since nothing after
+        it is parsed.
+
+        Background calls (the next cycle's plan, overlapped with this cycle's
+        INTERPRET) skip the spinner, since only one live display can be active.
+
+        When ``config.cache_claude`` is set, responses are stored under
+        ``library/cache/claude/`` keyed by model, effort, system, the
+        session's conversation so far and the prompt, and an identical later
+        call within a day is answered from disk. A hit is replayed into the
+        session, so later turns build on what the controller acted on. The
+        CLI session cannot take a replayed turn and always calls Claude.
+        """
+        cache_path = None
+        if self.config.cache_claude:
+            session = self._get_session(role, system)
+            if session.can_replay:
+                cache_path = self._claude_cache_path(prompt, system, session.conversation())
+        if cache_path is not None:
+            try:
+                st = cache_path.stat()
+            except FileNotFoundError:
+                st = None
+            if st is not None and time.time() - st.st_mtime < _CACHE_TTL_SECONDS:
+                # Record the use in atime for LRU eviction; mtime stays the write time
+                os.utime(cache_path, (time.time(), st.st_mtime))
+                self._log(f"{label} [green]done[/green] [dim](cache hit)[/dim]")
+                response = cache_path.read_text()
+                session.replay(prompt, response)
+                return response
+
+        response = self._call_claude_uncached(
+            prompt, system, label, role, background, stop_at_json,
+        )
+
+        if cache_path is not None:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = cache_path.with_suffix(".tmp")
+            tmp.write_text(response)
+            tmp.replace(cache_path)
+            self._prune_claude_cache(cache_path.parent)
+        return response
+
+    def _claude_cache_path(
+        self, prompt: str, system: str, conversation: list[dict[str, str]] | None = None,
+    ) -> Path:
+        """On-disk cache location for one Claude response."""
+        key = hashlib.sha256(json.dumps({
+            "p": prompt, "s": system, "m": self.config.model, "e": self.config.effort,
+            "c": conversation or [],
+        }, sort_keys=True).encode()).hexdigest()
+        return self.library.base_path / "cache" / "claude" / f"{key}.txt"
+
+    @staticmethod
+    def _prune_claude_cache(cache_dir: Path) -> None:
+        """Evict the least recently used responses beyond _CACHE_MAX_ENTRIES."""
+        entries = [e for e in os.scandir(cache_dir) if e.name.endswith(".txt")]
+        excess = len(entries) - _CACHE_MAX_ENTRIES
+        if excess <= 0:
+            return
+        entries.sort(key=lambda e: e.stat().st_atime)
+        for entry in entries[:excess]:
+            try:
+                os.unlink(entry.path)
+            except FileNotFoundError:
+                pass
+
+    def _plan_cache_key(self, last: CycleReport | None) -> str:
+        """Key a plan by goal, library size and the previous cycle's top candidates.
+
+        Coarser than the response cache: the plan prompt also carries
+        scores and discovery details, which are deliberately ignored here.
+        """
+        top = sorted(c.get("name", "") for c in last.top_candidates[:5]) if last else []
+        state = [
+            self.config.model,
+            self.config.goal,
+            self.library.count_known(),
+            self.library.count_discovered(),
+            top,
+        ]
+        return hashlib.sha256(json.dumps(state).encode()).hexdigest()
+
+    def _load_cached_plan(self, key: str) -> str | None:
+        """Return the stored plan response for ``key``, if plan caching is on."""
+        if not self.config.cache_plans:
+            return None
+        path = self.library.base_path / "cache" / "plans" / f"{key}.txt"
+        return path.read_text() if path.exists() else None
+
+    def _store_plan(self, key: str, response: str) -> None:
+        """Store a parsed plan response under ``key``, if plan caching is on."""
+        if not self.config.cache_plans:
+            return
+        path = self.library.base_path / "cache" / "plans" / f"{key}.txt"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(response)
+        tmp.replace(path)
+
+    def _call_claude_uncached(
+        self,
+        prompt: str,
+        system: str,
+        label: str,
+        role: str,
+        background: bool,
+        stop_at_json: bool = False,
+    ) -> str:
+        """Send one prompt on the role's Claude session."""
+        session = self._get_session(role, system)
+        stop = _json_reply_done() if stop_at_json else None
 
         call_start = time.time()
-        stop_event = threading.Event()
+        if background:
+            try:
+                response = session.send(prompt, timeout=600, stop=stop).strip()
+            except (RuntimeError, subprocess.TimeoutExpired):
+                self._close_session(role)
+                raise
+            elapsed = time.time() - call_start
+            lines = response.count("\n") + 1
+            self._log(
+                f"{label} [green]done[/green] "
+                f"[dim]({_format_elapsed(elapsed)}, {lines} lines, in background)[/dim]"
+            )
+            return response
 
-        def update_spinner(status):
-            while not stop_event.is_set():
+        with console.status(
+            f"[bold cyan]{label}[/bold cyan]", spinner="dots"
+        ) as status:
+            last_update = 0.0
+
+            # Called from the streaming loop on every delta and on idle ticks,
+            # so the elapsed counter needs no timer thread of its own
+            def on_text(text: str) -> None:
+                nonlocal last_update
+                now = time.monotonic()
+                if now - last_update < 1.0:
+                    return
+                last_update = now
                 e = time.time() - call_start
                 cycle_e = time.time() - self._cycle_start if self._cycle_start else e
+                progress = ""
+                if text:
+                    last_line = text.rstrip().rsplit("\n", 1)[-1][:60]
+                    progress = f", ~{len(text) // 4} tokens[/dim]\n  [dim]{escape(last_line)}"
                 status.update(
                     f"[bold cyan]{label}[/bold cyan] "
                     f"[dim]({_format_elapsed(e)} elapsed, "
-                    f"cycle {_format_elapsed(cycle_e)})[/dim]"
+                    f"cycle {_format_elapsed(cycle_e)}){progress}[/dim]"
                 )
-                stop_event.wait(1.0)
-
-        with console.status(
-            f"[bold cyan]{label}[/bold cyan]", spinner="dots"
-        ) as status:
-            timer = threading.Thread(target=update_spinner, args=(status,), daemon=True)
-            timer.start()
-
-            result = subprocess.run(
-                cmd,
-                input=prompt,
-                capture_output=True,
-                text=True,
-                timeout=600,
-                env=env,
-            )
 
-            stop_event.set()
-            timer.join()
+            try:
+                response = session.send(
+                    prompt, timeout=600, stop=stop, on_text=on_text,
+                ).strip()
+            except (RuntimeError, subprocess.TimeoutExpired):
+                elapsed = time.time() - call_start
+                self._log(f"{label} FAILED after {_format_elapsed(elapsed)}", "bold red")
+                # A failed or timed-out turn leaves the session unusable
+                self._close_session(role)
+                raise
 
         elapsed = time.time() - call_start
-
-        if result.returncode != 0:
-            stderr = result.stderr.strip()[:500]
-            self._log(f"{label} FAILED after {_format_elapsed(elapsed)}", "bold red")
-            raise RuntimeError(f"Claude CLI failed (exit {result.returncode}): {stderr}")
-
-        response = result.stdout.strip()
         # Show a brief summary of the response length
         lines = response.count("\n") + 1
         self._log(
@@ -199,11 +891,38 @@ class AgentController:
         )
         console.print()
 
-        for i in range(cycles):
-            report = self._run_cycle(i + 1, cycles)
-            reports.append(report)
-            self.history.append(report)
-            self._save_report(report)
+        # Runs the next cycle's PLAN call while this cycle is in INTERPRET
+        self._planner = ThreadPoolExecutor(max_workers=1)
+        # Writes cycle reports off the critical path, one at a time
+        self._report_queue = queue.SimpleQueue()
+        writer = threading.Thread(target=self._report_writer, daemon=True)
+        writer.start()
+        completed = False
+        try:
+            # Spawn both CLI sessions up front: Node.js startup for the
+            # interpret session then overlaps cycle 1's PLAN and EXECUTE
+            for role in ("plan", "interpret"):
+                self._get_session(role, self._system_prompt())
+
+            for i in range(cycles):
+                report = self._run_cycle(i + 1, cycles)
+                self.history.append(report)
+                self._save_report(report)
+                # The reasoning text is kept in the saved report only, so a
+                # long run does not hold every cycle's transcript in memory
+                reports.append(replace(report, agent_reasoning=""))
+            completed = True
+        finally:
+            # Closing the sessions first aborts any in-flight background plan.
+            # After an error or Ctrl-C, don't wait for it to wind down either.
+            self._close_session()
+            self._planner.shutdown(wait=completed, cancel_futures=True)
+            self._planner = None
+            self._next_plan = None
+            # Let pending report writes finish
+            self._report_queue.put(None)
+            writer.join()
+            self._report_queue = None
 
         console.print()
         console.rule("[bold green]All cycles complete[/bold green]", style="green")
@@ -217,17 +936,22 @@ class AgentController:
         return reports
 
     def _check_claude_available(self) -> None:
-        """Verify the claude CLI is installed and accessible."""
+        """Verify the claude CLI (or, for the SDK backends, the anthropic package) is available."""
+        if self.config.backend in ("sdk", "batch"):
+            if not ANTHROPIC_AVAILABLE:
+                raise RuntimeError(
+                    "anthropic package not installed. Install: pip install .[anthropic-sdk]"
+                )
+            console.print(f"  [dim]Anthropic SDK: {anthropic.__version__}[/dim]")
+            return
         try:
-            env = os.environ.copy()
-            env.pop("CLAUDECODE", None)
             result = subprocess.run(
                 ["claude", "--version"],
-                capture_output=True, text=True, timeout=10, env=env,
+                capture_output=True, timeout=10, env=self._child_env,
             )
             if result.returncode != 0:
                 raise RuntimeError("claude CLI returned non-zero exit code")
-            version = result.stdout.strip()
+            version = result.stdout.decode("utf-8", errors="replace").strip()
             console.print(f"  [dim]Claude CLI: {version}[/dim]")
         except FileNotFoundError:
             raise RuntimeError(
@@ -238,7 +962,7 @@ class AgentController:
         """Execute one complete research cycle with live progress output."""
         self._cycle_start = time.time()
 
-        system = SYSTEM_PROMPT.format(goal=self.config.goal)
+        system = self._system_prompt()
 
         reasoning_parts = []
         candidates_generated = 0
@@ -259,13 +983,31 @@ class AgentController:
         self._log("PLAN", "bold yellow")
         self._log("Asking Claude to design exploration strategy...")
 
-        plan_prompt = self._build_plan_prompt(cycle_num)
-        plan_response = self._call_claude(
-            plan_prompt, system, label="Claude planning"
-        )
-        reasoning_parts.append(f"## Planning Phase\n\n{plan_response}")
+        plan_cached = False
+        if self._next_plan is not None:
+            # Planned in the background during the previous cycle's INTERPRET
+            future, self._next_plan = self._next_plan, None
+            plan_key = self._next_plan_key
+            with console.status("[bold cyan]Claude planning[/bold cyan]", spinner="dots"):
+                plan_response = future.result()
+        else:
+            plan_key = self._plan_cache_key(self.history[-1] if self.history else None)
+            cached = self._load_cached_plan(plan_key)
+            if cached is not None:
+                self._log("Reusing cached plan for this library state", "dim")
+                plan_response = cached
+                plan_cached = True
+            else:
+                plan_prompt = self._build_plan_prompt(cycle_num)
+                plan_response = self._call_claude(
+                    plan_prompt, system, label="Claude planning", stop_at_json=True
+                )
+        reasoning_parts.append(f"## Planning Phase\n\n{plan_response[:_MAX_REASONING]}")
+        self._rotate_sessions(cycle_num, system)
 
-        plan = self._parse_json_block(plan_response, "plan")
+        plan = self._parse_response(plan_response, "plan")
+        if plan and not plan_cached:
+            self._store_plan(plan_key, plan_response)
         if plan:
             reasoning = plan.get("reasoning", "")
             if reasoning:
@@ -306,29 +1048,71 @@ class AgentController:
             if mr.get("total_models", 0) > 0:
                 candidates_with_models += 1
 
+        # Start planning the next cycle now, so that Claude call overlaps
+        # with INTERPRET below instead of following it. It sees this cycle's
+        # execution results; discoveries are still pending at this point.
+        if cycle_num < total_cycles and self._planner is not None:
+            pending = CycleReport(
+                cycle_number=cycle_num,
+                goal=self.config.goal,
+                plan="",
+                candidates_generated=candidates_generated,
+                candidates_with_models=candidates_with_models,
+                top_candidates=top_candidates[:10],
+                conjectures=[],
+                discoveries=[],
+                duration_seconds=0.0,
+            )
+            self._next_plan_key = self._plan_cache_key(pending)
+            cached = self._load_cached_plan(self._next_plan_key)
+            if cached is not None:
+                self._next_plan = Future()
+                self._next_plan.set_result(cached)
+                self._log(f"Reusing cached plan for cycle {cycle_num + 1}", "dim")
+            else:
+                next_prompt = self._build_plan_prompt(cycle_num + 1, pending=pending)
+                self._next_plan = self._planner.submit(
+                    self._call_claude, next_prompt, system,
+                    label=f"Cycle {cycle_num + 1} plan", role="plan", background=True,
+                    stop_at_json=True,
+                )
+                self._log(f"Planning cycle {cycle_num + 1} in the background", "dim")
+
         console.print()
 
         # ── Phase 3: INTERPRET ───────────────────────────────────
         self._log("INTERPRET", "bold yellow")
-        self._log("Asking Claude to analyze results...")
 
-        interpret_prompt = self._build_interpret_prompt(
-            cycle_num, plan_response, exec_results
-        )
-        interpret_response = self._call_claude(
-            interpret_prompt, system, label="Claude analyzing"
-        )
-        reasoning_parts.append(f"## Interpretation Phase\n\n{interpret_response}")
+        # With no models there is nothing to add to the library, so the
+        # Claude call could only return empty lists
+        if self.config.skip_empty_interpret and (
+            candidates_generated == 0 or candidates_with_models == 0
+        ):
+            self._log("No candidates with models — skipping INTERPRET", "dim")
+            decisions = None
+        else:
+            self._log("Asking Claude to analyze results...")
+
+            interpret_prompt = self._build_interpret_prompt(
+                cycle_num, plan_response, exec_results
+            )
+            interpret_response = self._call_claude(
+                interpret_prompt, system, label="Claude analyzing", role="interpret",
+                stop_at_json=True,
+            )
+            reasoning_parts.append(
+                f"## Interpretation Phase\n\n{interpret_response[:_MAX_REASONING]}"
+            )
 
-        decisions = self._parse_json_block(interpret_response, "decisions")
+            decisions = self._parse_response(interpret_response, "decisions")
 
-        if decisions:
-            analysis = decisions.get("analysis", "")
-            if analysis:
-                short = analysis[:300] + ("..." if len(analysis) > 300 else "")
-                self._log(f"Analysis: [italic]{short}[/italic]")
-        else:
-            self._log("No structured decisions parsed", "yellow")
+            if decisions:
+                analysis = decisions.get("analysis", "")
+                if analysis:
+                    short = analysis[:300] + ("..." if len(analysis) > 300 else "")
+                    self._log(f"Analysis: [italic]{short}[/italic]")
+            else:
+                self._log("No structured decisions parsed", "yellow")
 
         console.print()
 
@@ -415,6 +1199,9 @@ class AgentController:
             }]
 
         # ── Run explorations ─────────────────────────────────────
+        # Explorations are independent, so they run in parallel worker
+        # processes and are logged as each one finishes.
+        explore_args_list = []
         for i, exp in enumerate(explorations, 1):
             bases = exp.get("base_structures", self.config.base_structures)
             moves = exp.get("moves")
@@ -426,7 +1213,6 @@ class AgentController:
                 f"{bases} x {{{move_str}}} depth={depth}"
             )
 
-            explore_start = time.time()
             explore_args = {
                 "base_structures": bases,
                 "moves": moves,
@@ -435,22 +1221,41 @@ class AgentController:
             }
             if self.config.exclude_moves:
                 explore_args["exclude_moves"] = self.config.exclude_moves
-            result = self.tools.execute("explore", explore_args)
-            explore_elapsed = time.time() - explore_start
+            explore_args_list.append(explore_args)
 
-            n_candidates = result.get("total_candidates", 0)
-            n_above = result.get("above_threshold", 0)
-            total_generated += n_candidates
-            all_candidates.extend(result.get("candidates", []))
+        explore_start = time.time()
+        explore_results: list[dict] = [{}] * len(explore_args_list)
+        workers = min(len(explore_args_list), self.config.workers)
+        for idx, result in self.tools.explore_many(explore_args_list, max_workers=workers):
+            explore_results[idx] = result
+            explore_elapsed = time.time() - explore_start
 
             self._log(
-                f"  {n_candidates} candidates generated, "
-                f"{n_above} above threshold "
+                f"  [{idx + 1}/{len(explorations)}] "
+                f"{result.get('total_candidates', 0)} candidates generated, "
+                f"{result.get('above_threshold', 0)} above threshold "
                 f"[dim]({explore_elapsed:.1f}s)[/dim]"
             )
 
-        # Sort by score
-        all_candidates.sort(key=lambda x: x.get("score", 0), reverse=True)
+        # Merge in plan order so ties rank the same regardless of which
+        # exploration finished first. Overlapping explorations return the
+        # same structures, not always under the same name; keep the first
+        # so duplicates don't take up model-checking slots.
+        seen: set[tuple] = set()
+        for result in explore_results:
+            total_generated += result.get("total_candidates", 0)
+            for candidate in result.get("candidates", []):
+                key = self.tools.candidate_key(candidate["name"])
+                if key not in seen:
+                    seen.add(key)
+                    all_candidates.append(candidate)
+
+        # Rank by score. Only the top 50 (or top_n, if larger) are used
+        # downstream, so a bounded heap selection replaces a full sort.
+        requested_n = plan.get("check_models_top_n", 10)
+        all_candidates = heapq.nlargest(
+            max(50, requested_n), all_candidates, key=itemgetter("score")
+        )
 
         if all_candidates:
             top = all_candidates[0]
@@ -460,7 +1265,7 @@ class AgentController:
             )
 
         # ── Check models ─────────────────────────────────────────
-        top_n = min(plan.get("check_models_top_n", 10), len(all_candidates))
+        top_n = min(requested_n, len(all_candidates))
         max_size = plan.get("max_model_size", self.config.max_model_size)
 
         if top_n > 0:
@@ -471,28 +1276,25 @@ class AgentController:
             )
 
             check_start = time.time()
-            batch_results = self.tools.check_models_batch(
+            found_count = 0
+            empty_count = 0
+            # Keyed by candidate index so model_results keeps ranking order
+            checked: dict[int, dict] = {}
+
+            # Candidates are logged as their checks finish, tagged with their rank
+            for idx, model_result in self.tools.iter_check_models(
                 candidates=all_candidates[:top_n],
                 min_size=2,
                 max_size=max_size,
                 max_models_per_size=10,
                 max_workers=workers,
-            )
-            check_elapsed = time.time() - check_start
-
-            found_count = 0
-            empty_count = 0
-
-            for j, (candidate, model_result) in enumerate(
-                zip(all_candidates[:top_n], batch_results), 1
             ):
-                name = candidate["name"]
-                short_name = name[:45]
+                candidate = all_candidates[idx]
+                prefix = f"  [{idx + 1:2d}/{top_n}]"
+                short_name = candidate["name"][:45]
 
                 if "error" in model_result:
-                    self._log(
-                        f"  [{j:2d}/{top_n}] [red]{short_name} error: {model_result['error']}[/red]"
-                    )
+                    self._log(f"{prefix} [red]{short_name} error: {model_result['error']}[/red]")
                     continue
 
                 spectrum = model_result.get("spectrum", {})
@@ -502,21 +1304,16 @@ class AgentController:
                 candidate["model_spectrum"] = spectrum
                 candidate["total_models"] = total_models
                 candidate["sizes_with_models"] = sizes
-                model_results.append(model_result)
+                checked[idx] = model_result
 
                 if total_models > 0:
                     found_count += 1
-                    sizes_str = ",".join(str(s) for s in sorted(sizes))
-                    self._log(
-                        f"  [{j:2d}/{top_n}] [green]{short_name}[/green] "
-                        f"sizes={{{sizes_str}}} "
-                        f"models={total_models}"
-                    )
                 else:
                     empty_count += 1
-                    self._log(
-                        f"  [{j:2d}/{top_n}] [dim]{short_name} no models[/dim]"
-                    )
+                self._log_candidate_result(prefix, short_name, sizes, total_models)
+
+            check_elapsed = time.time() - check_start
+            model_results = [checked[idx] for idx in sorted(checked)]
 
             self._log(
                 f"Model check: [green]{found_count} with models[/green], "
@@ -530,18 +1327,34 @@ class AgentController:
             "model_results": model_results,
         }
 
-    def _build_plan_prompt(self, cycle_num: int) -> str:
-        """Build the planning prompt for Claude."""
-        context = self._build_context(cycle_num)
+    def _log_candidate_result(
+        self, prefix: str, short_name: str, sizes: list[int], total_models: int,
+    ) -> None:
+        """Log one model-check result; ``sizes`` is already sorted by the tool."""
+        if total_models > 0:
+            self._log(
+                f"{prefix} [green]{short_name}[/green] "
+                f"sizes={{{','.join(map(str, sizes))}}} models={total_models}"
+            )
+        else:
+            self._log(f"{prefix} [dim]{short_name} no models[/dim]")
+
+    def _build_plan_prompt(self, cycle_num: int, pending: CycleReport | None = None) -> str:
+        """Build the planning prompt for Claude.
+
+        ``pending`` is the still-interpreting previous cycle, used in place of
+        the last history entry when the plan is requested ahead of time.
+        """
+        context = self._build_context(cycle_num, pending)
 
         return f"""{context}
 
 Based on the context above, plan this research cycle. Think deeply about which
 structures and moves will yield the most mathematically interesting results.
 
-Output your plan as a JSON block between <plan> and </plan> tags:
+Respond with only your plan as a single JSON object, with no prose or code
+fences around it. Put your strategic reasoning in the "reasoning" field:
 
-<plan>
 {{
   "reasoning": "Your strategic reasoning for this cycle",
   "explorations": [
@@ -554,7 +1367,6 @@ Output your plan as a JSON block between <plan> and </plan> tags:
   "check_models_top_n": 10,
   "max_model_size": {self.config.max_model_size}
 }}
-</plan>
 
 Available moves: ABSTRACT, DUALIZE, COMPLETE, QUOTIENT, INTERNALIZE, TRANSFER, DEFORM, SELF_DISTRIB.
 You may omit "moves" to apply all moves."""
@@ -564,19 +1376,13 @@ You may omit "moves" to apply all moves."""
     ) -> str:
         """Build the interpretation prompt for Claude."""
         top = results.get("top_candidates", [])[:20]
-        summary_lines = []
-        for c in top:
-            parts = [f"  - {c['name']} (score: {c.get('score', '?')}, move: {c.get('move', '?')}"]
-            spectrum = c.get("model_spectrum")
-            if spectrum:
-                parts.append(f", spectrum: {spectrum}")
-            total_models = c.get("total_models", 0)
-            if total_models:
-                parts.append(f", models: {total_models}")
-            parts.append(")")
-            summary_lines.append("".join(parts))
-
-        results_summary = "\n".join(summary_lines) if summary_lines else "  (none)"
+        results_summary = "\n".join(
+            f"  - {c['name']} (score: {c.get('score', '?')}, move: {c.get('move', '?')}"
+            + (f", spectrum: {c['model_spectrum']}" if c.get("model_spectrum") else "")
+            + (f", models: {c['total_models']}" if c.get("total_models") else "")
+            + ")"
+            for c in top
+        ) or "  (none)"
 
         return f"""## Cycle {cycle_num} — Exploration Results
 
@@ -596,9 +1402,9 @@ Analyze these results deeply. Consider:
 3. What conjectures can you propose about the interesting structures?
 4. Which discoveries should be added to the permanent library?
 
-Output your decisions as a JSON block between <decisions> and </decisions> tags:
+Respond with only your decisions as a single JSON object, with no prose or code
+fences around it. Put your analysis in the "analysis" field:
 
-<decisions>
 {{
   "analysis": "Your detailed mathematical analysis",
   "add_to_library": [
@@ -615,67 +1421,112 @@ Output your decisions as a JSON block between <decisions> and </decisions> tags:
     }}
   ]
 }}
-</decisions>
 
 Only add structures that are genuinely novel and have interesting models.
 If nothing stands out this cycle, return empty lists."""
 
-    def _build_context(self, cycle_num: int) -> str:
+    def _build_context(self, cycle_num: int, pending: CycleReport | None = None) -> str:
         """Build the context message for the agent."""
         parts = [f"## Research Cycle {cycle_num}"]
 
-        # Library summary
-        known = self.library.list_known()
-        parts.append(f"\n### Known Structures ({len(known)}):")
-        for name in known[:20]:
-            parts.append(f"  - {name}")
+        # Library summary: only the listed entries are loaded
+        parts.append(f"\n### Known Structures ({self.library.count_known()}):")
+        parts.extend(f"  - {name}" for name in self.library.list_known(limit=20))
 
-        discovered = self.library.list_discovered()
+        discovered = self.library.list_discovered(limit=10)
         if discovered:
-            parts.append(f"\n### Previously Discovered ({len(discovered)}):")
-            for d in discovered[:10]:
-                parts.append(f"  - {d['name']} (score: {d.get('score', '?')})")
+            parts.append(f"\n### Previously Discovered ({self.library.count_discovered()}):")
+            parts.extend(
+                f"  - {d['name']} (score: {d.get('score', '?')})" for d in discovered
+            )
 
         # Previous cycle results
-        if self.history:
-            last = self.history[-1]
-            parts.append(f"\n### Previous Cycle ({last.cycle_number}) Summary:")
-            parts.append(f"  - Candidates generated: {last.candidates_generated}")
-            parts.append(f"  - With models: {last.candidates_with_models}")
-            parts.append(f"  - Discoveries: {len(last.discoveries)}")
+        last = pending or (self.history[-1] if self.history else None)
+        if last is not None:
+            discoveries = (
+                "(still being interpreted)" if pending is not None else len(last.discoveries)
+            )
+            parts.extend((
+                f"\n### Previous Cycle ({last.cycle_number}) Summary:",
+                f"  - Candidates generated: {last.candidates_generated}",
+                f"  - With models: {last.candidates_with_models}",
+                f"  - Discoveries: {discoveries}",
+            ))
             if last.top_candidates:
                 parts.append("  - Top candidates:")
-                for c in last.top_candidates[:5]:
-                    parts.append(f"    * {c['name']} (score: {c.get('score', '?')})")
+                parts.extend(
+                    f"    * {c['name']} (score: {c.get('score', '?')})"
+                    for c in last.top_candidates[:5]
+                )
 
         # Config
-        parts.append(f"\n### Suggested base structures: {', '.join(self.config.base_structures)}")
-        parts.append(f"### Explore depth: {self.config.explore_depth}")
-        parts.append(f"### Max model size: {self.config.max_model_size}")
+        parts.extend((
+            f"\n### Suggested base structures: {', '.join(self.config.base_structures)}",
+            f"### Explore depth: {self.config.explore_depth}",
+            f"### Max model size: {self.config.max_model_size}",
+        ))
 
         return "\n".join(parts)
 
+    def _parse_response(self, text: str, tag: str) -> dict | None:
+        """Parse a Claude response that should be a single JSON object.
+
+        The object is taken from the first ``{``, so a code fence or prose
+        before it is skipped. If that does not parse, falls back to
+        extracting a ``<tag>...</tag>`` block (older cached replies).
+        """
+        data = self._loads_lenient(text)
+        if data is not None:
+            return data
+        return self._parse_json_block(text, tag)
+
     def _parse_json_block(self, text: str, tag: str) -> dict | None:
         """Extract a JSON block from between XML-style tags."""
-        pattern = rf"<{tag}>\s*(.*?)\s*</{tag}>"
-        match = re.search(pattern, text, re.DOTALL)
-        if not match:
+        open_tag = f"<{tag}>"
+        start = text.find(open_tag)
+        if start == -1:
+            return None
+        start += len(open_tag)
+        end = text.find(f"</{tag}>", start)
+        if end == -1:
             return None
+        return self._loads_lenient(text[start:end])
 
-        json_str = match.group(1).strip()
+    def _loads_lenient(self, json_str: str) -> dict | None:
+        """Parse the first JSON object in ``json_str``, repairing trailing commas and truncation."""
+        obj = _scan_json_object(json_str)
+        if obj is None:
+            return None
         try:
-            return json.loads(json_str)
+            return _loads(obj)
         except json.JSONDecodeError:
-            # Try fixing trailing commas
-            fixed = re.sub(r",\s*([}\]])", r"\1", json_str)
-            try:
-                return json.loads(fixed)
-            except json.JSONDecodeError:
-                return None
+            return None
 
     def _save_report(self, report: CycleReport) -> None:
         """Save a cycle report to disk.
 
+        During run() the report is handed to the background writer thread,
+        so the next cycle does not wait on formatting or file I/O.
+        """
+        if self._report_queue is not None:
+            self._report_queue.put(report)
+        else:
+            self._write_report(report)
+
+    def _report_writer(self) -> None:
+        """Background thread: write queued reports in order until a None sentinel."""
+        assert self._report_queue is not None
+        while (report := self._report_queue.get()) is not None:
+            # Formatting happens here too, so any failure must not end the
+            # thread and silently drop the reports queued behind it
+            try:
+                self._write_report(report)
+            except Exception as e:
+                self._log(f"Failed to save cycle {report.cycle_number} report: {e}", "red")
+
+    def _write_report(self, report: CycleReport) -> None:
+        """Write one cycle report as Markdown.
+
         Uses persistent numbering: scans existing reports and picks
         max_existing + 1 so that multiple runs never overwrite each other.
         """
@@ -685,63 +1536,63 @@ If nothing stands out this cycle, return empty lists."""
         # Find the highest existing cycle number
         max_num = 0
         for f in reports_dir.glob("cycle_*_report.md"):
-            m = re.match(r"cycle_(\d+)_report\.md", f.name)
+            m = self._REPORT_NAME_RE.match(f.name)
             if m:
                 max_num = max(max_num, int(m.group(1)))
 
         next_num = max_num + 1
         report_path = reports_dir / f"cycle_{next_num:03d}_report.md"
-        content = self._format_report_md(report)
-        report_path.write_text(content)
-
-    def _format_report_md(self, report: CycleReport) -> str:
-        """Format a cycle report as Markdown."""
-        lines = [
-            f"# Research Cycle {report.cycle_number}",
-            "",
-            f"**Goal:** {report.goal}",
-            f"**Duration:** {report.duration_seconds:.1f}s",
-            f"**Model:** {self.config.model} (effort: {self.config.effort})",
-            "",
-            "## Statistics",
-            f"- Candidates generated: {report.candidates_generated}",
-            f"- Candidates with models: {report.candidates_with_models}",
-            f"- Discoveries added: {len(report.discoveries)}",
-            f"- Conjectures: {len(report.conjectures)}",
-            "",
-        ]
+        # Write then rename, so a crash never leaves a half-written report
+        tmp = report_path.with_suffix(".md.tmp")
+        try:
+            with tmp.open("w", encoding="utf-8", buffering=65536) as f:
+                self._write_report_md(report, f)
+        except Exception:
+            tmp.unlink(missing_ok=True)
+            raise
+        tmp.replace(report_path)
+
+    def _write_report_md(self, report: CycleReport, f: TextIO) -> None:
+        """Write a cycle report as Markdown, section by section."""
+        f.write(_REPORT_HEADER.format_map({
+            "cycle_number": report.cycle_number,
+            "goal": report.goal,
+            "duration": report.duration_seconds,
+            "model": self.config.model,
+            "effort": self.config.effort,
+            "generated": report.candidates_generated,
+            "with_models": report.candidates_with_models,
+            "n_discoveries": len(report.discoveries),
+            "n_conjectures": len(report.conjectures),
+        }))
 
         if report.top_candidates:
-            lines.append("## Top Candidates")
-            lines.append("")
+            f.write("\n## Top Candidates\n")
             for c in report.top_candidates[:10]:
-                lines.append(f"### {c['name']}")
-                lines.append(f"- Move: {c.get('move', '?')}")
-                lines.append(f"- Parents: {c.get('parents', [])}")
-                lines.append(f"- Score: {c.get('score', '?')}")
                 spectrum = c.get("model_spectrum")
-                if spectrum:
-                    lines.append(f"- Model spectrum: {spectrum}")
-                lines.append("")
+                f.write(_REPORT_CANDIDATE.format_map({
+                    "name": c["name"],
+                    "move": c.get("move", "?"),
+                    "parents": c.get("parents", []),
+                    "score": c.get("score", "?"),
+                    "spectrum": f"- Model spectrum: {spectrum}\n" if spectrum else "",
+                }))
 
         if report.discoveries:
-            lines.append("## Discoveries")
-            lines.append("")
-            for d in report.discoveries:
-                lines.append(f"- **{d.get('name', '?')}** (score: {d.get('score', '?')})")
-            lines.append("")
+            f.write("\n## Discoveries\n\n")
+            f.writelines(
+                f"- **{d.get('name', '?')}** (score: {d.get('score', '?')})\n"
+                for d in report.discoveries
+            )
 
         if report.conjectures:
-            lines.append("## Conjectures")
-            lines.append("")
-            for c in report.conjectures:
-                lines.append(f"- [{c.get('about', '?')}] {c.get('statement', '?')}")
-            lines.append("")
+            f.write("\n## Conjectures\n\n")
+            f.writelines(
+                f"- [{c.get('about', '?')}] {c.get('statement', '?')}\n"
+                for c in report.conjectures
+            )
 
         if report.agent_reasoning:
-            lines.append("## Agent Reasoning")
-            lines.append("")
-            lines.append(report.agent_reasoning[:5000])
-            lines.append("")
-
-        return "\n".join(lines)
+            f.write("\n## Agent Reasoning\n\n")
+            f.write(report.agent_reasoning)
+            f.write("\n")
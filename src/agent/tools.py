@@ -7,20 +7,26 @@ that the agent invokes via function calling.
 
 from __future__ import annotations
 
+import heapq
 import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from dataclasses import dataclass
-from typing import Any
+from operator import itemgetter
+from typing import Any, Iterator
 
 from src.core.signature import Signature
 from src.library.known_structures import load_all_known, load_by_name
 from src.library.manager import LibraryManager
-from src.moves.engine import MoveEngine, MoveKind, MoveResult
+from src.moves.engine import MoveEngine, MoveKind
 from src.scoring.engine import ScoreBreakdown, ScoringEngine
-from src.solvers.mace4 import Mace4Result, Mace4Solver, Mace4Fallback, ModelSpectrum
-from src.solvers.prover9 import ConjectureGenerator, ProofResult, Prover9Solver
-from src.solvers.z3_solver import Z3ModelFinder
-from src.solvers.router import SmartSolverRouter
-from src.core.ast_nodes import Equation
+from src.solvers.mace4 import ModelSpectrum
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 
 # JSON schema definitions for the agent's tool interface
@@ -29,7 +35,8 @@ TOOL_SCHEMAS = [
         "name": "explore",
         "description": (
             "Apply structural moves to generate candidate algebraic structures. "
-            "Moves: ABSTRACT, DUALIZE, COMPLETE, QUOTIENT, INTERNALIZE, TRANSFER, DEFORM, SELF_DISTRIB."
+            "Moves: ABSTRACT, DUALIZE, COMPLETE, QUOTIENT, INTERNALIZE, TRANSFER, DEFORM, SELF_DISTRIB. "
+            "Runs to the full depth unless stop_when_stable is set; depth_reached reports how far it went."
         ),
         "input_schema": {
             "type": "object",
@@ -59,6 +66,14 @@ TOOL_SCHEMAS = [
                     "type": "number",
                     "description": "Only return candidates above this score",
                 },
+                "stop_when_stable": {
+                    "type": "boolean",
+                    "default": False,
+                    "description": (
+                        "Stop deepening before `depth` once a depth (from the second on) "
+                        "leaves the top 20 candidates unchanged"
+                    ),
+                },
             },
             "required": ["base_structures"],
         },
@@ -76,11 +91,54 @@ TOOL_SCHEMAS = [
                     "type": "string",
                     "description": "Name/ID of the candidate signature",
                 },
+                "signature_ids": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Several candidates at once, checked in parallel (instead of signature_id)",
+                },
                 "min_size": {"type": "integer", "default": 2},
                 "max_size": {"type": "integer", "default": 8},
                 "max_models_per_size": {"type": "integer", "default": 10},
             },
-            "required": ["signature_id"],
+        },
+    },
+    {
+        "name": "explore_batch",
+        "description": (
+            "Run several independent explore calls in one tool call, in parallel. "
+            "Each entry takes the same arguments as explore."
+        ),
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "explorations": {
+                    "type": "array",
+                    "items": {"type": "object"},
+                    "description": "explore arguments, one object per exploration",
+                },
+            },
+            "required": ["explorations"],
+        },
+    },
+    {
+        "name": "check_models_batch",
+        "description": (
+            "Search for finite models of several candidate signatures in one tool "
+            "call, spread over parallel solver processes."
+        ),
+        "input_schema": {
+            "type": "object",
+            "properties": {
+                "signature_ids": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Names/IDs of the candidate signatures",
+                },
+                "min_size": {"type": "integer", "default": 2},
+                "max_size": {"type": "integer", "default": 8},
+                "max_models_per_size": {"type": "integer", "default": 10},
+            },
+            "required": ["signature_ids"],
         },
     },
     {
@@ -135,55 +193,266 @@ TOOL_SCHEMAS = [
     },
 ]
 
+# Lookups and the compact wire form, built once instead of per request
+TOOL_SCHEMAS_BY_NAME = {t["name"]: t for t in TOOL_SCHEMAS}
+TOOL_SCHEMAS_JSON = json.dumps(TOOL_SCHEMAS, separators=(",", ":"))
+
+
+# Deepening stops early once this many best candidates survive a depth unchanged
+_STABLE_TOP_K = 20
+
+
+def _run_exploration(
+    work: tuple,
+) -> tuple[int, list[tuple[dict[str, Any], Signature]], int]:
+    """Apply moves to depth and score the results.
+
+    Top-level so it can run in a worker process. Returns the total number
+    of results, a (candidate_dict, signature) pair for each result scoring
+    at least the threshold, and the depth actually reached: with
+    `stop_when_stable`, deepening ends after a depth that leaves the top
+    candidates (by structure) unchanged, so never before depth 2.
+    """
+    bases, move_names, exclude_names, depth, threshold, known_fps, stop_when_stable = work
+    move_engine = MoveEngine()
+    scorer = ScoringEngine()
+
+    # Build excluded set
+    excluded = {MoveKind(m) for m in exclude_names} if exclude_names else set()
+
+    # Apply moves iteratively for depth > 1, scoring each depth's results
+    current = bases
+    total = 0
+    scored: list[tuple[dict[str, Any], Signature]] = []
+    # Different parents often produce the same signature; expand each once.
+    # Fingerprints only record the shape, so the full structure is the key.
+    expanded = {sig.structure_key() for sig in bases}
+    rows: set[tuple[MoveKind, tuple]] = set()
+    top_keys: set[tuple] | None = None
+    depth_reached = 0
+
+    for d in range(depth):
+        if move_names:
+            results = []
+            for mk in move_names:
+                kind = MoveKind(mk)
+                if kind not in excluded:
+                    results.extend(move_engine.apply_move(kind, current))
+        else:
+            if excluded:
+                results = []
+                for kind in MoveKind:
+                    if kind not in excluded:
+                        results.extend(move_engine.apply_move(kind, current))
+            else:
+                results = move_engine.apply_all_moves(current)
+
+        current = []
+        survivors = []
+        for r in results:
+            key = r.signature.structure_key()
+            if (r.move, key) in rows:
+                continue
+            rows.add((r.move, key))
+            total += 1
+            if key not in expanded:
+                expanded.add(key)
+                current.append(r.signature)
+            if scorer.upper_bound(r.signature, known_fingerprints=known_fps) >= threshold:
+                survivors.append(r)
+
+        scores = scorer.score_many(
+            [r.signature for r in survivors], known_fingerprints=known_fps,
+        )
+        for r, score in zip(survivors, scores):
+            if score.total >= threshold:
+                scored.append(({
+                    "name": r.signature.name,
+                    "move": r.move.value,
+                    "parents": r.parents,
+                    "description": r.description,
+                    "score": round(score.total, 4),
+                    "sorts": len(r.signature.sorts),
+                    "operations": len(r.signature.operations),
+                    "axioms": len(r.signature.axioms),
+                }, r.signature))
+
+        depth_reached = d + 1
+        if stop_when_stable:
+            best = heapq.nlargest(_STABLE_TOP_K, scored, key=lambda item: item[0]["score"])
+            keys = {sig.structure_key() for _, sig in best}
+            if keys == top_keys:
+                break
+            top_keys = keys
+
+    return total, scored, depth_reached
+
+
+def _loads(data: str | bytes) -> Any:
+    """Parse tool-call arguments, using orjson when installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dumps(obj: Any) -> str:
+    """Serialize a tool result compactly, using orjson when installed.
+
+    Spectra are keyed by int size; both paths write those keys as strings.
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj, separators=(",", ":"))
+
+
+def _spectrum_result(name: str, spectrum: ModelSpectrum) -> dict[str, Any]:
+    """The check_models tool result for one computed spectrum."""
+    return {
+        "signature": name,
+        "spectrum": spectrum.spectrum,
+        "sizes_with_models": spectrum.sizes_with_models(),
+        "total_models": spectrum.total_models(),
+        "example_models": {
+            str(size): [m.to_dict() for m in spectrum.iter_models(size)]
+            for size, models in spectrum.models_by_size.items()
+            if models
+        },
+    }
+
 
 class ToolExecutor:
     """Executes tool calls from the agent."""
 
-    def __init__(self, library: LibraryManager):
+    # Tool name -> handler method name. Names rather than bound methods, so
+    # instances hold no reference cycle to themselves and overrides apply.
+    _TOOL_METHODS = {
+        "explore": "_explore",
+        "check_models": "_check_models",
+        "explore_batch": "_explore_batch",
+        "check_models_batch": "_check_models_batch",
+        "prove": "_prove",
+        "score": "_score",
+        "search_library": "_search_library",
+        "add_to_library": "_add_to_library",
+    }
+
+    def __init__(
+        self,
+        library: LibraryManager,
+        portfolio: bool = False,
+        cache_spectra: bool = True,
+    ):
+        # Solver modules (z3 in particular) load here, not at import time,
+        # so TOOL_SCHEMAS and the module-level helpers stay cheap to import
+        from src.solvers.cache import SpectrumCache
+        from src.solvers.prover9 import ConjectureGenerator, Prover9Solver
+        from src.solvers.router import SmartSolverRouter
+
         self.library = library
         self.move_engine = MoveEngine()
         self.scorer = ScoringEngine()
 
-        # Smart solver routing: picks Mace4 or Z3 based on signature
-        self.model_finder = SmartSolverRouter()
+        # Smart solver routing: picks Mace4 or Z3 based on signature, or
+        # races both on every size in portfolio mode
+        self.model_finder = SmartSolverRouter(portfolio=portfolio)
 
         # Store router config so parallel workers can recreate it
         self.z3_timeout_ms = self.model_finder.z3_timeout_ms
         self.mace4_timeout = self.model_finder.mace4_timeout
 
+        # Complete spectra persist across sessions under library/cache/spectra/
+        self.spectrum_cache = (
+            SpectrumCache(library.base_path / "cache" / "spectra", self.model_finder.cache_tag())
+            if cache_spectra else None
+        )
+
         self.prover9 = Prover9Solver()
         self.conjecture_gen = ConjectureGenerator()
 
         # In-memory cache of candidates from current session
         self._candidates: dict[str, Signature] = {}
         self._spectra: dict[str, ModelSpectrum] = {}
+        # Scores by structure and derivation chain (everything the scorer
+        # reads), with the spectrum they were computed from
+        self._score_cache: dict[tuple, tuple[ModelSpectrum | None, ScoreBreakdown]] = {}
 
     def execute(self, tool_name: str, args: dict[str, Any]) -> dict[str, Any]:
         """Execute a tool call and return the result."""
-        dispatch = {
-            "explore": self._explore,
-            "check_models": self._check_models,
-            "prove": self._prove,
-            "score": self._score,
-            "search_library": self._search_library,
-            "add_to_library": self._add_to_library,
-        }
-
-        handler = dispatch.get(tool_name)
-        if not handler:
+        method = self._TOOL_METHODS.get(tool_name)
+        if not method:
             return {"error": f"Unknown tool: {tool_name}"}
 
         try:
-            return handler(args)
+            return getattr(self, method)(args)
         except Exception as e:
             return {"error": str(e)}
 
+    def execute_json(self, tool_name: str, args_json: str | bytes) -> str:
+        """Like execute(), but JSON in and out, for raw tool-use round trips."""
+        try:
+            args = _loads(args_json)
+        except ValueError as e:
+            return _dumps({"error": f"Invalid arguments: {e}"})
+        if not isinstance(args, dict):
+            return _dumps({"error": "Arguments must be a JSON object"})
+        return _dumps(self.execute(tool_name, args))
+
     def _explore(self, args: dict[str, Any]) -> dict[str, Any]:
+        work = self._prepare_explore(args, self.library.all_fingerprints_frozen())
+        if isinstance(work, dict):
+            return work
+        return self._finish_explore(*_run_exploration(work))
+
+    def explore_many(
+        self,
+        args_list: list[dict[str, Any]],
+        max_workers: int | None = None,
+    ) -> Iterator[tuple[int, dict[str, Any]]]:
+        """Run several independent explore calls, in parallel processes.
+
+        Yields (index_into_args_list, result) pairs in completion order;
+        each result is the same format as the ``explore`` tool's. Move
+        application and scoring are CPU-bound Python, so explorations run
+        in separate processes; their candidates are registered here.
+        """
+        known_fps = self.library.all_fingerprints_frozen()
+        work_items = []
+        valid_indices = []
+        for i, args in enumerate(args_list):
+            work = self._prepare_explore(args, known_fps)
+            if isinstance(work, dict):
+                yield i, work
+                continue
+            work_items.append(work)
+            valid_indices.append(i)
+
+        if max_workers is None:
+            max_workers = min(len(work_items), os.cpu_count() or 4)
+        if max_workers <= 1 or len(work_items) <= 1:
+            for i, work in zip(valid_indices, work_items):
+                try:
+                    yield i, self._finish_explore(*_run_exploration(work))
+                except Exception as e:
+                    yield i, {"error": str(e), "candidates": []}
+            return
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(_run_exploration, work): i
+                for i, work in zip(valid_indices, work_items)
+            }
+            for future in as_completed(futures):
+                i = futures.pop(future)
+                try:
+                    yield i, self._finish_explore(*future.result())
+                except Exception as e:
+                    yield i, {"error": str(e), "candidates": []}
+
+    def _prepare_explore(
+        self, args: dict[str, Any], known_fps: set[str],
+    ) -> tuple | dict[str, Any]:
+        """Resolve an explore call's arguments into a work item (or an error result)."""
         base_names = args.get("base_structures", [])
-        move_names = args.get("moves")
-        exclude_names = args.get("exclude_moves")
-        depth = args.get("depth", 1)
-        threshold = args.get("score_threshold", 0.0)
 
         # Load base structures
         bases = []
@@ -195,59 +464,43 @@ class ToolExecutor:
         if not bases:
             return {"error": "No valid base structures found", "candidates": []}
 
-        # Build excluded set
-        excluded = {MoveKind(m) for m in exclude_names} if exclude_names else set()
-
-        # Apply moves iteratively for depth > 1
-        current = bases
-        all_results: list[MoveResult] = []
-
-        for d in range(depth):
-            if move_names:
-                results = []
-                for mk in move_names:
-                    kind = MoveKind(mk)
-                    if kind not in excluded:
-                        results.extend(self.move_engine.apply_move(kind, current))
-            else:
-                if excluded:
-                    results = []
-                    for kind in MoveKind:
-                        if kind not in excluded:
-                            results.extend(self.move_engine.apply_move(kind, current))
-                else:
-                    results = self.move_engine.apply_all_moves(current)
-
-            all_results.extend(results)
-            current = [r.signature for r in results]
-
-        # Score and filter
-        known_fps = set(self.library.all_fingerprints())
-        scored = []
-        for r in all_results:
-            score = self.scorer.score(r.signature, known_fingerprints=known_fps)
-            if score.total >= threshold:
-                self._candidates[r.signature.name] = r.signature
-                scored.append({
-                    "name": r.signature.name,
-                    "move": r.move.value,
-                    "parents": r.parents,
-                    "description": r.description,
-                    "score": round(score.total, 4),
-                    "sorts": len(r.signature.sorts),
-                    "operations": len(r.signature.operations),
-                    "axioms": len(r.signature.axioms),
-                })
-
-        scored.sort(key=lambda x: x["score"], reverse=True)
+        return (
+            bases,
+            args.get("moves"),
+            args.get("exclude_moves"),
+            args.get("depth", 1),
+            args.get("score_threshold", 0.0),
+            known_fps,
+            args.get("stop_when_stable", False),
+        )
+
+    def _finish_explore(
+        self,
+        total: int,
+        scored: list[tuple[dict[str, Any], Signature]],
+        depth_reached: int,
+    ) -> dict[str, Any]:
+        """Register an exploration's candidates and build the tool result."""
+        for candidate, sig in scored:
+            self._candidates[candidate["name"]] = sig
 
         return {
-            "total_candidates": len(all_results),
+            "total_candidates": total,
             "above_threshold": len(scored),
-            "candidates": scored[:50],  # Top 50
+            "depth_reached": depth_reached,
+            # Top 50, selected without sorting everything above threshold
+            "candidates": heapq.nlargest(
+                50, (candidate for candidate, _ in scored), key=itemgetter("score")
+            ),
         }
 
+    def candidate_key(self, name: str) -> tuple:
+        """Structure key of the candidate registered under `name`."""
+        return self._candidates[name].structure_key()
+
     def _check_models(self, args: dict[str, Any]) -> dict[str, Any]:
+        if "signature_ids" in args:
+            return self._check_models_batch(args)
         sig_id = args["signature_id"]
         min_size = args.get("min_size", 2)
         max_size = args.get("max_size", 8)
@@ -257,20 +510,36 @@ class ToolExecutor:
         if not sig:
             return {"error": f"Signature '{sig_id}' not found"}
 
-        spectrum = self.model_finder.compute_spectrum(sig, min_size, max_size, max_models)
+        spectrum = self._cached_spectrum(sig, min_size, max_size, max_models)
+        if spectrum is None:
+            spectrum = self.model_finder.compute_spectrum(sig, min_size, max_size, max_models)
+            if self.spectrum_cache:
+                self.spectrum_cache.put(sig, min_size, max_size, max_models, spectrum)
         self._spectra[sig_id] = spectrum
-
-        return {
-            "signature": sig_id,
-            "spectrum": spectrum.spectrum,
-            "sizes_with_models": spectrum.sizes_with_models(),
-            "total_models": spectrum.total_models(),
-            "example_models": {
-                str(size): [m.to_dict() for m in models[:2]]
-                for size, models in spectrum.models_by_size.items()
-                if models
-            },
-        }
+        return _spectrum_result(sig_id, spectrum)
+
+    def _cached_spectrum(
+        self, sig: Signature, min_size: int, max_size: int, max_models: int,
+    ) -> ModelSpectrum | None:
+        if self.spectrum_cache is None:
+            return None
+        return self.spectrum_cache.get(sig, min_size, max_size, max_models)
+
+    def _explore_batch(self, args: dict[str, Any]) -> dict[str, Any]:
+        explorations = args["explorations"]
+        results: list[dict[str, Any]] = [{} for _ in explorations]
+        for i, result in self.explore_many(explorations):
+            results[i] = result
+        return {"results": results}
+
+    def _check_models_batch(self, args: dict[str, Any]) -> dict[str, Any]:
+        results = self.check_models_batch(
+            [{"name": sig_id} for sig_id in args["signature_ids"]],
+            min_size=args.get("min_size", 2),
+            max_size=args.get("max_size", 8),
+            max_models_per_size=args.get("max_models_per_size", 10),
+        )
+        return {"results": results}
 
     def check_models_batch(
         self,
@@ -285,54 +554,59 @@ class ToolExecutor:
         Returns a list of result dicts in the same order as candidates.
         Each result is the same format as _check_models output.
         """
-        from src.solvers.parallel import parallel_compute_spectra
+        results: list[dict[str, Any]] = [{} for _ in candidates]
+        for i, result in self.iter_check_models(
+            candidates, min_size, max_size, max_models_per_size, max_workers,
+        ):
+            results[i] = result
+        return results
 
-        # Resolve signatures and build work items
-        sigs: list[Signature | None] = []
-        for candidate in candidates:
-            name = candidate["name"]
-            sig = self._candidates.get(name) or load_by_name(name)
-            sigs.append(sig)
+    def iter_check_models(
+        self,
+        candidates: list[dict[str, Any]],
+        min_size: int = 2,
+        max_size: int = 8,
+        max_models_per_size: int = 10,
+        max_workers: int | None = None,
+    ) -> Iterator[tuple[int, dict[str, Any]]]:
+        """Check models for multiple candidates in parallel, as they finish.
 
+        Yields (index_into_candidates, result) pairs in completion order, so
+        callers can report each candidate as soon as its spectrum is known.
+        Candidates whose signature cannot be resolved, or whose spectrum is
+        already in the disk cache, are yielded first.
+        """
+        from src.solvers.parallel import iter_compute_spectra
+
+        # Resolve signatures and build work items, answering cache hits directly
         work_items = []
         valid_indices = []
-        for i, sig in enumerate(sigs):
-            if sig is not None:
-                work_items.append((
-                    sig, min_size, max_size, max_models_per_size,
-                    self.z3_timeout_ms, self.mace4_timeout,
-                ))
-                valid_indices.append(i)
-
-        # Run parallel computation
-        spectra = parallel_compute_spectra(work_items, max_workers=max_workers)
-
-        # Build results
-        results: list[dict[str, Any]] = []
-        spectrum_iter = iter(spectra)
         for i, candidate in enumerate(candidates):
             name = candidate["name"]
-            sig = sigs[i]
+            sig = self._candidates.get(name) or load_by_name(name)
             if sig is None:
-                results.append({"error": f"Signature '{name}' not found"})
+                yield i, {"error": f"Signature '{name}' not found"}
                 continue
-
-            spectrum = next(spectrum_iter)
+            cached = self._cached_spectrum(sig, min_size, max_size, max_models_per_size)
+            if cached is not None:
+                self._spectra[name] = cached
+                yield i, _spectrum_result(name, cached)
+                continue
+            work_items.append((
+                sig, min_size, max_size, max_models_per_size,
+                self.z3_timeout_ms, self.mace4_timeout, self.model_finder.portfolio,
+            ))
+            valid_indices.append(i)
+
+        for k, spectrum in iter_compute_spectra(work_items, max_workers=max_workers):
+            i = valid_indices[k]
+            name = candidates[i]["name"]
+            if self.spectrum_cache:
+                self.spectrum_cache.put(
+                    work_items[k][0], min_size, max_size, max_models_per_size, spectrum,
+                )
             self._spectra[name] = spectrum
-
-            results.append({
-                "signature": name,
-                "spectrum": spectrum.spectrum,
-                "sizes_with_models": spectrum.sizes_with_models(),
-                "total_models": spectrum.total_models(),
-                "example_models": {
-                    str(size): [m.to_dict() for m in models[:2]]
-                    for size, models in spectrum.models_by_size.items()
-                    if models
-                },
-            })
-
-        return results
+            yield i, _spectrum_result(name, spectrum)
 
     def _prove(self, args: dict[str, Any]) -> dict[str, Any]:
         sig_id = args["signature_id"]
@@ -343,11 +617,11 @@ class ToolExecutor:
         if not self.prover9.is_available():
             return {"error": "Prover9 not available. Install from https://www.cs.unm.edu/~mccune/prover9/"}
 
-        # Generate and attempt conjectures
+        # Generate and attempt conjectures, in parallel Prover9 processes
         conjectures = self.conjecture_gen.generate_conjectures(sig)
+        proofs = self.prover9.prove_many(sig, conjectures, timeout=args.get("timeout_sec"))
         results = []
-        for conj in conjectures:
-            result = self.prover9.prove(sig, conj)
+        for conj, result in zip(conjectures, proofs):
             results.append({
                 "conjecture": str(conj),
                 "status": result.status.value,
@@ -362,15 +636,23 @@ class ToolExecutor:
         if not sig:
             return {"error": f"Signature '{sig_id}' not found"}
 
-        spectrum = self._spectra.get(sig_id)
-        known_fps = set(self.library.all_fingerprints())
-        breakdown = self.scorer.score(sig, spectrum, known_fps)
+        breakdown = self._scored(sig, self._spectra.get(sig_id))
 
         return {
             "signature": sig_id,
             "scores": breakdown.to_dict(),
         }
 
+    def _scored(self, sig: Signature, spectrum: ModelSpectrum | None) -> ScoreBreakdown:
+        """Score `sig`, reusing the last result while its spectrum is unchanged."""
+        key = (sig.structure_key(), tuple(sig.derivation_chain))
+        cached = self._score_cache.get(key)
+        if cached is not None and cached[0] is spectrum:
+            return cached[1]
+        breakdown = self.scorer.score(sig, spectrum, self.library.all_fingerprints_frozen())
+        self._score_cache[key] = (spectrum, breakdown)
+        return breakdown
+
     def _search_library(self, args: dict[str, Any]) -> dict[str, Any]:
         query = args.get("query", "")
         min_score = args.get("min_score")
@@ -406,9 +688,10 @@ class ToolExecutor:
                 "Only structures with verified models can be added."
             }
 
-        known_fps = set(self.library.all_fingerprints())
-        score = self.scorer.score(sig, spectrum, known_fps)
+        score = self._scored(sig, spectrum)
 
         self.library.add_discovery(sig, name, notes, score)
+        # Novelty depends on the library's fingerprints, which just changed
+        self._score_cache.clear()
 
         return {"status": "added", "name": name, "score": score.total}
@@ -9,15 +9,31 @@ Usage:
 
 from __future__ import annotations
 
+import heapq
 import json
 import os
 import sys
+from functools import lru_cache
+from itertools import islice
+from operator import itemgetter
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 import click
-from rich.console import Console
 
-console = Console()
+if TYPE_CHECKING:
+    from rich.console import Console
+
+
+@lru_cache(maxsize=None)
+def _console() -> Console:
+    """The CLI's console, created on first output.
+
+    rich (like every other heavy dependency) is imported inside the
+    commands, so `mathdisc --help` and shell completion only load click.
+    """
+    from rich.console import Console
+    return Console()
 
 
 @click.group()
@@ -38,7 +54,10 @@ def main(ctx: click.Context, library_path: str) -> None:
 @click.option("--max-size", default=6, help="Maximum model size to search")
 @click.option("--threshold", default=0.0, help="Minimum score threshold")
 @click.option("--top", default=20, help="Number of top candidates to display")
-@click.option("--workers", default=None, type=int, help="Parallel workers for model checking (default: CPU count)")
+@click.option(
+    "--workers", "--parallel", "workers", default=None, type=int,
+    help="Parallel workers for model checking (default: one per candidate, up to CPU count)",
+)
 @click.pass_context
 def explore(
     ctx: click.Context,
@@ -57,7 +76,8 @@ def explore(
     from src.moves.engine import MoveEngine, MoveKind
     from src.scoring.engine import ScoringEngine
     from src.utils.display import (
-        display_exploration_results, display_score, display_signature, display_spectrum,
+        display_exploration_results, display_model_check_results, display_score,
+        display_signature,
     )
 
     # Load base structures
@@ -65,16 +85,16 @@ def explore(
         bases = [load_by_name(name) for name in base]
         bases = [b for b in bases if b is not None]
         if not bases:
-            console.print("[red]No valid base structures found.[/red]")
-            console.print(f"Available: {', '.join(s.name for s in load_all_known())}")
+            _console().print("[red]No valid base structures found.[/red]")
+            _console().print(f"Available: {', '.join(s.name for s in load_all_known())}")
             return
     else:
         bases = load_all_known()
 
-    console.print(f"\n[bold]Starting exploration[/bold]")
-    console.print(f"  Base structures: {[b.name for b in bases]}")
-    console.print(f"  Depth: {depth}")
-    console.print(f"  Threshold: {threshold}")
+    _console().print(f"\n[bold]Starting exploration[/bold]")
+    _console().print(f"  Base structures: {[b.name for b in bases]}")
+    _console().print(f"  Depth: {depth}")
+    _console().print(f"  Threshold: {threshold}")
 
     engine = MoveEngine()
     scorer = ScoringEngine()
@@ -93,14 +113,18 @@ def explore(
             move_kinds = [m for m in MoveKind if m not in excluded]
         else:
             move_kinds = [m for m in move_kinds if m not in excluded]
-        console.print(f"  Excluded moves: {[m.value for m in excluded]}")
+        _console().print(f"  Excluded moves: {[m.value for m in excluded]}")
 
     # Iterative deepening
     current = bases
     all_results = []
+    # Different parents often produce the same signature; expand each once.
+    # Fingerprints only record the shape, so the full structure is the key.
+    expanded = {sig.structure_key() for sig in bases}
+    rows = set()
 
     for d in range(depth):
-        console.print(f"\n[cyan]Depth {d + 1}...[/cyan]")
+        _console().print(f"\n[cyan]Depth {d + 1}...[/cyan]")
         if move_kinds:
             results = []
             for mk in move_kinds:
@@ -108,18 +132,33 @@ def explore(
         else:
             results = engine.apply_all_moves(current)
 
-        all_results.extend(results)
-        current = [r.signature for r in results]
-        console.print(f"  Generated {len(results)} candidates (total: {len(all_results)})")
+        before = len(all_results)
+        current = []
+        for r in results:
+            key = r.signature.structure_key()
+            if (r.move, key) in rows:
+                continue
+            rows.add((r.move, key))
+            all_results.append(r)
+            if key not in expanded:
+                expanded.add(key)
+                current.append(r.signature)
+        _console().print(
+            f"  Generated {len(all_results) - before} candidates (total: {len(all_results)})"
+        )
 
     # Score all candidates
     from src.library.manager import LibraryManager
     library = LibraryManager(ctx.obj["library_path"])
-    known_fps = set(library.known_fingerprints())
+    known_fps = library.known_fingerprints_frozen()
 
+    survivors = [
+        r for r in all_results
+        if scorer.upper_bound(r.signature, known_fingerprints=known_fps) >= threshold
+    ]
+    scores = scorer.score_many([r.signature for r in survivors], known_fingerprints=known_fps)
     scored = []
-    for r in all_results:
-        score = scorer.score(r.signature, known_fingerprints=known_fps)
+    for r, score in zip(survivors, scores):
         if score.total >= threshold:
             scored.append({
                 "name": r.signature.name,
@@ -134,22 +173,23 @@ def explore(
                 "_score": score,
             })
 
-    scored.sort(key=lambda x: x["score"], reverse=True)
+    # Only the best few are ever shown or checked: select them, don't sort all
+    best = heapq.nlargest(max(top, 3), scored, key=itemgetter("score"))
 
-    console.print(f"\n[bold green]{len(scored)} candidates above threshold {threshold}[/bold green]")
-    display_exploration_results(scored, limit=top)
+    _console().print(f"\n[bold green]{len(scored)} candidates above threshold {threshold}[/bold green]")
+    display_exploration_results(best, limit=top, total=len(scored))
 
     # Check models for top candidates
     if check_models:
-        candidates_to_check = scored[:top]
-        console.print(f"\n[bold]Checking models for top {len(candidates_to_check)} candidates...[/bold]")
+        candidates_to_check = best[:top]
+        _console().print(f"\n[bold]Checking models for top {len(candidates_to_check)} candidates...[/bold]")
 
         from src.solvers.router import SmartSolverRouter
         from src.solvers.parallel import parallel_compute_spectra
 
         solver = SmartSolverRouter()
         if not solver.is_available():
-            console.print("[red]Neither Mace4 nor Z3 available. Install z3-solver: pip install z3-solver[/red]")
+            _console().print("[red]Neither Mace4 nor Z3 available. Install z3-solver: pip install z3-solver[/red]")
             return
 
         # Build work items for parallel execution
@@ -159,27 +199,28 @@ def explore(
             for item in candidates_to_check
         ]
 
-        effective_workers = workers if workers is not None else None
-        if effective_workers and effective_workers > 1:
-            console.print(f"  [dim]Using {effective_workers} parallel workers[/dim]")
+        effective_workers = (
+            workers if workers is not None
+            else min(len(work_items), os.cpu_count() or 4)
+        )
+        if effective_workers > 1:
+            _console().print(f"  [dim]Using {effective_workers} parallel workers[/dim]")
 
         spectra = parallel_compute_spectra(work_items, max_workers=effective_workers)
 
+        # Collect every outcome first and render one table: per-candidate
+        # spectrum and score tables cost more to print than to compute
+        checked = []
         for item, spectrum in zip(candidates_to_check, spectra):
             sig = item["_sig"]
-            if not spectrum.is_empty():
-                console.print(f"\n  [cyan]{sig.name}[/cyan]: [green]Models found![/green] Spectrum: {spectrum.spectrum}")
-                display_spectrum(spectrum)
-
-                # Re-score with model information
-                score = scorer.score(sig, spectrum, known_fps)
-                display_score(sig.name, score)
-            else:
-                console.print(f"\n  [cyan]{sig.name}[/cyan]: [dim]No models found up to size {max_size}[/dim]")
+            # Re-score with model information
+            score = None if spectrum.is_empty() else scorer.score(sig, spectrum, known_fps)
+            checked.append((sig.name, spectrum, score))
+        display_model_check_results(checked, max_size)
 
     # Show details of top 3
-    console.print(f"\n[bold]Top 3 candidates:[/bold]")
-    for item in scored[:3]:
+    _console().print(f"\n[bold]Top 3 candidates:[/bold]")
+    for item in best[:3]:
         display_signature(item["_sig"])
         display_score(item["name"], item["_score"])
 
@@ -194,6 +235,10 @@ def explore(
 @click.option("--base", multiple=True, help="Base structures")
 @click.option("--exclude-moves", default="", help="Comma-separated moves to exclude (e.g. ABSTRACT,TRANSFER)")
 @click.option("--workers", default=None, type=int, help="Parallel workers for model checking (default: CPU count, max 8)")
+@click.option("--cache/--no-cache", default=True, help="Replay cached Claude responses and model spectra")
+@click.option("--reuse-plans", is_flag=True, help="Reuse stored plans when goal and library state recur")
+@click.option("--portfolio", is_flag=True, help="Race Mace4 and Z3 on each model size (needs Mace4)")
+@click.option("--backend", default="cli", type=click.Choice(["cli", "sdk", "batch"]), help="Claude Code CLI, the Anthropic SDK, or the SDK's Message Batches API (sdk/batch need ANTHROPIC_API_KEY)")
 @click.pass_context
 def agent(
     ctx: click.Context,
@@ -206,11 +251,17 @@ def agent(
     base: tuple[str, ...],
     exclude_moves: str,
     workers: int | None,
+    cache: bool,
+    reuse_plans: bool,
+    portfolio: bool,
+    backend: str,
 ) -> None:
     """Run the Claude CLI-driven research agent.
 
     Requires: claude CLI (npm install -g @anthropic-ai/claude-code)
     """
+    from rich.panel import Panel
+
     from src.agent.controller import AgentConfig, AgentController
     from src.library.manager import LibraryManager
     from src.utils.display import display_cycle_report
@@ -227,9 +278,14 @@ def agent(
         base_structures=list(base) if base else ["Group", "Ring", "Lattice", "Quasigroup"],
         exclude_moves=[m.strip() for m in exclude_moves.split(",") if m.strip()] if exclude_moves else [],
         workers=min(workers, 8) if workers is not None else min(os.cpu_count() or 4, 8),
+        cache_claude=cache,
+        cache_spectra=cache,
+        cache_plans=reuse_plans,
+        portfolio_solving=portfolio,
+        backend=backend,
     )
 
-    console.print(Panel(
+    _console().print(Panel(
         f"[bold]Mathematical Discovery Agent[/bold]\n\n"
         f"Model: {config.model}\n"
         f"Effort: {config.effort}\n"
@@ -251,9 +307,9 @@ def agent(
         for report in reports:
             display_cycle_report(report)
     except KeyboardInterrupt:
-        console.print("\n[yellow]Agent interrupted by user.[/yellow]")
+        _console().print("\n[yellow]Agent interrupted by user.[/yellow]")
     except Exception as e:
-        console.print(f"\n[red]Agent error: {e}[/red]")
+        _console().print(f"\n[red]Agent error: {e}[/red]")
         raise
 
 
@@ -264,7 +320,7 @@ def list_structures() -> None:
     from src.utils.display import display_signature
 
     structures = load_all_known()
-    console.print(f"\n[bold]{len(structures)} known structures:[/bold]\n")
+    _console().print(f"\n[bold]{len(structures)} known structures:[/bold]\n")
     for sig in structures:
         display_signature(sig)
 
@@ -272,7 +328,10 @@ def list_structures() -> None:
 @main.command()
 @click.option("--cycle", default="latest", help="Cycle number or 'latest'")
 @click.option("--top", default=20, help="Number of top discoveries to show")
-@click.option("--sort-by", default="score", help="Sort by: score, cycle, name")
+@click.option(
+    "--sort-by", default="score", type=click.Choice(["score", "cycle", "name"]),
+    help="Sort by: score, cycle, name",
+)
 @click.pass_context
 def report(ctx: click.Context, cycle: str, top: int, sort_by: str) -> None:
     """View discovery reports."""
@@ -282,12 +341,12 @@ def report(ctx: click.Context, cycle: str, top: int, sort_by: str) -> None:
 
     reports_dir = library.base_path / "reports"
     if not reports_dir.exists():
-        console.print("[yellow]No reports found yet. Run 'explore' or 'agent' first.[/yellow]")
+        _console().print("[yellow]No reports found yet. Run 'explore' or 'agent' first.[/yellow]")
         return
 
     report_files = sorted(reports_dir.glob("cycle_*_report.md"))
     if not report_files:
-        console.print("[yellow]No cycle reports found.[/yellow]")
+        _console().print("[yellow]No cycle reports found.[/yellow]")
         return
 
     if cycle == "latest":
@@ -298,17 +357,25 @@ def report(ctx: click.Context, cycle: str, top: int, sort_by: str) -> None:
     if target.exists():
         content = target.read_text()
         from rich.markdown import Markdown
-        console.print(Markdown(content))
+        _console().print(Markdown(content))
     else:
-        console.print(f"[red]Report not found: {target}[/red]")
+        _console().print(f"[red]Report not found: {target}[/red]")
 
     # Also show discovered structures
-    discovered = library.list_discovered()
-    if discovered:
-        discovered.sort(key=lambda x: x.get("score", 0), reverse=True)
-        console.print(f"\n[bold]Discovered Structures ({len(discovered)}):[/bold]")
-        for d in discovered[:top]:
-            console.print(f"  [{d['id']}] {d['name']} — score: {d.get('score', '?'):.3f}")
+    # Discoveries stream in id order, which is the order the cycles found
+    # them; only `top` of them are held at once, whichever key is used.
+    n_discovered = library.count_discovered()
+    if n_discovered:
+        _console().print(f"\n[bold]Discovered Structures ({n_discovered}):[/bold]")
+        discovered = library.iter_discovered()
+        if sort_by == "score":
+            shown = heapq.nlargest(top, discovered, key=lambda x: x.get("score", 0))
+        elif sort_by == "name":
+            shown = heapq.nsmallest(top, discovered, key=lambda x: x.get("name", ""))
+        else:
+            shown = list(islice(discovered, top))
+        for d in shown:
+            _console().print(f"  \\[{d['id']}] {d['name']} — score: {d.get('score', '?'):.3f}")
 
 
 @main.command()
@@ -335,18 +402,18 @@ def inspect(ctx: click.Context, name: str, max_size: int) -> None:
                 break
         if disc:
             sig = Signature.from_dict(disc["signature"])
-            console.print(f"[dim]Loaded from discovered: {disc.get('id')} ({disc.get('name')})[/dim]")
+            _console().print(f"[dim]Loaded from discovered: {disc.get('id')} ({disc.get('name')})[/dim]")
         else:
-            console.print(f"[red]Structure '{name}' not found.[/red]")
+            _console().print(f"[red]Structure '{name}' not found.[/red]")
             from src.library.known_structures import KNOWN_STRUCTURES
             known_names = ', '.join(KNOWN_STRUCTURES.keys())
             discovered = library.list_discovered()
             disc_names = ', '.join(
                 f"{d['id']}={d['name']}" for d in discovered[:10]
             )
-            console.print(f"Known: {known_names}")
+            _console().print(f"Known: {known_names}")
             if disc_names:
-                console.print(f"Discovered: {disc_names}")
+                _console().print(f"Discovered: {disc_names}")
             return
 
     display_signature(sig)
@@ -357,7 +424,7 @@ def inspect(ctx: click.Context, name: str, max_size: int) -> None:
     display_score(name, score)
 
     # Check models
-    console.print(f"\n[bold]Checking models up to size {max_size}...[/bold]")
+    _console().print(f"\n[bold]Checking models up to size {max_size}...[/bold]")
     solver = SmartSolverRouter()
 
     spectrum = solver.compute_spectrum(sig, min_size=2, max_size=max_size)
@@ -394,9 +461,6 @@ def backtest(ctx: click.Context, max_size: int, min_score: float, discovery_id:
     sys.exit(exit_code)
 
 
-# Need to import Panel for the agent command
-from rich.panel import Panel
-
 
 if __name__ == "__main__":
     main()
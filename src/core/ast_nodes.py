@@ -2,24 +2,36 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import sys
+import weakref
+from dataclasses import dataclass, field
+from functools import cached_property, lru_cache
 from typing import Sequence
 
 
 class Expr:
     """Base class for AST expressions."""
 
+    __slots__ = ()
+
     def size(self) -> int:
         raise NotImplementedError
 
     def variables(self) -> set[str]:
         raise NotImplementedError
 
+    def _variables(self) -> frozenset[str]:
+        """Variable names as a frozenset, shared rather than copied per call."""
+        raise NotImplementedError
+
     def substitute(self, mapping: dict[str, Expr]) -> Expr:
         raise NotImplementedError
 
 
-@dataclass(frozen=True)
+_NO_VARIABLES: frozenset[str] = frozenset()
+
+
+@dataclass(frozen=True, slots=True, weakref_slot=True)
 class Var(Expr):
     """A variable: x, y, z, ..."""
 
@@ -31,6 +43,9 @@ class Var(Expr):
     def variables(self) -> set[str]:
         return {self.name}
 
+    def _variables(self) -> frozenset[str]:
+        return frozenset((self.name,))
+
     def substitute(self, mapping: dict[str, Expr]) -> Expr:
         return mapping.get(self.name, self)
 
@@ -38,7 +53,7 @@ class Var(Expr):
         return self.name
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True, weakref_slot=True)
 class Const(Expr):
     """A constant symbol: e (identity), 0, 1, ..."""
 
@@ -50,6 +65,9 @@ class Const(Expr):
     def variables(self) -> set[str]:
         return set()
 
+    def _variables(self) -> frozenset[str]:
+        return _NO_VARIABLES
+
     def substitute(self, mapping: dict[str, Expr]) -> Expr:
         return self
 
@@ -57,28 +75,51 @@ class Const(Expr):
         return self.name
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True, weakref_slot=True)
 class App(Expr):
     """Application of an operation to arguments: mul(x, y), inv(x), ..."""
 
     op_name: str
     args: tuple[Expr, ...]
+    # Nodes are immutable, so size and variables are computed on first use
+    # and kept; children cache theirs too, so shared subtrees are walked once
+    _size: int = field(init=False, repr=False, compare=False)
+    _vars: frozenset[str] = field(init=False, repr=False, compare=False)
 
     def __init__(self, op_name: str, args: Sequence[Expr]):
-        object.__setattr__(self, "op_name", op_name)
+        # Operation names come from a small vocabulary; interning makes
+        # name comparisons and dictionary lookups start with an `is` check
+        object.__setattr__(self, "op_name", sys.intern(op_name))
         object.__setattr__(self, "args", tuple(args))
 
+    def __reduce__(self):
+        # Rebuild from the fields alone; the caches may not be filled yet
+        return App, (self.op_name, self.args)
+
     def size(self) -> int:
-        return 1 + sum(a.size() for a in self.args)
+        try:
+            return self._size
+        except AttributeError:
+            size = 1 + sum(a.size() for a in self.args)
+            object.__setattr__(self, "_size", size)
+            return size
 
     def variables(self) -> set[str]:
-        result: set[str] = set()
-        for a in self.args:
-            result |= a.variables()
-        return result
+        return set(self._variables())
+
+    def _variables(self) -> frozenset[str]:
+        try:
+            return self._vars
+        except AttributeError:
+            names = _NO_VARIABLES.union(*(a._variables() for a in self.args))
+            object.__setattr__(self, "_vars", names)
+            return names
 
     def substitute(self, mapping: dict[str, Expr]) -> Expr:
-        return App(self.op_name, [a.substitute(mapping) for a in self.args])
+        args = [a.substitute(mapping) for a in self.args]
+        if all(new is old for new, old in zip(args, self.args)):
+            return self
+        return mk_app(self.op_name, args)
 
     def __repr__(self) -> str:
         if len(self.args) == 2:
@@ -89,6 +130,46 @@ class App(Expr):
         return f"{self.op_name}({args_str})"
 
 
+# --- Shared node construction ---
+#
+# Parsed and substituted trees repeat the same leaves and subtrees many
+# times. These factories hand out one node per distinct expression while
+# any copy is alive, so equal subtrees are also identical and `==` stops
+# at the first shared child. Nodes are immutable, so sharing is safe.
+
+_shared_vars: weakref.WeakValueDictionary[str, Var] = weakref.WeakValueDictionary()
+_shared_consts: weakref.WeakValueDictionary[str, Const] = weakref.WeakValueDictionary()
+# Keyed on child identities: an App keeps its children alive, so their ids
+# cannot be reused while the entry exists
+_shared_apps: weakref.WeakValueDictionary[tuple, App] = weakref.WeakValueDictionary()
+
+
+def mk_var(name: str) -> Var:
+    """Return the shared Var for `name`."""
+    node = _shared_vars.get(name)
+    if node is None:
+        node = _shared_vars[name] = Var(sys.intern(name))
+    return node
+
+
+def mk_const(name: str) -> Const:
+    """Return the shared Const for `name`."""
+    node = _shared_consts.get(name)
+    if node is None:
+        node = _shared_consts[name] = Const(sys.intern(name))
+    return node
+
+
+def mk_app(op_name: str, args: Sequence[Expr]) -> App:
+    """Return the shared App of `op_name` over exactly these child nodes."""
+    args = tuple(args)
+    key = (op_name, *map(id, args))
+    node = _shared_apps.get(key)
+    if node is None:
+        node = _shared_apps[key] = App(op_name, args)
+    return node
+
+
 @dataclass(frozen=True)
 class Equation:
     """An equation: lhs = rhs."""
@@ -97,7 +178,11 @@ class Equation:
     rhs: Expr
 
     def variables(self) -> set[str]:
-        return self.lhs.variables() | self.rhs.variables()
+        return set(self._vars)
+
+    @cached_property
+    def _vars(self) -> frozenset[str]:
+        return self.lhs._variables() | self.rhs._variables()
 
     def size(self) -> int:
         return self.lhs.size() + self.rhs.size()
@@ -110,27 +195,29 @@ class Equation:
 
 import re
 
-_IDENT_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+# Identifiers and punctuation. Anything else is skipped by findall, which
+# _tokenize detects because the tokens then fall short of the text's length.
+_TOKEN_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*|[(),]")
+# Also matches whitespace, and captures any stray character to report it
+_SCAN_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*|[(),]|[ \t\n]|(.)", re.DOTALL)
+_NO_CONSTANTS: frozenset[str] = frozenset()
+
+# Markers for the two kinds of partially parsed node on the parser's stack
+_BINARY = "binary"
+_APPLY = "apply"
 
 
 def _tokenize(text: str) -> list[str]:
     """Tokenize an expression string into parentheses, commas, and identifiers."""
-    tokens: list[str] = []
-    i = 0
-    while i < len(text):
-        ch = text[i]
-        if ch in " \t\n":
-            i += 1
-        elif ch in "(),":
-            tokens.append(ch)
-            i += 1
-        else:
-            m = _IDENT_RE.match(text, i)
-            if m:
-                tokens.append(m.group())
-                i = m.end()
-            else:
-                raise ValueError(f"Unexpected character {ch!r} at position {i} in {text!r}")
+    tokens = _TOKEN_RE.findall(text)
+    # repr() output separates tokens with single spaces only, so this
+    # comparison settles almost every call without looking at characters
+    if sum(map(len, tokens)) + text.count(" ") != len(text):
+        for m in _SCAN_RE.finditer(text):
+            if m.group(1) is not None:
+                raise ValueError(
+                    f"Unexpected character {m.group(1)!r} at position {m.start()} in {text!r}"
+                )
     return tokens
 
 
@@ -144,66 +231,90 @@ def parse_expr(text: str, constants: set[str] | None = None, op_names: set[str]
         expr_list := expr (',' expr)*
 
     Disambiguation: a bare IDENT is Const if in `constants`, else Var.
+    Results are cached (see _parse_expr_cached); `op_names` does not affect
+    the parse and is not part of the cache key.
     """
-    constants = constants or set()
-    op_names = op_names or set()
+    return _parse_expr_cached(text, frozenset(constants) if constants else _NO_CONSTANTS)
+
+
+# Parsing is pure and trees are immutable, so every load of the same axiom
+# text (discoveries are re-read several times per cycle) can share one result
+@lru_cache(maxsize=8192)
+def _parse_expr_cached(text: str, constants: frozenset[str]) -> Expr:
     tokens = _tokenize(text)
-    expr, pos = _parse_expr(tokens, 0, constants, op_names)
+    expr, pos = _parse_tokens(tokens, constants)
     if pos != len(tokens):
         raise ValueError(f"Unexpected tokens after position {pos}: {tokens[pos:]}")
     return expr
 
 
-def _parse_expr(
-    tokens: list[str], pos: int, constants: set[str], op_names: set[str]
-) -> tuple[Expr, int]:
-    """Recursive descent parser for expressions. Returns (expr, next_pos)."""
-    if pos >= len(tokens):
-        raise ValueError("Unexpected end of expression")
-
-    tok = tokens[pos]
-
-    # Parenthesized binary application: (expr OP expr)
-    if tok == "(":
-        pos += 1  # consume '('
-        left, pos = _parse_expr(tokens, pos, constants, op_names)
-        if pos >= len(tokens):
-            raise ValueError("Unexpected end inside parenthesized expression")
-        op_name = tokens[pos]
-        pos += 1  # consume op name
-        right, pos = _parse_expr(tokens, pos, constants, op_names)
-        if pos >= len(tokens) or tokens[pos] != ")":
-            raise ValueError(f"Expected ')' at position {pos}")
-        pos += 1  # consume ')'
-        return App(op_name, [left, right]), pos
-
-    # Identifier — could be: IDENT(...) application, or bare var/const
-    if _IDENT_RE.fullmatch(tok):
-        name = tok
-        pos += 1
+def _parse_tokens(tokens: list[str], constants: set[str]) -> tuple[Expr, int]:
+    """Parse one expression from the start of `tokens`. Returns (expr, next_pos).
 
-        # Check for function application: IDENT '(' ...
-        if pos < len(tokens) and tokens[pos] == "(":
-            pos += 1  # consume '('
-            args: list[Expr] = []
-            if pos < len(tokens) and tokens[pos] != ")":
-                arg, pos = _parse_expr(tokens, pos, constants, op_names)
-                args.append(arg)
-                while pos < len(tokens) and tokens[pos] == ",":
-                    pos += 1  # consume ','
-                    arg, pos = _parse_expr(tokens, pos, constants, op_names)
-                    args.append(arg)
-            if pos >= len(tokens) or tokens[pos] != ")":
+    Iterative: each open '(' or 'IDENT(' pushes a frame, [_BINARY, left, op]
+    or [_APPLY, name, args], and every finished expression is handed to the
+    innermost frame, which either waits for more operands or closes into an
+    App and passes that outwards in turn.
+    """
+    stack: list[list] = []
+    pos = 0
+    n = len(tokens)
+    while True:
+        # Read a leaf, or open a frame and go read its first operand
+        if pos >= n:
+            raise ValueError("Unexpected end of expression")
+        tok = tokens[pos]
+        pos += 1
+        if tok == "(":
+            stack.append([_BINARY, None, None])
+            continue
+        if tok == ")" or tok == ",":  # anything else the tokenizer emits is an identifier
+            raise ValueError(f"Unexpected token {tok!r} at position {pos - 1}")
+        if pos < n and tokens[pos] == "(":
+            pos += 1
+            if pos >= n:
                 raise ValueError(f"Expected ')' at position {pos}")
-            pos += 1  # consume ')'
-            return App(name, args), pos
-
-        # Bare identifier: constant or variable
-        if name in constants:
-            return Const(name), pos
-        return Var(name), pos
-
-    raise ValueError(f"Unexpected token {tok!r} at position {pos}")
+            if tokens[pos] != ")":
+                stack.append([_APPLY, tok, []])
+                continue
+            pos += 1
+            expr: Expr = mk_app(tok, ())
+        elif tok in constants:
+            expr = mk_const(tok)
+        else:
+            expr = mk_var(tok)
+
+        # Hand the expression to enclosing frames, closing those it completes
+        while stack:
+            frame = stack[-1]
+            if frame[0] is _BINARY:
+                if frame[1] is None:
+                    if pos >= n:
+                        raise ValueError("Unexpected end inside parenthesized expression")
+                    op = tokens[pos]
+                    if op == "(" or op == ")" or op == ",":
+                        raise ValueError(f"Expected operation name at position {pos}")
+                    frame[1] = expr
+                    frame[2] = op
+                    pos += 1
+                    break  # go read the right operand
+                if pos >= n or tokens[pos] != ")":
+                    raise ValueError(f"Expected ')' at position {pos}")
+                pos += 1
+                stack.pop()
+                expr = mk_app(frame[2], (frame[1], expr))
+            else:
+                frame[2].append(expr)
+                if pos < n and tokens[pos] == ",":
+                    pos += 1
+                    break  # go read the next argument
+                if pos >= n or tokens[pos] != ")":
+                    raise ValueError(f"Expected ')' at position {pos}")
+                pos += 1
+                stack.pop()
+                expr = mk_app(frame[1], frame[2])
+        else:
+            return expr, pos
 
 
 def parse_equation(
@@ -211,11 +322,17 @@ def parse_equation(
 ) -> Equation:
     """Parse an equation string 'lhs = rhs' back into an Equation.
 
-    The separator is ' = ' (space-equals-space).
+    The separator is ' = ' (space-equals-space). Results are cached like
+    parse_expr's.
     """
+    return _parse_equation_cached(text, frozenset(constants) if constants else _NO_CONSTANTS)
+
+
+@lru_cache(maxsize=8192)
+def _parse_equation_cached(text: str, constants: frozenset[str]) -> Equation:
     parts = text.split(" = ", 1)
     if len(parts) != 2:
         raise ValueError(f"Expected 'lhs = rhs' format, got: {text!r}")
-    lhs = parse_expr(parts[0], constants, op_names)
-    rhs = parse_expr(parts[1], constants, op_names)
+    lhs = _parse_expr_cached(parts[0], constants)
+    rhs = _parse_expr_cached(parts[1], constants)
     return Equation(lhs, rhs)
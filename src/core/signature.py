@@ -7,9 +7,10 @@ A signature defines an algebraic structure: sorts (types), operations
 from __future__ import annotations
 
 import hashlib
-import json
+import sys
 from dataclasses import dataclass, field
 from enum import Enum
+from functools import lru_cache
 from typing import Any
 
 from src.core.ast_nodes import App, Const, Equation, Expr, Var, parse_equation
@@ -121,16 +122,24 @@ class Signature:
         Two signatures with the same fingerprint are structurally isomorphic
         (same sorts, arities, axiom kinds, up to renaming).
         """
-        sort_count = len(self.sorts)
-        op_arities = sorted(op.arity for op in self.operations)
-        axiom_kinds = sorted(a.kind.value for a in self.axioms)
-        canon = {
-            "sorts": sort_count,
-            "op_arities": op_arities,
-            "axiom_kinds": axiom_kinds,
-        }
-        blob = json.dumps(canon, sort_keys=True).encode()
-        return hashlib.sha256(blob).hexdigest()[:16]
+        return _fingerprint(
+            len(self.sorts),
+            tuple(sorted(op.arity for op in self.operations)),
+            tuple(sorted(a.kind.value for a in self.axioms)),
+        )
+
+    def structure_key(self) -> tuple:
+        """Hashable identity of the sorts, operations and axioms.
+
+        Unlike fingerprint(), which records only the shape, this tells apart
+        signatures whose axioms say different things. Names of the signature
+        itself, descriptions and the derivation chain are left out.
+        """
+        return (
+            tuple(s.name for s in self.sorts),
+            tuple((op.name, op.domain, op.codomain) for op in self.operations),
+            tuple((a.kind, a.equation, a.operations) for a in self.axioms),
+        )
 
     def to_dict(self) -> dict[str, Any]:
         return {
@@ -178,7 +187,7 @@ class Signature:
         ]
 
         # Identify constants (0-arity ops) and all op names for the parser
-        constants = {op.name for op in operations if op.arity == 0}
+        constants = frozenset(op.name for op in operations if op.arity == 0)
         op_names = {op.name for op in operations}
 
         axioms = []
@@ -204,6 +213,26 @@ class Signature:
         return f"Sig({self.name}: sorts=[{sorts}], ops=[{ops}], axioms={len(self.axioms)})"
 
 
+@lru_cache(maxsize=4096)
+def _fingerprint(sort_count: int, op_arities: tuple[int, ...], axiom_kinds: tuple[str, ...]) -> str:
+    """Hash a signature's canonical shape.
+
+    Explored signatures share a few hundred shapes, so results are memoized,
+    and interned so that set lookups against library fingerprints (see
+    LibraryManager.all_fingerprints_frozen) compare by identity.
+
+    Fingerprints are stored in discovery files, so the hashed bytes must stay
+    exactly `json.dumps(..., sort_keys=True)` of the shape; they are built by
+    hand because axiom kinds are plain identifiers that need no escaping.
+    """
+    blob = '{"axiom_kinds": [%s], "op_arities": [%s], "sorts": %d}' % (
+        ", ".join(f'"{k}"' for k in axiom_kinds),
+        ", ".join(map(str, op_arities)),
+        sort_count,
+    )
+    return sys.intern(hashlib.sha256(blob.encode()).hexdigest()[:16])
+
+
 # --- Builders for common axiom equations ---
 
 def make_assoc_equation(op_name: str) -> Equation:
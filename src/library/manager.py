@@ -4,11 +4,20 @@ from __future__ import annotations
 
 import json
 import re
+import sys
+from itertools import islice
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any, Iterator
 
 from src.core.signature import Signature
-from src.scoring.engine import ScoreBreakdown
+
+if TYPE_CHECKING:
+    from src.scoring.engine import ScoreBreakdown
+
+
+# Discovery file names look like disc_0012_<name>.json
+_DISC_ID_RE = re.compile(r"disc_(\d+)")
+_DISC_PREFIX_RE = re.compile(r"^disc_\d+_")
 
 
 class LibraryManager:
@@ -24,11 +33,33 @@ class LibraryManager:
         (self.base_path / "reports").mkdir(exist_ok=True)
 
         self._known_cache: dict[str, dict] | None = None
+        self._known_fps: list[str] | None = None
+        self._known_fps_frozen: frozenset[str] | None = None
+        # Known + discovered fingerprints; reset whenever discovered/ changes
+        self._fps_cache: frozenset[str] | None = None
+        # (discovered/ mtime, search rows); see _discovery_index
+        self._search_index: tuple[int, list[tuple[str, str, dict[str, Any]]]] | None = None
 
     def known_fingerprints(self) -> list[str]:
-        """Get fingerprints of all known structures."""
-        from src.library.known_structures import load_all_known
-        return [sig.fingerprint() for sig in load_all_known()]
+        """Get fingerprints of all known structures.
+
+        Known structures are built in code, so their fingerprints are
+        computed once per manager; callers get a fresh copy each time.
+        """
+        if self._known_fps is None:
+            from src.library.known_structures import load_all_known
+            self._known_fps = [sig.fingerprint() for sig in load_all_known()]
+        return list(self._known_fps)
+
+    def known_fingerprints_frozen(self) -> frozenset[str]:
+        """Fingerprints of all known structures, as one shared frozenset.
+
+        The strings come from Signature.fingerprint(), so they are already
+        interned; pass the set itself to ScoringEngine rather than a copy.
+        """
+        if self._known_fps_frozen is None:
+            self._known_fps_frozen = frozenset(self.known_fingerprints())
+        return self._known_fps_frozen
 
     def all_fingerprints(self) -> list[str]:
         """Get fingerprints of all known AND discovered structures."""
@@ -39,22 +70,52 @@ class LibraryManager:
                 fps.append(fp)
         return fps
 
-    def list_known(self) -> list[str]:
-        """List names of all known structures."""
+    def all_fingerprints_frozen(self) -> frozenset[str]:
+        """Fingerprints of all known and discovered structures, as a frozenset.
+
+        Cached until this manager adds or archives a discovery, so repeated
+        novelty checks don't re-read every discovery file.
+        """
+        if self._fps_cache is None:
+            # Interned like Signature.fingerprint()'s results, so membership
+            # tests end in an identity check rather than a string compare
+            self._fps_cache = frozenset(map(sys.intern, self.all_fingerprints()))
+        return self._fps_cache
+
+    def list_known(self, limit: int | None = None) -> list[str]:
+        """List names of known structures (the first ``limit``, if given)."""
+        from src.library.known_structures import KNOWN_STRUCTURES
+        return list(islice(KNOWN_STRUCTURES, limit))
+
+    def count_known(self) -> int:
+        """Number of known structures."""
         from src.library.known_structures import KNOWN_STRUCTURES
-        return list(KNOWN_STRUCTURES.keys())
+        return len(KNOWN_STRUCTURES)
+
+    def list_discovered(self, limit: int | None = None) -> list[dict[str, Any]]:
+        """List discovered structures with metadata.
+
+        With ``limit``, stops after that many files have been read, so
+        callers that only show the first few never parse the whole library.
+        """
+        return list(islice(self.iter_discovered(), limit))
+
+    def iter_discovered(self) -> Iterator[dict[str, Any]]:
+        """Yield discovered structures in id order, reading one file at a time.
 
-    def list_discovered(self) -> list[dict[str, Any]]:
-        """List all discovered structures with metadata."""
+        Lets callers select a top few with heapq without holding the whole
+        library in memory.
+        """
         discovered_dir = self.base_path / "discovered"
-        results = []
         for f in sorted(discovered_dir.glob("*.json")):
             try:
-                data = json.loads(f.read_text())
-                results.append(data)
+                yield json.loads(f.read_text())
             except (json.JSONDecodeError, OSError):
                 continue
-        return results
+
+    def count_discovered(self) -> int:
+        """Number of discovery files, without parsing them."""
+        return sum(1 for _ in (self.base_path / "discovered").glob("*.json"))
 
     def add_discovery(
         self,
@@ -84,13 +145,13 @@ class LibraryManager:
         # Parse max ID from existing filenames (not count)
         max_id = 0
         for f in discovered_dir.glob("disc_*.json"):
-            m = re.match(r"disc_(\d+)", f.stem)
+            m = _DISC_ID_RE.match(f.stem)
             if m:
                 max_id = max(max_id, int(m.group(1)))
         next_id = max_id + 1
 
         # Strip any existing disc_NNNN_ prefix from the name
-        clean_name = re.sub(r"^disc_\d+_", "", name)
+        clean_name = _DISC_PREFIX_RE.sub("", name)
 
         filename = f"disc_{next_id:04d}_{_safe_name(clean_name)}.json"
         path = discovered_dir / filename
@@ -107,6 +168,8 @@ class LibraryManager:
         }
 
         path.write_text(json.dumps(data, indent=2))
+        self._fps_cache = None
+        self._search_index = None
         return path
 
     def add_conjecture(
@@ -152,23 +215,36 @@ class LibraryManager:
                 results.append({"name": name, "type": "known", "description": ""})
 
         # Search discovered
-        for disc in self.list_discovered():
-            name = disc.get("name", "")
-            notes = disc.get("notes", "")
-            score = disc.get("score", 0)
-
-            if min_score and score < min_score:
+        for name_lower, notes_lower, entry in self._discovery_index():
+            if min_score and entry["score"] < min_score:
                 continue
+            if query_lower in name_lower or query_lower in notes_lower:
+                results.append(dict(entry))
 
-            if query_lower in name.lower() or query_lower in notes.lower():
-                results.append({
+        return results
+
+    def _discovery_index(self) -> list[tuple[str, str, dict[str, Any]]]:
+        """Lower-cased name, notes and search result for every discovery.
+
+        Built once and reused until discovered/ changes (its mtime moves
+        whenever a file is added or removed, including by another process),
+        so searches don't re-parse every discovery file.
+        """
+        discovered_dir = self.base_path / "discovered"
+        mtime = discovered_dir.stat().st_mtime_ns
+        if self._search_index is None or self._search_index[0] != mtime:
+            rows = []
+            for disc in self.list_discovered():
+                name = disc.get("name", "")
+                notes = disc.get("notes", "")
+                rows.append((name.lower(), notes.lower(), {
                     "name": name,
                     "type": "discovered",
-                    "score": score,
+                    "score": disc.get("score", 0),
                     "description": notes,
-                })
-
-        return results
+                }))
+            self._search_index = (mtime, rows)
+        return self._search_index[1]
 
     def get_discovery(self, discovery_id: str) -> dict[str, Any] | None:
         """Get a specific discovery by ID."""
@@ -201,6 +277,8 @@ class LibraryManager:
             dest = failed_dir / f.name
             dest.write_text(json.dumps(data, indent=2))
             f.unlink()
+            self._fps_cache = None
+            self._search_index = None
             return dest
 
         return None
@@ -10,12 +10,17 @@ from __future__ import annotations
 
 import math
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, Sequence
+
+import numpy as np
 
 from src.core.signature import AxiomKind, Signature
 from src.models.cayley import CayleyTable
 from src.solvers.mace4 import ModelSpectrum
 
+# Number of axiom kinds, for normalizing tension
+_N_AXIOM_KINDS = len(AxiomKind)
+
 
 @dataclass
 class ScoreBreakdown:
@@ -78,7 +83,12 @@ DEFAULT_WEIGHTS = {
 
 
 class ScoringEngine:
-    """Score candidate signatures for mathematical interestingness."""
+    """Score candidate signatures for mathematical interestingness.
+
+    `known_fingerprints` arguments are only ever tested for membership,
+    never copied or modified, so one frozenset (e.g. from
+    LibraryManager.all_fingerprints_frozen) can be shared by every call.
+    """
 
     def __init__(self, weights: dict[str, float] | None = None):
         self.weights = weights or DEFAULT_WEIGHTS
@@ -87,9 +97,107 @@ class ScoringEngine:
         self,
         sig: Signature,
         spectrum: ModelSpectrum | None = None,
-        known_fingerprints: set[str] | None = None,
+        known_fingerprints: set[str] | frozenset[str] | None = None,
+        exclude_fingerprint: str | None = None,
+    ) -> ScoreBreakdown:
+        """Compute the full interestingness score for a candidate.
+
+        `exclude_fingerprint` is treated as absent from `known_fingerprints`,
+        so callers can share one read-only set instead of copying it to
+        drop a single entry.
+        """
+        breakdown = self._breakdown(sig, spectrum, known_fingerprints, exclude_fingerprint)
+
+        # Weighted total
+        breakdown.total = sum(
+            self.weights.get(field, 0) * getattr(breakdown, field)
+            for field in self.weights
+        )
+
+        return breakdown
+
+    def upper_bound(
+        self,
+        sig: Signature,
+        spectrum: ModelSpectrum | None = None,
+        known_fingerprints: set[str] | frozenset[str] | None = None,
+    ) -> float:
+        """A ceiling on `score(sig, spectrum, known_fingerprints).total`.
+
+        Uses only the dimensions that are plain counts (richness, tension,
+        economy, fertility, and single-sorted connectivity) and assumes the
+        best value for the rest, skipping the fingerprint, synergy and
+        derivation-chain work. Callers can drop a candidate whose bound is
+        below their threshold without scoring it.
+        """
+        exact = {
+            "richness": self._richness(sig),
+            "tension": self._tension(sig),
+            "economy": self._economy(sig),
+            "fertility": self._fertility(sig),
+        }
+        if len(sig.sorts) <= 1:
+            exact["connectivity"] = 0.5
+        # Dimensions that are 0 here, or may reach 1 if we computed them
+        may_reach_one = {
+            "connectivity": len(sig.sorts) > 1,
+            "axiom_synergy": bool(sig.get_ops_by_arity(2)),
+            "is_novel": known_fingerprints is not None,
+            "distance": bool(sig.derivation_chain),
+            "has_models": bool(spectrum),
+            "model_diversity": bool(spectrum),
+            "spectrum_pattern": bool(spectrum),
+            "solver_difficulty": bool(spectrum),
+        }
+        bound = sum(self.weights.get(f, 0) * v for f, v in exact.items())
+        bound += sum(
+            max(self.weights.get(f, 0), 0.0)
+            for f, possible in may_reach_one.items()
+            if possible and f not in exact
+        )
+        # Slack for summation-order rounding against score()'s total
+        return bound + 1e-9
+
+    def score_many(
+        self,
+        sigs: Sequence[Signature],
+        spectra: Sequence[ModelSpectrum | None] | None = None,
+        known_fingerprints: set[str] | frozenset[str] | None = None,
+        exclude_fingerprints: Sequence[str | None] | None = None,
+    ) -> list[ScoreBreakdown]:
+        """Score a batch of candidates; equivalent to score() on each.
+
+        `spectra` and `exclude_fingerprints`, when given, are parallel to
+        `sigs`. Weighted totals are computed in a single matrix-vector
+        product over all breakdowns.
+        """
+        n = len(sigs)
+        spectra = spectra if spectra is not None else [None] * n
+        excludes = exclude_fingerprints if exclude_fingerprints is not None else [None] * n
+
+        breakdowns = [
+            self._breakdown(sig, spectrum, known_fingerprints, exclude)
+            for sig, spectrum, exclude in zip(sigs, spectra, excludes)
+        ]
+        if not breakdowns:
+            return breakdowns
+
+        fields = list(self.weights)
+        weights = np.array([self.weights[f] for f in fields])
+        dims = np.array([[getattr(bd, f) for f in fields] for bd in breakdowns])
+        for bd, total in zip(breakdowns, dims @ weights):
+            bd.total = float(total)
+
+        return breakdowns
+
+    def _breakdown(
+        self,
+        sig: Signature,
+        spectrum: ModelSpectrum | None,
+        known_fingerprints: set[str] | frozenset[str] | None,
+        exclude_fingerprint: str | None,
     ) -> ScoreBreakdown:
-        """Compute the full interestingness score for a candidate."""
+        """Compute every dimension of the score except the weighted total."""
         breakdown = ScoreBreakdown()
 
         # Structural scores
@@ -118,16 +226,11 @@ class ScoringEngine:
         # Novelty scores
         if known_fingerprints is not None:
             fp = sig.fingerprint()
-            breakdown.is_novel = 0.0 if fp in known_fingerprints else 1.0
+            known = fp in known_fingerprints and fp != exclude_fingerprint
+            breakdown.is_novel = 0.0 if known else 1.0
 
         breakdown.distance = self._distance_from_known(sig)
 
-        # Weighted total
-        breakdown.total = sum(
-            self.weights.get(field, 0) * getattr(breakdown, field)
-            for field in self.weights
-        )
-
         return breakdown
 
     def _connectivity(self, sig: Signature) -> float:
@@ -181,8 +284,7 @@ class ScoringEngine:
             return 0.0
 
         kinds = set(a.kind for a in sig.axioms)
-        all_kinds = set(AxiomKind)
-        diversity = len(kinds) / min(len(all_kinds), 6)  # cap at 6 for normalization
+        diversity = len(kinds) / min(_N_AXIOM_KINDS, 6)  # cap at 6 for normalization
         return min(diversity, 1.0)
 
     def _economy(self, sig: Signature) -> float:
@@ -1,11 +1,33 @@
-from src.solvers.mace4 import Mace4Solver
-from src.solvers.z3_solver import Z3ModelFinder
-from src.solvers.prover9 import Prover9Solver
-from src.solvers.fol_translator import FOLTranslator
-from src.solvers.router import SmartSolverRouter
-from src.solvers.parallel import parallel_compute_spectra
-
-__all__ = [
-    "Mace4Solver", "Z3ModelFinder", "Prover9Solver",
-    "FOLTranslator", "SmartSolverRouter", "parallel_compute_spectra",
-]
+"""Solver integrations.
+
+Submodules are imported on first attribute access, so importing one of them
+(e.g. ``src.solvers.mace4`` for ModelSpectrum) does not pull in z3 and the
+rest of the package.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import Any
+
+_EXPORTS = {
+    "Mace4Solver": "src.solvers.mace4",
+    "Z3ModelFinder": "src.solvers.z3_solver",
+    "Prover9Solver": "src.solvers.prover9",
+    "FOLTranslator": "src.solvers.fol_translator",
+    "SmartSolverRouter": "src.solvers.router",
+    "SpectrumCache": "src.solvers.cache",
+    "parallel_compute_spectra": "src.solvers.parallel",
+    "iter_compute_spectra": "src.solvers.parallel",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
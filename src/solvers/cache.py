@@ -0,0 +1,90 @@
+"""Disk cache of model spectra, shared across sessions.
+
+Entries are keyed on the problem handed to the solvers — operations and
+axiom equations, the size range, the per-size model limit, and which
+solvers would run — never on the signature's name or fingerprint (the
+fingerprint only records axiom kinds, so unrelated CUSTOM axioms collide).
+
+Only complete spectra are stored: a size that timed out may well finish
+next time, so those results are always recomputed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from src.core.signature import Signature
+from src.models.cayley import CayleyTable
+from src.solvers.mace4 import ModelSpectrum
+
+
+def problem_key(
+    sig: Signature, min_size: int, max_size: int, max_models: int, solver_tag: str = "",
+) -> str:
+    """Digest of the spectrum problem `sig` poses; equal keys, equal spectra."""
+    problem = {
+        "sorts": len(sig.sorts),
+        "ops": [[op.name, list(op.domain), op.codomain] for op in sig.operations],
+        "axioms": [[a.kind.value, repr(a.equation)] for a in sig.axioms],
+        "sizes": [min_size, max_size],
+        "max_models": max_models,
+        "solver": solver_tag,
+    }
+    blob = json.dumps(problem, sort_keys=True).encode()
+    return hashlib.blake2b(blob, digest_size=16).hexdigest()
+
+
+class SpectrumCache:
+    """Stores ModelSpectrum results as JSON files under `path`."""
+
+    def __init__(self, path: Path | str, solver_tag: str = ""):
+        self.path = Path(path)
+        self.solver_tag = solver_tag
+
+    def key(self, sig: Signature, min_size: int, max_size: int, max_models: int) -> str:
+        return problem_key(sig, min_size, max_size, max_models, self.solver_tag)
+
+    def get(
+        self, sig: Signature, min_size: int, max_size: int, max_models: int,
+    ) -> ModelSpectrum | None:
+        """Return the cached spectrum, renamed to `sig.name`, or None."""
+        path = self.path / f"{self.key(sig, min_size, max_size, max_models)}.json"
+        try:
+            data = json.loads(path.read_bytes())
+        except (OSError, ValueError):
+            return None
+        return ModelSpectrum(
+            signature_name=sig.name,
+            spectrum={int(k): v for k, v in data["spectrum"].items()},
+            models_by_size={
+                int(k): [CayleyTable.from_dict(m) for m in models]
+                for k, models in data["models_by_size"].items()
+            },
+        )
+
+    def put(
+        self,
+        sig: Signature,
+        min_size: int,
+        max_size: int,
+        max_models: int,
+        spectrum: ModelSpectrum,
+    ) -> None:
+        """Store `spectrum` unless some size timed out."""
+        if spectrum.timed_out_sizes:
+            return
+        data = {
+            "spectrum": spectrum.spectrum,
+            "models_by_size": {
+                size: [m.to_dict() for m in models]
+                for size, models in spectrum.models_by_size.items()
+            },
+        }
+        self.path.mkdir(parents=True, exist_ok=True)
+        path = self.path / f"{self.key(sig, min_size, max_size, max_models)}.json"
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(data))
+        os.replace(tmp, path)
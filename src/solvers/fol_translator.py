@@ -21,15 +21,25 @@ class FOLTranslator:
         We translate to a single-sorted theory over a domain of `domain_size` elements.
         Multi-sorted signatures are collapsed to a single sort for finite model finding.
         """
-        lines = [
-            f"% Signature: {sig.name}",
-            f"% Domain size: {domain_size}",
-            "",
-            f"assign(domain_size, {domain_size}).",
-            "",
-            "formulas(assumptions).",
-            "",
-        ]
+        return self.mace4_header(sig, domain_size) + self.mace4_assumptions(sig)
+
+    def mace4_header(self, sig: Signature, domain_size: int) -> str:
+        """The size-dependent head of a Mace4 input, up to the assumptions."""
+        return (
+            f"% Signature: {sig.name}\n"
+            f"% Domain size: {domain_size}\n"
+            "\n"
+            f"assign(domain_size, {domain_size}).\n"
+            "\n"
+        )
+
+    def mace4_assumptions(self, sig: Signature) -> str:
+        """The size-independent assumptions block of a Mace4 input.
+
+        Translate it once and pair it with `mace4_header` per domain size
+        when searching several sizes of the same signature.
+        """
+        lines = ["formulas(assumptions).", ""]
 
         for axiom in sig.axioms:
             fol = self._equation_to_mace4(axiom.equation)
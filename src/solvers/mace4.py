@@ -10,12 +10,14 @@ Or: apt-get install prover9 (on Debian/Ubuntu)
 
 from __future__ import annotations
 
-import os
 import re
 import subprocess
-import tempfile
+import threading
+import time
 from dataclasses import dataclass, field
+from itertools import islice
 from pathlib import Path
+from typing import Iterator
 
 import numpy as np
 
@@ -36,11 +38,16 @@ class Mace4Result:
     timed_out: bool = False
 
 
+# Full Cayley tables a spectrum keeps per size; the rest are only counted
+EXAMPLE_MODELS_PER_SIZE = 2
+
+
 @dataclass
 class ModelSpectrum:
     """The spectrum of model sizes for a signature.
 
-    Maps domain size → number of non-isomorphic models found.
+    Maps domain size → number of non-isomorphic models found. Only the
+    first few models of each size are kept as tables (see `add_result`).
     """
 
     signature_name: str
@@ -48,6 +55,22 @@ class ModelSpectrum:
     models_by_size: dict[int, list[CayleyTable]] = field(default_factory=dict)
     timed_out_sizes: list[int] = field(default_factory=list)
 
+    def add_result(
+        self, result: Mace4Result, keep_models: int = EXAMPLE_MODELS_PER_SIZE,
+    ) -> None:
+        """Record one size's search: its model count and first `keep_models` tables."""
+        size = result.domain_size
+        self.spectrum[size] = len(result.models_found)
+        self.models_by_size[size] = result.models_found[:keep_models]
+        if result.timed_out:
+            self.timed_out_sizes.append(size)
+
+    def iter_models(
+        self, size: int, limit: int = EXAMPLE_MODELS_PER_SIZE,
+    ) -> Iterator[CayleyTable]:
+        """Yield up to `limit` kept models of the given size."""
+        return islice(self.models_by_size.get(size, ()), limit)
+
     def sizes_with_models(self) -> list[int]:
         return sorted(k for k, v in self.spectrum.items() if v > 0)
 
@@ -78,7 +101,7 @@ class Mace4Solver:
         try:
             result = subprocess.run(
                 [self.mace4_path, "--version"],
-                capture_output=True, text=True, timeout=5,
+                capture_output=True, timeout=5,
             )
             return result.returncode in (0, 1)  # mace4 may return 1 for --version
         except (FileNotFoundError, subprocess.TimeoutExpired, PermissionError, OSError):
@@ -89,35 +112,53 @@ class Mace4Solver:
         sig: Signature,
         domain_size: int,
         max_models: int = 10,
+        cancel: threading.Event | None = None,
+        assumptions: str | None = None,
     ) -> Mace4Result:
-        """Search for finite models of the given signature at a specific domain size."""
-        input_text = self.translator.to_mace4(sig, domain_size)
+        """Search for finite models of the given signature at a specific domain size.
 
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".in", delete=False) as f:
-            f.write(input_text)
-            input_path = f.name
+        If `cancel` is given and gets set while Mace4 runs, the process is
+        killed and an empty, timed-out result is returned. `assumptions` is
+        the signature's translated axiom block (see
+        `FOLTranslator.mace4_assumptions`), for callers searching many sizes.
+        """
+        if assumptions is None:
+            assumptions = self.translator.mace4_assumptions(sig)
+        input_text = self.translator.mace4_header(sig, domain_size) + assumptions
 
         try:
             cmd = [self.mace4_path, "-n", str(domain_size), "-N", str(domain_size)]
             if max_models > 1:
                 cmd.extend(["-m", str(max_models)])
 
-            result = subprocess.run(
+            # Bytes in and out: LADR output is ASCII, so an explicit decode
+            # is cheaper than the locale-dependent text mode
+            proc = subprocess.Popen(
                 cmd,
-                input=input_text,
-                capture_output=True,
-                text=True,
-                timeout=self.timeout,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
             )
-
-            models = self._parse_output(result.stdout, sig, domain_size)
+            output = self._communicate(proc, input_text.encode(), cancel)
+            if output is None:
+                return Mace4Result(
+                    domain_size=domain_size,
+                    models_found=[],
+                    exit_code=-1,
+                    raw_output="",
+                    error="Cancelled",
+                    timed_out=True,
+                )
+            stdout = output[0].decode("utf-8", errors="replace")
+
+            models = self._parse_output(stdout, sig, domain_size)
 
             return Mace4Result(
                 domain_size=domain_size,
                 models_found=models,
-                exit_code=result.returncode,
-                raw_output=result.stdout,
-                error=result.stderr,
+                exit_code=proc.returncode,
+                raw_output=stdout,
+                error=output[1].decode("utf-8", errors="replace"),
             )
 
         except subprocess.TimeoutExpired:
@@ -129,8 +170,35 @@ class Mace4Solver:
                 error="Timed out",
                 timed_out=True,
             )
-        finally:
-            os.unlink(input_path)
+
+    def _communicate(
+        self,
+        proc: subprocess.Popen,
+        data: bytes,
+        cancel: threading.Event | None,
+    ) -> tuple[bytes, bytes] | None:
+        """Feed `data` to Mace4 and collect (stdout, stderr).
+
+        Kills the process and raises TimeoutExpired after self.timeout
+        seconds. With a `cancel` event, checks it every 0.1s and kills the
+        process and returns None once it is set.
+        """
+        deadline = time.monotonic() + self.timeout
+        while True:
+            remaining = max(0.0, deadline - time.monotonic())
+            try:
+                return proc.communicate(
+                    data, timeout=remaining if cancel is None else min(remaining, 0.1),
+                )
+            except subprocess.TimeoutExpired:
+                data = None  # Input is only sent on the first call
+                cancelled = cancel is not None and cancel.is_set()
+                if cancelled or time.monotonic() >= deadline:
+                    proc.kill()
+                    proc.communicate()
+                    if cancelled:
+                        return None
+                    raise
 
     def compute_spectrum(
         self,
@@ -141,14 +209,13 @@ class Mace4Solver:
     ) -> ModelSpectrum:
         """Compute the model spectrum: how many models exist at each size."""
         spectrum = ModelSpectrum(signature_name=sig.name)
+        # Only the domain size changes between runs; translate the axioms once
+        assumptions = self.translator.mace4_assumptions(sig)
 
         for size in range(min_size, max_size + 1):
-            result = self.find_models(sig, size, max_models_per_size)
-            n_models = len(result.models_found)
-            spectrum.spectrum[size] = n_models
-            spectrum.models_by_size[size] = result.models_found
-            if result.timed_out:
-                spectrum.timed_out_sizes.append(size)
+            spectrum.add_result(
+                self.find_models(sig, size, max_models_per_size, assumptions=assumptions)
+            )
 
         return spectrum
 
@@ -252,9 +319,5 @@ class Mace4Fallback:
     ) -> ModelSpectrum:
         spectrum = ModelSpectrum(signature_name=sig.name)
         for size in range(min_size, max_size + 1):
-            result = self.find_models(sig, size, max_models_per_size)
-            spectrum.spectrum[size] = len(result.models_found)
-            spectrum.models_by_size[size] = result.models_found
-            if result.timed_out:
-                spectrum.timed_out_sizes.append(size)
+            spectrum.add_result(self.find_models(sig, size, max_models_per_size))
         return spectrum
@@ -4,6 +4,10 @@ Z3 is NOT thread-safe, so we use process-level parallelism.
 Each worker creates its own SmartSolverRouter (and thus its own Z3/Mace4
 instances) to avoid shared state.
 
+Candidates reached by different moves are often the same problem under
+different names, so work items that pose identical problems are solved
+once and the spectrum is handed to each of them, renamed.
+
 Usage:
     from src.solvers.parallel import parallel_compute_spectra
 
@@ -17,8 +21,9 @@ Usage:
 from __future__ import annotations
 
 import os
-from concurrent.futures import ProcessPoolExecutor
-from typing import TYPE_CHECKING
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import replace
+from typing import TYPE_CHECKING, Iterator
 
 if TYPE_CHECKING:
     from src.core.signature import Signature
@@ -32,17 +37,54 @@ def _spectrum_worker(work_item: tuple) -> "ModelSpectrum":
 
     Must be a top-level function so multiprocessing can pickle it.
     Each call creates a fresh SmartSolverRouter to avoid sharing Z3 state.
+    An optional seventh element turns on the router's portfolio mode.
     """
-    sig, min_size, max_size, max_models, z3_timeout, mace4_timeout = work_item
+    sig, min_size, max_size, max_models, z3_timeout, mace4_timeout, *rest = work_item
     from src.solvers.router import SmartSolverRouter
 
     router = SmartSolverRouter(
         z3_timeout_ms=z3_timeout,
         mace4_timeout=mace4_timeout,
+        portfolio=bool(rest and rest[0]),
     )
     return router.compute_spectrum(sig, min_size, max_size, max_models)
 
 
+def _unique_work(work_items: list[tuple]) -> tuple[list[tuple], list[list[int]]]:
+    """Collapse work items that pose the same problem.
+
+    Returns the distinct items and, for each, the indices of the work
+    items it answers.
+    """
+    from src.solvers.cache import problem_key
+
+    unique: list[tuple] = []
+    owners: list[list[int]] = []
+    slot_by_key: dict[str, int] = {}
+    for i, item in enumerate(work_items):
+        sig, min_size, max_size, max_models, *solver_args = item
+        key = problem_key(sig, min_size, max_size, max_models, repr(solver_args))
+        slot = slot_by_key.get(key)
+        if slot is None:
+            slot_by_key[key] = len(unique)
+            unique.append(item)
+            owners.append([i])
+        else:
+            owners[slot].append(i)
+    return unique, owners
+
+
+def _for_item(spectrum: "ModelSpectrum", item: tuple) -> "ModelSpectrum":
+    """A copy of `spectrum` named after the item's signature."""
+    return replace(
+        spectrum,
+        signature_name=item[0].name,
+        spectrum=dict(spectrum.spectrum),
+        models_by_size={k: list(v) for k, v in spectrum.models_by_size.items()},
+        timed_out_sizes=list(spectrum.timed_out_sizes),
+    )
+
+
 # ── Public API ───────────────────────────────────────────────────────
 
 def parallel_compute_spectra(
@@ -54,7 +96,7 @@ def parallel_compute_spectra(
     Args:
         work_items: List of tuples, each containing:
             (signature, min_size, max_size, max_models_per_size,
-             z3_timeout_ms, mace4_timeout)
+             z3_timeout_ms, mace4_timeout[, portfolio])
         max_workers: Maximum number of worker processes.
             Defaults to min(len(work_items), os.cpu_count() or 4).
             Pass 1 to force sequential execution.
@@ -62,20 +104,48 @@ def parallel_compute_spectra(
     Returns:
         List of ModelSpectrum in the same order as work_items.
     """
+    results: list = [None] * len(work_items)
+    for i, spectrum in iter_compute_spectra(work_items, max_workers):
+        results[i] = spectrum
+    return results
+
+
+def iter_compute_spectra(
+    work_items: list[tuple],
+    max_workers: int | None = None,
+) -> Iterator[tuple[int, "ModelSpectrum"]]:
+    """Compute spectra in parallel, yielding results as workers finish.
+
+    Same arguments as parallel_compute_spectra, but yields
+    (index_into_work_items, spectrum) pairs in completion order instead of
+    returning a list, so callers that reduce each spectrum as it arrives
+    only hold O(max_workers) spectra (and their Cayley tables) at once.
+    """
     if not work_items:
-        return []
+        return
+
+    unique, owners = _unique_work(work_items)
+
+    def fan_out(slot: int, spectrum: "ModelSpectrum") -> Iterator[tuple[int, "ModelSpectrum"]]:
+        first, *others = owners[slot]
+        yield first, spectrum
+        for i in others:
+            yield i, _for_item(spectrum, work_items[i])
 
-    # Determine worker count
     if max_workers is None:
-        max_workers = min(len(work_items), os.cpu_count() or 4)
+        max_workers = min(len(unique), os.cpu_count() or 4)
     max_workers = max(1, max_workers)
 
     # Sequential fast path: single item or single worker
-    if max_workers == 1 or len(work_items) == 1:
-        return [_spectrum_worker(item) for item in work_items]
+    if max_workers == 1 or len(unique) == 1:
+        for slot, item in enumerate(unique):
+            yield from fan_out(slot, _spectrum_worker(item))
+        return
 
-    # Parallel execution
     with ProcessPoolExecutor(max_workers=max_workers) as executor:
-        results = list(executor.map(_spectrum_worker, work_items))
-
-    return results
+        futures = {
+            executor.submit(_spectrum_worker, item): slot
+            for slot, item in enumerate(unique)
+        }
+        for future in as_completed(futures):
+            yield from fan_out(futures.pop(future), future.result())
@@ -8,7 +8,7 @@ from __future__ import annotations
 
 import os
 import subprocess
-import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from enum import Enum
 
@@ -46,44 +46,52 @@ class Prover9Solver:
         try:
             result = subprocess.run(
                 [self.prover9_path, "--version"],
-                capture_output=True, text=True, timeout=5,
+                capture_output=True, timeout=5,
             )
             return result.returncode in (0, 1)
         except (FileNotFoundError, subprocess.TimeoutExpired):
             return False
 
-    def prove(self, sig: Signature, conjecture: Equation) -> ProofResult:
-        """Attempt to prove that the axioms of `sig` imply `conjecture`."""
+    def prove(
+        self, sig: Signature, conjecture: Equation, timeout: int | None = None,
+    ) -> ProofResult:
+        """Attempt to prove that the axioms of `sig` imply `conjecture`.
+
+        `timeout` (seconds) overrides the solver's default for this call.
+        """
         input_text = self.translator.to_prover9(sig, conjecture)
         conj_str = repr(conjecture)
+        timeout = self.timeout if timeout is None else timeout
 
         try:
+            # Bytes in and out: LADR output is ASCII, so an explicit decode
+            # is cheaper than the locale-dependent text mode
             result = subprocess.run(
-                [self.prover9_path, f"-t{self.timeout}"],
-                input=input_text,
+                [self.prover9_path, f"-t{timeout}"],
+                input=input_text.encode(),
                 capture_output=True,
-                text=True,
-                timeout=self.timeout + 5,
+                timeout=timeout + 5,
             )
+            stdout = result.stdout.decode("utf-8", errors="replace")
 
-            if result.returncode == 0 and "THEOREM PROVED" in result.stdout:
+            if result.returncode == 0 and "THEOREM PROVED" in stdout:
                 return ProofResult(
                     status=ProofStatus.PROVED,
                     conjecture=conj_str,
-                    proof_text=self._extract_proof(result.stdout),
-                    raw_output=result.stdout,
+                    proof_text=self._extract_proof(stdout),
+                    raw_output=stdout,
                 )
-            elif "SEARCH FAILED" in result.stdout:
+            elif "SEARCH FAILED" in stdout:
                 return ProofResult(
                     status=ProofStatus.DISPROVED,
                     conjecture=conj_str,
-                    raw_output=result.stdout,
+                    raw_output=stdout,
                 )
             else:
                 return ProofResult(
                     status=ProofStatus.TIMEOUT,
                     conjecture=conj_str,
-                    raw_output=result.stdout,
+                    raw_output=stdout,
                 )
 
         except subprocess.TimeoutExpired:
@@ -98,6 +106,24 @@ class Prover9Solver:
                 raw_output=f"Prover9 not found at {self.prover9_path}",
             )
 
+    def prove_many(
+        self,
+        sig: Signature,
+        conjectures: list[Equation],
+        timeout: int | None = None,
+        max_workers: int | None = None,
+    ) -> list[ProofResult]:
+        """Attempt several conjectures at once; results are in input order.
+
+        Each attempt is its own Prover9 process, so threads are enough to
+        run them side by side: they only wait on the subprocesses.
+        """
+        if len(conjectures) <= 1:
+            return [self.prove(sig, conj, timeout) for conj in conjectures]
+        workers = min(len(conjectures), max_workers or os.cpu_count() or 4)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(lambda conj: self.prove(sig, conj, timeout), conjectures))
+
     def _extract_proof(self, output: str) -> str:
         """Extract the proof portion from Prover9 output."""
         lines = output.split("\n")
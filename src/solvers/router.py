@@ -8,6 +8,10 @@ available solver:
   → Z3 with symmetry breaking + extended timeout (fallback)
 - Everything else → Z3 (default, fast for small domains)
 
+With ``portfolio=True`` (and Mace4 installed) the routing is skipped:
+Mace4 and Z3 race on every size and the first definite answer wins,
+since which one is faster depends heavily on the signature's shape.
+
 This prevents the O(n³) constraint explosion that causes Z3 to time out
 on structures like Full-Self-Distributive Quasigroups, yielding false
 "0 models" results.
@@ -16,10 +20,12 @@ on structures like Full-Self-Distributive Quasigroups, yielding false
 from __future__ import annotations
 
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 from src.core.signature import AxiomKind, Signature
 from src.solvers.mace4 import Mace4Result, Mace4Solver, ModelSpectrum
-from src.solvers.z3_solver import HEAVY_AXIOM_KINDS, Z3ModelFinder
+from src.solvers.z3_solver import HEAVY_AXIOM_KINDS, Z3_VERSION, Z3ModelFinder
 
 log = logging.getLogger(__name__)
 
@@ -52,10 +58,12 @@ class SmartSolverRouter:
         z3_timeout_ms: int = 30000,
         mace4_timeout: int = 30,
         heavy_timeout_multiplier: float = 2.0,
+        portfolio: bool = False,
     ):
         self.z3_timeout_ms = z3_timeout_ms
         self.mace4_timeout = mace4_timeout
         self.heavy_timeout_multiplier = heavy_timeout_multiplier
+        self.portfolio = portfolio
 
         # Probe Mace4 availability once at init
         self._mace4 = Mace4Solver(timeout=mace4_timeout)
@@ -70,6 +78,10 @@ class SmartSolverRouter:
         """At least one solver must be available."""
         return self._mace4_available or self._z3_normal.is_available()
 
+    def cache_tag(self) -> str:
+        """Identify the solvers this router would run, for keying result caches."""
+        return f"z3={Z3_VERSION};mace4={self._mace4_available};portfolio={self.portfolio}"
+
     def classify(self, sig: Signature) -> str:
         """Classify a signature for solver routing.
 
@@ -120,11 +132,85 @@ class SmartSolverRouter:
         """Compute the model spectrum using the best solver for this signature."""
         spectrum = ModelSpectrum(signature_name=sig.name)
 
+        if self.portfolio and self._mace4_available and self._z3_normal.is_available():
+            z3_finder = self._z3_heavy if _has_heavy_axioms(sig) else self._z3_normal
+            log.debug("Racing Mace4 and Z3 on %s (sizes %d-%d)", sig.name, min_size, max_size)
+            for size in range(min_size, max_size + 1):
+                spectrum.add_result(
+                    self.race_models(sig, size, max_models_per_size, z3_finder)
+                )
+            return spectrum
+
+        # Z3 routes reuse one solver across sizes (push/pop per size) and
+        # Mace4 reuses one translation of the axioms, so setup is paid once
+        # per signature rather than once per size.
+        route = self.classify(sig)
+        z3_finder = None
+        z3_solver = None
+        if route == "mace4_heavy":
+            log.debug(
+                "Routing %s (sizes %d-%d) to Mace4 (heavy axioms)", sig.name, min_size, max_size,
+            )
+            return self._mace4.compute_spectrum(
+                sig, min_size, max_size, max_models_per_size,
+            )
+        if self._z3_normal.is_available():
+            z3_finder = self._z3_heavy if route == "z3_heavy" else self._z3_normal
+            z3_solver = z3_finder.new_solver()
+            log.debug(
+                "Routing %s (sizes %d-%d) to Z3 (%s)", sig.name, min_size, max_size, route,
+            )
+
         for size in range(min_size, max_size + 1):
-            result = self.find_models(sig, size, max_models_per_size)
-            spectrum.spectrum[size] = len(result.models_found)
-            spectrum.models_by_size[size] = result.models_found
-            if result.timed_out:
-                spectrum.timed_out_sizes.append(size)
+            if z3_finder is not None:
+                result = z3_finder.find_models(
+                    sig, size, max_models_per_size, solver=z3_solver,
+                )
+            else:
+                result = self.find_models(sig, size, max_models_per_size)
+            spectrum.add_result(result)
 
         return spectrum
+
+    def race_models(
+        self,
+        sig: Signature,
+        domain_size: int,
+        max_models: int,
+        z3_finder: Z3ModelFinder,
+    ) -> Mace4Result:
+        """Run Mace4 and Z3 on one size at once; return the first definite result.
+
+        Mace4 runs as a subprocess watched from a helper thread, Z3 in this
+        thread (it is not thread-safe, so it never leaves it). A definite
+        Mace4 answer interrupts Z3; a definite Z3 answer kills Mace4. If
+        both time out, Z3's partial result is returned.
+        """
+        # A fresh solver per size, so an interrupt that lands after Z3 has
+        # already finished cannot cut short the next size's search
+        solver = z3_finder.new_solver()
+        cancel = threading.Event()
+        z3_done = threading.Event()
+        mace4_won = threading.Event()
+
+        def run_mace4() -> Mace4Result:
+            result = self._mace4.find_models(sig, domain_size, max_models, cancel=cancel)
+            if not result.timed_out and not z3_done.is_set():
+                mace4_won.set()
+                solver.interrupt()
+            return result
+
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            mace4_future = pool.submit(run_mace4)
+            z3_result = z3_finder.find_models(sig, domain_size, max_models, solver=solver)
+            z3_done.set()
+            if not mace4_won.is_set() and not z3_result.timed_out:
+                cancel.set()
+                log.debug("Z3 won on %s (size %d)", sig.name, domain_size)
+                return z3_result
+            mace4_result = mace4_future.result()
+
+        if mace4_won.is_set() or not mace4_result.timed_out:
+            log.debug("Mace4 won on %s (size %d)", sig.name, domain_size)
+            return mace4_result
+        return z3_result
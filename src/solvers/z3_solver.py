@@ -28,8 +28,10 @@ from src.solvers.mace4 import Mace4Result, ModelSpectrum
 try:
     import z3
     Z3_AVAILABLE = True
+    Z3_VERSION = z3.get_version_string()
 except ImportError:
     Z3_AVAILABLE = False
+    Z3_VERSION = ""
 
 
 class Z3ModelFinder:
@@ -37,21 +39,35 @@ class Z3ModelFinder:
 
     def __init__(self, timeout_ms: int = 30000):
         self.timeout_ms = timeout_ms
+        # (op name, arity, size) -> (table variables, range constraints).
+        # Explored signatures reuse a handful of op names, so the Z3 terms
+        # are built once per finder and shared by every later search.
+        self._op_vars: dict[tuple[str, int, int], tuple[list, list]] = {}
 
     def is_available(self) -> bool:
         return Z3_AVAILABLE
 
+    def new_solver(self) -> "z3.Solver":
+        """Create a Z3 solver configured with this finder's timeout."""
+        solver = z3.Solver()
+        solver.set("timeout", self.timeout_ms)
+        return solver
+
     def find_models(
         self,
         sig: Signature,
         domain_size: int,
         max_models: int = 10,
+        solver: "z3.Solver | None" = None,
     ) -> Mace4Result:
         """Search for finite models using Z3.
 
         We encode the structure as integer arithmetic over [0, domain_size).
         Operations become uninterpreted functions. Axioms become universal
         quantifiers over the domain.
+
+        If `solver` is given, the search runs inside a push()/pop() scope on
+        it, so one solver can be reused across domain sizes.
         """
         if not Z3_AVAILABLE:
             return Mace4Result(
@@ -62,8 +78,23 @@ class Z3ModelFinder:
                 error="z3-solver not installed",
             )
 
-        solver = z3.Solver()
-        solver.set("timeout", self.timeout_ms)
+        if solver is None:
+            return self._search(self.new_solver(), sig, domain_size, max_models)
+
+        solver.push()
+        try:
+            return self._search(solver, sig, domain_size, max_models)
+        finally:
+            solver.pop()
+
+    def _search(
+        self,
+        solver: "z3.Solver",
+        sig: Signature,
+        domain_size: int,
+        max_models: int,
+    ) -> Mace4Result:
+        """Encode `sig` at `domain_size` into `solver` and enumerate models."""
         n = domain_size
 
         # Create integer constants for the domain elements
@@ -76,20 +107,15 @@ class Z3ModelFinder:
         unary_tables: dict[str, list[z3.ArithRef]] = {}
 
         for op in sig.operations:
+            if op.arity > 2:
+                continue
+            table, bounds = self._op_variables(op.name, op.arity, n)
+            solver.add(*bounds)
             if op.arity == 0:
-                v = z3.Int(f"{op.name}")
-                solver.add(v >= 0, v < n)
-                const_vars[op.name] = v
+                const_vars[op.name] = table
             elif op.arity == 1:
-                table = [z3.Int(f"{op.name}_{i}") for i in range(n)]
-                for v in table:
-                    solver.add(v >= 0, v < n)
                 unary_tables[op.name] = table
-            elif op.arity == 2:
-                table = [[z3.Int(f"{op.name}_{i}_{j}") for j in range(n)] for i in range(n)]
-                for row in table:
-                    for v in row:
-                        solver.add(v >= 0, v < n)
+            else:
                 op_tables[op.name] = table
 
         # Encode axioms as constraints
@@ -114,44 +140,29 @@ class Z3ModelFinder:
             model = solver.model()
             tables = {}
             constants = {}
+            # Block this model to find the next one; each cell is evaluated
+            # once and feeds both the table and the blocking clause
+            block = []
+
+            def value(var: "z3.ArithRef") -> int:
+                val = model.evaluate(var, model_completion=True)
+                block.append(var != val)
+                return val.as_long()
 
             for op_name, table in op_tables.items():
-                arr = np.zeros((n, n), dtype=int)
-                for i in range(n):
-                    for j in range(n):
-                        val = model.evaluate(table[i][j], model_completion=True)
-                        arr[i][j] = val.as_long()
-                tables[op_name] = arr
+                tables[op_name] = np.array(
+                    [[value(v) for v in row] for row in table], dtype=int,
+                )
 
             for name, var in const_vars.items():
-                val = model.evaluate(var, model_completion=True)
-                constants[name] = val.as_long()
+                constants[name] = value(var)
 
             for name, table in unary_tables.items():
-                arr = np.array([
-                    model.evaluate(table[i], model_completion=True).as_long()
-                    for i in range(n)
-                ])
-                tables[f"_unary_{name}"] = arr
+                tables[f"_unary_{name}"] = np.array([value(v) for v in table])
 
             ct = CayleyTable(size=n, tables=tables, constants=constants)
             models.append(ct)
 
-            # Block this model to find the next one
-            block = []
-            for op_name, table in op_tables.items():
-                for i in range(n):
-                    for j in range(n):
-                        val = model.evaluate(table[i][j], model_completion=True)
-                        block.append(table[i][j] != val.as_long())
-            for name, var in const_vars.items():
-                val = model.evaluate(var, model_completion=True)
-                block.append(var != val.as_long())
-            for name, table in unary_tables.items():
-                for i in range(n):
-                    val = model.evaluate(table[i], model_completion=True)
-                    block.append(table[i] != val.as_long())
-
             if block:
                 solver.add(z3.Or(block))
 
@@ -171,14 +182,38 @@ class Z3ModelFinder:
         max_models_per_size: int = 10,
     ) -> ModelSpectrum:
         spectrum = ModelSpectrum(signature_name=sig.name)
+        # One solver for all sizes: each size is encoded in its own push/pop scope
+        solver = self.new_solver() if Z3_AVAILABLE else None
         for size in range(min_size, max_size + 1):
-            result = self.find_models(sig, size, max_models_per_size)
-            spectrum.spectrum[size] = len(result.models_found)
-            spectrum.models_by_size[size] = result.models_found
-            if result.timed_out:
-                spectrum.timed_out_sizes.append(size)
+            spectrum.add_result(
+                self.find_models(sig, size, max_models_per_size, solver=solver)
+            )
         return spectrum
 
+    def _op_variables(self, name: str, arity: int, n: int) -> tuple[list, list]:
+        """Return the (cached) value variables of an operation at size `n`.
+
+        Constants get a single variable, unary ops a list, binary ops an n×n
+        table, each paired with the constraints keeping values in [0, n).
+        """
+        key = (name, arity, n)
+        cached = self._op_vars.get(key)
+        if cached is not None:
+            return cached
+        if arity == 0:
+            table = z3.Int(name)
+            cells = [table]
+        elif arity == 1:
+            table = [z3.Int(f"{name}_{i}") for i in range(n)]
+            cells = table
+        else:
+            table = [[z3.Int(f"{name}_{i}_{j}") for j in range(n)] for i in range(n)]
+            cells = [v for row in table for v in row]
+        lo, hi = z3.IntVal(0), z3.IntVal(n)
+        bounds = [c for v in cells for c in (v >= lo, v < hi)]
+        self._op_vars[key] = (table, bounds)
+        return table, bounds
+
     @staticmethod
     def _is_heavy_signature(sig: Signature) -> bool:
         """Check if a signature has O(n³) equational axioms AND is safe
@@ -83,7 +83,7 @@ def display_cayley_tables(spectrum: ModelSpectrum, max_tables: int = 3) -> None:
         models = spectrum.models_by_size[size]
         if not models:
             continue
-        for i, model in enumerate(models[:2]):  # At most 2 per size
+        for i, model in enumerate(spectrum.iter_models(size)):
             if shown >= max_tables:
                 return
             for op_name, tbl in model.tables.items():
@@ -132,8 +132,16 @@ def display_cayley_tables(spectrum: ModelSpectrum, max_tables: int = 3) -> None:
             shown += 1
 
 
-def display_exploration_results(results: list[dict[str, Any]], limit: int = 20) -> None:
-    """Display exploration results as a table."""
+def display_exploration_results(
+    results: list[dict[str, Any]],
+    limit: int = 20,
+    total: int | None = None,
+) -> None:
+    """Display exploration results as a table.
+
+    `total` is the full candidate count when `results` is already cut down
+    to the best few.
+    """
     table = Table(title="Exploration Results")
     table.add_column("#", style="dim", justify="right")
     table.add_column("Name", style="cyan")
@@ -152,8 +160,39 @@ def display_exploration_results(results: list[dict[str, Any]], limit: int = 20)
         )
 
     console.print(table)
-    if len(results) > limit:
-        console.print(f"  ... and {len(results) - limit} more candidates")
+    total = len(results) if total is None else total
+    if total > limit:
+        console.print(f"  ... and {total - limit} more candidates")
+
+
+def display_model_check_results(
+    results: list[tuple[str, ModelSpectrum, ScoreBreakdown | None]],
+    max_size: int,
+) -> None:
+    """Display model-checking outcomes for several candidates as one table.
+
+    Each entry is (name, spectrum, score re-computed with that spectrum);
+    the score is None when no models were found.
+    """
+    table = Table(title="Model Check Results")
+    table.add_column("Name", style="cyan")
+    table.add_column("Spectrum", style="green")
+    table.add_column("Sizes", style="yellow")
+    table.add_column("Score", style="magenta", justify="right")
+
+    for name, spectrum, score in results:
+        if spectrum.is_empty():
+            table.add_row(name[:40], f"[dim]none up to size {max_size}[/dim]", "", "")
+            continue
+        counts = ", ".join(f"{size}:{n}" for size, n in sorted(spectrum.spectrum.items()))
+        table.add_row(
+            name[:40],
+            counts,
+            str(spectrum.sizes_with_models()),
+            f"{score.total:.3f}" if score is not None else "",
+        )
+
+    console.print(table)
 
 
 def display_cycle_report(report: Any) -> None:
@@ -98,6 +98,38 @@ def test_parse_equation_norm():
     assert result == expected
 
 
+
+
+def test_parse_equation_cached_per_constants():
+    """Repeated parses share one result; the constants set is part of the key."""
+    a = parse_equation("(x mul e) = x", constants={"e"})
+    assert parse_equation("(x mul e) = x", constants={"e"}) is a
+    as_var = parse_equation("(x mul e) = x")
+    assert as_var.lhs.args[1] == Var("e")
+    assert a.lhs.args[1] == Const("e")
+
+@pytest.mark.parametrize("text", [
+    "", "(x mul y", "x y", "inv(x", "op(x,)", "(x mul y))", "1x", "x + y", ")",
+    "(x , y)", "(x ) y)",
+])
+def test_parse_expr_rejects_malformed(text):
+    with pytest.raises(ValueError):
+        parse_expr(text)
+
+
+def test_parse_expr_other_whitespace():
+    assert parse_expr("(x\tmul\n inv(y))") is parse_expr("(x mul inv(y))")
+
+
+def test_parse_expr_deep_nesting():
+    """Parsing keeps no Python frame per node, so depth is not recursion-bound."""
+    depth = 5000
+    result = parse_expr("inv(" * depth + "x" + ")" * depth)
+    for _ in range(depth):
+        assert isinstance(result, App) and result.op_name == "inv"
+        result = result.args[0]
+    assert result == Var("x")
+
 # --- Signature.from_dict() roundtrip tests ---
 
 
@@ -252,3 +284,53 @@ def test_archive_failed_not_in_fingerprints(tmp_library):
 
     fps_after = set(tmp_library.all_fingerprints())
     assert "abcd1234abcd1234" not in fps_after
+
+
+# --- Score write-back tests ---
+
+
+def test_run_backtest_updates_score_in_place(tmp_library, tmp_path):
+    """A passing discovery has its new score written back to its own file."""
+    from backtest import run_backtest
+
+    exit_code = run_backtest(
+        library_path=str(tmp_path / "library"), max_size=2, workers=1,
+    )
+    assert exit_code == 0
+
+    files = list((tmp_path / "library" / "discovered").glob("disc_*.json"))
+    assert len(files) == 1
+    data = json.loads(files[0].read_text())
+    assert data["id"] == "disc_9999"
+    assert data["score"] != 0.5
+    assert data["score_breakdown"]["total"] == data["score"]
+    assert not list((tmp_path / "library" / "discovered").glob("*.tmp"))
+
+
+def test_run_backtest_dry_run_leaves_files(tmp_library, tmp_path):
+    """--dry-run never rewrites discovery files."""
+    from backtest import run_backtest
+
+    path = tmp_path / "library" / "discovered" / "disc_9999_FakeStructure.json"
+    before = path.read_text()
+    run_backtest(library_path=str(tmp_path / "library"), max_size=2, workers=1, dry_run=True)
+    assert path.read_text() == before
+
+
+def test_solver_key_ignores_names_but_not_equations():
+    """Renamed copies share a solver key; same-shape signatures with different axioms don't."""
+    from backtest import _solver_key
+    from src.core.signature import Axiom, AxiomKind, make_idempotent_equation
+
+    a = KNOWN_STRUCTURES["Semigroup"]()
+    b = KNOWN_STRUCTURES["Semigroup"]()
+    b.name = "RenamedSemigroup"
+    b.description = "same structure, different label"
+    assert _solver_key(a) == _solver_key(b)
+
+    c = KNOWN_STRUCTURES["Magma"]()
+    c.axioms.append(Axiom(AxiomKind.CUSTOM, make_idempotent_equation("mul"), ["mul"]))
+    d = KNOWN_STRUCTURES["Magma"]()
+    d.axioms.append(Axiom(AxiomKind.CUSTOM, parse_equation("(x mul y) = x"), ["mul"]))
+    assert c.fingerprint() == d.fingerprint()
+    assert _solver_key(c) != _solver_key(d)
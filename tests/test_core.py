@@ -1,5 +1,8 @@
 """Tests for core data structures: AST nodes and signatures."""
 
+import hashlib
+import json
+
 import pytest
 from src.core.ast_nodes import App, Const, Equation, Var
 from src.core.signature import (
@@ -40,6 +43,19 @@ class TestExpr:
         assert outer.size() == 5
         assert outer.variables() == {"x", "y", "z"}
 
+    def test_cached_size_and_variables_survive_pickling(self):
+        import pickle
+        x, y = Var("x"), Var("y")
+        expr = App("mul", [App("inv", [x]), y])
+        assert expr.size() == 4
+        expr.variables().add("mutated")  # callers get their own copy
+        assert expr.variables() == {"x", "y"}
+
+        clone = pickle.loads(pickle.dumps(expr))
+        assert clone == expr and hash(clone) == hash(expr)
+        assert clone.size() == 4
+        assert clone.variables() == {"x", "y"}
+
     def test_substitute(self):
         x, y = Var("x"), Var("y")
         expr = App("mul", [x, y])
@@ -49,12 +65,37 @@ class TestExpr:
         assert result.args[0] == a
         assert result.args[1] == y
 
+    def test_parsed_trees_share_nodes(self):
+        from src.core.ast_nodes import parse_equation
+        a = parse_equation("(x mul e) = x", constants={"e"})
+        b = parse_equation("(x mul e) = x", constants={"e"})
+        assert a.lhs is b.lhs
+        assert a.lhs.args[0] is a.rhs
+        # Substitution keeps untouched subtrees and shares rebuilt ones
+        assert a.lhs.substitute({"y": Var("z")}) is a.lhs
+        swapped = a.lhs.substitute({"x": a.lhs.args[1]})
+        assert swapped is parse_equation("(e mul e) = e", constants={"e"}).lhs
+
+    def test_names_interned(self):
+        import sys
+        from src.core.ast_nodes import parse_expr
+        expr = parse_expr("inv((x " + "".join(["m", "ul"]) + " e))", constants={"e"})
+        assert expr.op_name is sys.intern("inv")
+        assert expr.args[0].op_name is sys.intern("mul")
+        assert expr.args[0].args[1].name is sys.intern("e")
+
     def test_equation(self):
         x, y = Var("x"), Var("y")
         eq = Equation(App("mul", [x, y]), App("mul", [y, x]))
         assert eq.variables() == {"x", "y"}
         assert eq.size() == 6
 
+    def test_equation_variables_are_copies(self):
+        eq = Equation(App("inv", [Var("x")]), Const("e"))
+        eq.variables().add("mutated")
+        assert eq.variables() == {"x"}
+        assert Equation(Var("x"), Var("y")) == Equation(Var("x"), Var("y"))
+
 
 class TestSignature:
     def test_basic_signature(self):
@@ -82,8 +123,31 @@ class TestSignature:
             operations=[Operation("op", ["T", "T"], "T")],
             axioms=[Axiom(AxiomKind.ASSOCIATIVITY, make_assoc_equation("op"), ["op"])],
         )
-        # Same structural shape → same fingerprint
-        assert sig1.fingerprint() == sig2.fingerprint()
+        # Same structural shape → same fingerprint (one shared, interned string)
+        assert sig1.fingerprint() is sig2.fingerprint()
+
+    def test_fingerprint_follows_mutation(self):
+        sig = Signature(
+            name="A",
+            sorts=[Sort("S")],
+            operations=[Operation("mul", ["S", "S"], "S")],
+            axioms=[Axiom(AxiomKind.ASSOCIATIVITY, make_assoc_equation("mul"), ["mul"])],
+        )
+        before = sig.fingerprint()
+        sig.axioms = []
+        assert sig.fingerprint() != before
+
+    def test_fingerprint_stable_across_versions(self):
+        """Fingerprints are persisted in discovery files, so the hash must not drift."""
+        sig = Signature(
+            name="A",
+            sorts=[Sort("S")],
+            operations=[Operation("mul", ["S", "S"], "S")],
+            axioms=[Axiom(AxiomKind.ASSOCIATIVITY, make_assoc_equation("mul"), ["mul"])],
+        )
+        canon = {"sorts": 1, "op_arities": [2], "axiom_kinds": ["ASSOCIATIVITY"]}
+        blob = json.dumps(canon, sort_keys=True).encode()
+        assert sig.fingerprint() == hashlib.sha256(blob).hexdigest()[:16]
 
     def test_fingerprint_differs(self):
         sig1 = Signature(
@@ -2,6 +2,7 @@
 
 import pytest
 import tempfile
+import time
 from pathlib import Path
 
 from src.moves.engine import MoveEngine, MoveKind
@@ -89,6 +90,115 @@ class TestToolExecutor:
         })
         assert "candidates" in result
 
+    def test_explore_many_matches_explore(self, executor):
+        args_list = [
+            {"base_structures": ["Semigroup"], "moves": ["DUALIZE", "COMPLETE"], "depth": 1},
+            {"base_structures": ["NoSuchStructure"]},
+            {"base_structures": ["Monoid"], "depth": 1},
+        ]
+        results = dict(executor.explore_many(args_list, max_workers=2))
+        assert sorted(results) == [0, 1, 2]
+        assert "error" in results[1]
+        assert results[0] == executor.execute("explore", args_list[0])
+        # Candidates from worker processes are registered for later tools
+        name = results[2]["candidates"][0]["name"]
+        assert "error" not in executor.execute("score", {"signature_id": name})
+
+    def test_schemas_match_dispatch(self, executor):
+        import json
+        from src.agent.tools import TOOL_SCHEMAS, TOOL_SCHEMAS_BY_NAME, TOOL_SCHEMAS_JSON
+        assert set(TOOL_SCHEMAS_BY_NAME) == set(executor._TOOL_METHODS)
+        assert all(callable(getattr(executor, m)) for m in executor._TOOL_METHODS.values())
+        assert json.loads(TOOL_SCHEMAS_JSON) == TOOL_SCHEMAS
+
+    def test_spectra_cached_across_sessions(self, executor, monkeypatch):
+        args = {"signature_id": "Group", "min_size": 2, "max_size": 3}
+        first = executor.execute("check_models", args)
+
+        fresh = ToolExecutor(executor.library)
+        monkeypatch.setattr(fresh.model_finder, "compute_spectrum",
+                            lambda *a: pytest.fail("solver ran despite cache"))
+        assert fresh.execute("check_models", args) == first
+        # Batch checks answer from the cache too, without a process pool
+        batch = fresh.execute("check_models_batch", {"signature_ids": ["Group"], "max_size": 3})
+        assert batch["results"][0]["spectrum"] == first["spectrum"]
+
+        uncached = ToolExecutor(executor.library, cache_spectra=False)
+        assert uncached.spectrum_cache is None
+
+    def test_spectrum_cache_skips_timeouts(self, tmp_path):
+        from src.solvers.cache import SpectrumCache
+        from src.solvers.mace4 import ModelSpectrum
+        cache = SpectrumCache(tmp_path)
+        partial = ModelSpectrum("Group", spectrum={2: 1, 3: 0}, timed_out_sizes=[3])
+        cache.put(group(), 2, 3, 10, partial)
+        assert cache.get(group(), 2, 3, 10) is None
+        cache.put(group(), 2, 3, 10, ModelSpectrum("Group", spectrum={2: 1, 3: 1}))
+        renamed = group()
+        renamed.name = "Renamed"
+        hit = cache.get(renamed, 2, 3, 10)
+        assert hit.signature_name == "Renamed" and hit.spectrum == {2: 1, 3: 1}
+        assert cache.get(semigroup(), 2, 3, 10) is None
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_execute_json(self, executor, monkeypatch, use_orjson):
+        import json
+        import src.agent.tools as tools_mod
+        if use_orjson and not tools_mod.ORJSON_AVAILABLE:
+            pytest.skip("orjson not installed")
+        monkeypatch.setattr(tools_mod, "ORJSON_AVAILABLE", use_orjson)
+        args = {"signature_id": "Group", "min_size": 2, "max_size": 3}
+        expected = json.loads(json.dumps(executor.execute("check_models", args)))
+        assert json.loads(executor.execute_json("check_models", json.dumps(args))) == expected
+        assert "error" in json.loads(executor.execute_json("score", "{not json"))
+        assert "error" in json.loads(executor.execute_json("score", "[1]"))
+
+    def test_explore_stops_when_top_candidates_stable(self):
+        from src.agent.tools import _run_exploration
+        # Dualizing twice gives back the base, so depth 2 adds nothing new
+        work = ([group()], ["DUALIZE"], None, 3, 0.0, frozenset())
+        assert _run_exploration(work + (True,))[2] == 2
+        assert _run_exploration(work + (False,))[2] == 3
+
+    def test_explore_runs_full_depth_by_default(self, executor):
+        args = {"base_structures": ["Group"], "moves": ["DUALIZE"], "depth": 3}
+        assert executor.execute("explore", args)["depth_reached"] == 3
+        args["stop_when_stable"] = True
+        assert executor.execute("explore", args)["depth_reached"] == 2
+
+    def test_tools_import_leaves_solvers_unloaded(self):
+        import subprocess, sys
+        code = (
+            "import sys, src.agent.tools; "
+            "print(sorted(m for m in ('z3', 'src.solvers.router', 'src.solvers.prover9') "
+            "if m in sys.modules))"
+        )
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                             cwd=Path(__file__).resolve().parent.parent)
+        assert out.stdout.strip() == "[]", out.stderr
+
+    def test_explore_dedupes_by_structure(self):
+        from src.agent.tools import _run_exploration
+        total, scored, _ = _run_exploration(([semigroup(), group()], None, None, 2, 0.0, frozenset(), False))
+        keys = [(c["move"], sig.structure_key()) for c, sig in scored]
+        assert len(keys) == total == len(set(keys))
+
+    def test_explore_keeps_same_shape_candidates(self):
+        from src.agent.tools import _run_exploration
+        from src.core.ast_nodes import parse_equation
+        from src.core.signature import Axiom, AxiomKind, Operation, Signature, Sort
+
+        def projection(name, eq):
+            return Signature(name, [Sort("S")], [Operation("mul", ["S", "S"], "S")],
+                             [Axiom(AxiomKind.CUSTOM, parse_equation(eq), ["mul"])])
+
+        left = projection("LeftProj", "(x mul y) = x")
+        right = projection("RightProj", "(x mul y) = y")
+        assert left.fingerprint() == right.fingerprint()
+        total, scored, _ = _run_exploration(([left, right], ["DUALIZE"], None, 1, 0.0, frozenset(), False))
+        assert total == 2
+        assert {c["name"] for c, _ in scored} == {"LeftProj_dual(mul)", "RightProj_dual(mul)"}
+
     def test_score_tool(self, executor):
         # First explore to get candidates
         executor.execute("explore", {
@@ -103,6 +213,65 @@ class TestToolExecutor:
             assert "scores" in result
             assert "total" in result["scores"]
 
+    def test_score_reused_until_spectrum_changes(self, executor, monkeypatch):
+        calls = []
+        real_score = executor.scorer.score
+        monkeypatch.setattr(executor.scorer, "score",
+                            lambda *a, **k: calls.append(a) or real_score(*a, **k))
+        first = executor.execute("score", {"signature_id": "Group"})
+        assert executor.execute("score", {"signature_id": "Group"}) == first
+        assert len(calls) == 1
+
+        executor.execute("check_models", {"signature_id": "Group", "min_size": 2, "max_size": 3})
+        executor.execute("score", {"signature_id": "Group"})
+        assert len(calls) == 2
+
+    def test_score_cache_tells_same_shape_apart(self, executor):
+        import copy
+        derived = copy.deepcopy(semigroup())
+        derived.name = "SemigroupDerived"
+        derived.derivation_chain = ["DUALIZE(Semigroup)", "ABSTRACT(x)"]
+        assert derived.fingerprint() == semigroup().fingerprint()
+        executor._candidates[derived.name] = derived
+
+        base = executor.execute("score", {"signature_id": "Semigroup"})["scores"]
+        other = executor.execute("score", {"signature_id": derived.name})["scores"]
+        known = executor.library.all_fingerprints_frozen()
+        assert other == executor.scorer.score(derived, None, known).to_dict()
+        assert other["total"] != base["total"]
+
+    def test_check_models_batch_keeps_order(self, executor):
+        candidates = [{"name": "Semigroup"}, {"name": "NoSuchStructure"}, {"name": "Group"}]
+        results = executor.check_models_batch(candidates, max_size=3, max_workers=1)
+        assert results[0]["signature"] == "Semigroup"
+        assert "error" in results[1]
+        assert results[2]["signature"] == "Group"
+
+        streamed = dict(executor.iter_check_models(candidates, max_size=3, max_workers=1))
+        assert sorted(streamed) == [0, 1, 2]
+        assert streamed[2]["total_models"] == results[2]["total_models"]
+
+    def test_batch_tools(self, executor):
+        result = executor.execute("check_models_batch", {
+            "signature_ids": ["Semigroup", "Group"], "max_size": 3,
+        })
+        assert [r["signature"] for r in result["results"]] == ["Semigroup", "Group"]
+        # check_models itself takes a list too
+        listed = executor.execute("check_models", {
+            "signature_ids": ["Semigroup", "Group"], "max_size": 3,
+        })
+        # Example models come back in solver order, so compare the counts only
+        assert [r["spectrum"] for r in listed["results"]] == [
+            r["spectrum"] for r in result["results"]
+        ]
+
+        result = executor.execute("explore_batch", {"explorations": [
+            {"base_structures": ["Semigroup"], "depth": 1},
+            {"base_structures": ["NoSuchStructure"]},
+        ]})
+        assert result["results"][0]["total_candidates"] > 0
+        assert "error" in result["results"][1]
+
     def test_search_library_tool(self, executor):
         result = executor.execute("search_library", {"query": "Group"})
         assert "results" in result
@@ -206,6 +375,570 @@ class TestAgentConfigExcludeMoves:
             )
 
 
+class TestAgentContext:
+    """Test the planning context the controller sends to Claude."""
+
+    def test_pending_cycle_replaces_history(self, tmp_path):
+        from src.agent.controller import AgentConfig, AgentController, CycleReport
+
+        controller = AgentController(AgentConfig(), LibraryManager(tmp_path / "lib"))
+        pending = CycleReport(
+            cycle_number=3, goal="g", plan="", candidates_generated=42,
+            candidates_with_models=7, top_candidates=[], conjectures=[],
+            discoveries=[], duration_seconds=0.0,
+        )
+        context = controller._build_context(4, pending)
+        assert "Previous Cycle (3) Summary" in context
+        assert "Candidates generated: 42" in context
+        assert "still being interpreted" in context
+        assert "Previous Cycle" not in controller._build_context(1)
+
+
+    def test_interpret_prompt_summary(self, tmp_path):
+        from src.agent.controller import AgentConfig, AgentController
+
+        controller = AgentController(AgentConfig(), LibraryManager(tmp_path / "lib"))
+        results = {"total_candidates": 2, "top_candidates": [
+            {"name": "A", "score": 0.5, "move": "DUALIZE",
+             "model_spectrum": {2: 1}, "total_models": 1},
+            {"name": "B", "score": 0.4, "move": "COMPLETE"},
+        ]}
+        prompt = controller._build_interpret_prompt(1, "plan", results)
+        assert "  - A (score: 0.5, move: DUALIZE, spectrum: {2: 1}, models: 1)" in prompt
+        assert "  - B (score: 0.4, move: COMPLETE)" in prompt
+        assert "  (none)" in controller._build_interpret_prompt(1, "plan", {})
+
+    def test_interpret_skipped_without_models(self, tmp_path, monkeypatch):
+        from src.agent.controller import AgentConfig, AgentController
+
+        controller = AgentController(AgentConfig(), LibraryManager(tmp_path / "lib"))
+        labels = []
+
+        def fake_call(prompt, system, label="", **kwargs):
+            labels.append(label)
+            return ('{"explorations": [{"base_structures": ["Semigroup"], '
+                    '"moves": ["DUALIZE"], "depth": 1}], "check_models_top_n": 0}')
+
+        monkeypatch.setattr(controller, "_call_claude", fake_call)
+        report = controller._run_cycle(1, 1)
+        assert report.candidates_generated > 0
+        assert labels == ["Claude planning"]
+
+    def test_overlapping_explorations_merge_without_duplicates(self, tmp_path):
+        from src.agent.controller import AgentConfig, AgentController
+
+        controller = AgentController(AgentConfig(), LibraryManager(tmp_path / "lib"))
+        exploration = {"base_structures": ["Semigroup"], "moves": ["DUALIZE"], "depth": 1}
+        results = controller._execute_plan_with_progress(
+            {"explorations": [exploration, exploration], "check_models_top_n": 0}
+        )
+        names = [c["name"] for c in results["top_candidates"]]
+        assert names
+        assert len(names) == len(set(names))
+
+    def test_merge_dedupes_by_structure_not_name(self, tmp_path, monkeypatch):
+        import copy
+        from src.agent.controller import AgentConfig, AgentController
+
+        controller = AgentController(AgentConfig(), LibraryManager(tmp_path / "lib"))
+        renamed = copy.deepcopy(semigroup())
+        renamed.name = "Abstract(Semigroup,Semigroup)"
+        controller.tools._candidates.update({"Semigroup": semigroup(), renamed.name: renamed})
+        results = [
+            {"total_candidates": 1, "candidates": [{"name": "Semigroup", "score": 0.5}]},
+            {"total_candidates": 1, "candidates": [{"name": renamed.name, "score": 0.6}]},
+        ]
+        monkeypatch.setattr(controller.tools, "explore_many",
+                            lambda args_list, max_workers=None: enumerate(results))
+        merged = controller._execute_plan_with_progress(
+            {"explorations": [{}, {}], "check_models_top_n": 0}
+        )
+        assert [c["name"] for c in merged["top_candidates"]] == ["Semigroup"]
+
+    def test_sessions_restarted_every_history_window(self, tmp_path, monkeypatch):
+        from src.agent.controller import AgentConfig, AgentController
+
+        controller = AgentController(AgentConfig(history_window=2), LibraryManager(tmp_path / "lib"))
+        started, closed = [], []
+
+        class FakeSession:
+            def __init__(self, role):
+                self.role = role
+                started.append(role)
+
+            def close(self):
+                closed.append(self.role)
+
+        def fake_get(role, system):
+            if role not in controller._sessions:
+                controller._sessions[role] = (system, FakeSession(role))
+            return controller._sessions[role][1]
+
+        monkeypatch.setattr(controller, "_get_session", fake_get)
+        for role in ("plan", "interpret"):
+            fake_get(role, "sys")
+        for cycle in range(1, 6):
+            controller._rotate_sessions(cycle, "sys")
+        # Fresh sessions for cycles 3 and 5
+        assert closed == ["plan", "interpret"] * 2
+        assert len(started) == 6
+
+    def test_reports_numbered_without_temp_files(self, tmp_path):
+        from src.agent.controller import AgentConfig, AgentController, CycleReport
+
+        lib = LibraryManager(tmp_path / "lib")
+        controller = AgentController(AgentConfig(), lib)
+        report = CycleReport(
+            cycle_number=1, goal="g", plan="", candidates_generated=0,
+            candidates_with_models=0, top_candidates=[], conjectures=[],
+            discoveries=[], duration_seconds=1.0,
+        )
+        controller._save_report(report)
+        controller._save_report(report)
+        names = sorted(f.name for f in (lib.base_path / "reports").iterdir())
+        assert names == ["cycle_001_report.md", "cycle_002_report.md"]
+
+    def test_report_writer_survives_bad_report(self, tmp_path):
+        import queue
+        from src.agent.controller import AgentConfig, AgentController, CycleReport
+
+        lib = LibraryManager(tmp_path / "lib")
+        controller = AgentController(AgentConfig(), lib)
+        good = CycleReport(
+            cycle_number=2, goal="g", plan="", candidates_generated=0,
+            candidates_with_models=0, top_candidates=[], conjectures=[],
+            discoveries=[], duration_seconds=1.0,
+        )
+        bad = CycleReport(
+            cycle_number=1, goal="g", plan="", candidates_generated=1,
+            candidates_with_models=0, top_candidates=[{"score": 1.0}], conjectures=[],
+            discoveries=[], duration_seconds=1.0,
+        )
+        controller._report_queue = queue.SimpleQueue()
+        for item in (bad, good, None):
+            controller._report_queue.put(item)
+        controller._report_writer()
+        reports = list((lib.base_path / "reports").iterdir())
+        assert len(reports) == 1
+        assert "# Research Cycle 2" in reports[0].read_text()
+
+    def test_claude_responses_cached_on_disk(self, tmp_path, monkeypatch):
+        from src.agent.controller import AgentConfig, AgentController, _SDKSession
+
+        controller = AgentController(AgentConfig(), LibraryManager(tmp_path / "lib"))
+        session = _SDKSession("claude-test", "sys", client=object())
+        monkeypatch.setattr(controller, "_get_session", lambda role, system: session)
+        calls = []
+
+        def fake_call(prompt, system, *args):
+            calls.append(prompt)
+            session.replay(prompt, f"response to {prompt}")  # what send() records
+            return f"response to {prompt}"
+
+        monkeypatch.setattr(controller, "_call_claude_uncached", fake_call)
+        assert controller._call_claude("p", "sys") == "response to p"
+        # Same prompt, but the conversation has moved on: not a cache hit
+        assert controller._call_claude("p", "sys") == "response to p"
+        assert calls == ["p", "p"]
+
+        # A fresh session in the same state is answered from disk, and the
+        # turn is replayed so the session matches what the controller saw
+        session = _SDKSession("claude-test", "sys", client=object())
+        assert controller._call_claude("p", "sys") == "response to p"
+        assert calls == ["p", "p"]
+        assert session.conversation() == [
+            {"role": "user", "content": "p"},
+            {"role": "assistant", "content": "response to p"},
+        ]
+
+        controller.config.cache_claude = False
+        session = _SDKSession("claude-test", "sys", client=object())
+        controller._call_claude("p", "sys")
+        assert calls == ["p", "p", "p"]
+
+    def test_claude_cache_skipped_for_cli_session(self, tmp_path, monkeypatch):
+        from src.agent.controller import AgentConfig, AgentController, _ClaudeSession
+
+        controller = AgentController(AgentConfig(), LibraryManager(tmp_path / "lib"))
+        cli_session = _ClaudeSession.__new__(_ClaudeSession)
+        monkeypatch.setattr(controller, "_get_session", lambda role, system: cli_session)
+        calls = []
+        monkeypatch.setattr(controller, "_call_claude_uncached",
+                            lambda prompt, *args: calls.append(prompt) or "reply")
+        controller._call_claude("p", "sys")
+        controller._call_claude("p", "sys")
+        assert calls == ["p", "p"]
+        assert not (controller.library.base_path / "cache" / "claude").exists()
+
+    def test_claude_cache_expires_and_evicts(self, tmp_path, monkeypatch):
+        import os
+        from src.agent import controller as controller_mod
+        from src.agent.controller import AgentConfig, AgentController
+
+        controller = AgentController(AgentConfig(), LibraryManager(tmp_path / "lib"))
+        session = controller_mod._SDKSession("claude-test", "sys", client=object())
+        monkeypatch.setattr(controller, "_get_session", lambda role, system: session)
+        calls = []
+
+        def fake_call(prompt, system, *args):
+            calls.append(prompt)
+            return f"response to {prompt}"
+
+        monkeypatch.setattr(controller, "_call_claude_uncached", fake_call)
+        monkeypatch.setattr(controller_mod, "_CACHE_MAX_ENTRIES", 2)
+
+        controller._call_claude("p", "sys")
+        stale = controller._claude_cache_path("p", "sys")
+        os.utime(stale, (0, 0))
+        controller._call_claude("p", "sys")
+        assert calls == ["p", "p"]
+
+        controller._call_claude("q", "sys")
+        path_q = controller._claude_cache_path("q", "sys")
+        os.utime(path_q, (1, path_q.stat().st_mtime))  # least recently used
+        controller._call_claude("r", "sys")
+        cached = sorted(p.name for p in stale.parent.glob("*.txt"))
+        assert len(cached) == 2
+        assert not path_q.exists()
+
+    def test_child_env_built_once_without_claudecode(self, tmp_path, monkeypatch):
+        from src.agent.controller import AgentConfig, AgentController
+
+        monkeypatch.setenv("CLAUDECODE", "1")
+        monkeypatch.setenv("MATH_AGENT_TEST", "yes")
+        controller = AgentController(AgentConfig(), LibraryManager(tmp_path / "lib"))
+        assert "CLAUDECODE" not in controller._child_env
+        assert controller._child_env["MATH_AGENT_TEST"] == "yes"
+        import os
+        assert os.environ["CLAUDECODE"] == "1"
+
+    def test_history_keeps_recent_cycles(self, tmp_path):
+        from src.agent.controller import AgentConfig, AgentController, CycleReport
+
+        controller = AgentController(AgentConfig(history_window=2), LibraryManager(tmp_path / "lib"))
+        for n in range(1, 5):
+            controller.history.append(CycleReport(
+                cycle_number=n, goal="g", plan="", candidates_generated=0,
+                candidates_with_models=0, top_candidates=[], conjectures=[],
+                discoveries=[], duration_seconds=1.0,
+            ))
+        assert [r.cycle_number for r in controller.history] == [3, 4]
+        assert "Previous Cycle (4)" in controller._build_context(5)
+
+    def test_system_prompt_built_once_per_goal(self, tmp_path):
+        from src.agent.controller import AgentConfig, AgentController
+
+        controller = AgentController(AgentConfig(goal="Find groups"), LibraryManager(tmp_path / "lib"))
+        first = controller._system_prompt()
+        assert "Find groups" in first
+        assert controller._system_prompt() is first
+        controller.config.goal = "Find rings"
+        assert "Find rings" in controller._system_prompt()
+
+    def test_plans_reused_for_same_library_state(self, tmp_path):
+        from src.agent.controller import AgentConfig, AgentController
+
+        controller = AgentController(
+            AgentConfig(cache_plans=True), LibraryManager(tmp_path / "lib")
+        )
+        key = controller._plan_cache_key(None)
+        assert controller._load_cached_plan(key) is None
+        controller._store_plan(key, '{"explorations": []}')
+        assert controller._load_cached_plan(key) == '{"explorations": []}'
+
+        # A different goal is a different library state
+        controller.config.goal = "Find rings"
+        assert controller._plan_cache_key(None) != key
+
+        controller.config.cache_plans = False
+        controller.config.goal = AgentConfig().goal
+        assert controller._load_cached_plan(key) is None
+
+
+FAKE_STREAM_CLI = """\
+import json, sys
+for n, line in enumerate(sys.stdin, 1):
+    prompt = json.loads(line)["message"]["content"]
+    reply = f"turn {n}: {prompt}"
+    print(json.dumps({"type": "assistant", "message": {"content": [{"type": "text", "text": reply}]}}), flush=True)
+    print(json.dumps({"type": "result", "is_error": False, "result": reply}), flush=True)
+"""
+
+
+class TestParseJsonBlock:
+    """Test extraction of tagged JSON blocks from Claude responses."""
+
+    @pytest.fixture
+    def controller(self, tmp_path):
+        from src.agent.controller import AgentConfig, AgentController
+        return AgentController(AgentConfig(), LibraryManager(tmp_path / "lib"))
+
+    def test_extracts_tagged_block(self, controller):
+        text = 'Thinking...\n<plan>\n{"depth": 2, "moves": ["DUALIZE"]}\n</plan>\nDone.'
+        assert controller._parse_json_block(text, "plan") == {"depth": 2, "moves": ["DUALIZE"]}
+
+    def test_fixes_trailing_commas(self, controller):
+        text = '<decisions>{"add_to_library": [{"name": "X",},], "conjectures": [],}</decisions>'
+        assert controller._parse_json_block(text, "decisions") == {
+            "add_to_library": [{"name": "X"}], "conjectures": [],
+        }
+
+    def test_stdlib_json_fallback(self, controller, monkeypatch):
+        import src.agent.controller as controller_mod
+        monkeypatch.setattr(controller_mod, "ORJSON_AVAILABLE", False)
+        assert controller._parse_json_block('<plan>{"a": [1, 2,]}</plan>', "plan") == {"a": [1, 2]}
+
+    def test_parses_bare_json_response(self, controller):
+        assert controller._parse_response('{"depth": 1,}', "plan") == {"depth": 1}
+        assert controller._parse_response('```json\n{"depth": 1}\n```', "plan") == {"depth": 1}
+        # Tagged responses are still accepted
+        assert controller._parse_response('ok <plan>{"depth": 3}</plan>', "plan") == {"depth": 3}
+        assert controller._parse_response("[1, 2]", "plan") is None
+        # Prose before the object no longer sends it to the tag fallback
+        assert controller._parse_response('Here is the plan:\n{"depth": 2}', "plan") == {"depth": 2}
+
+    def test_json_reply_done_stops_at_object_close(self):
+        from src.agent.controller import _json_reply_done
+        done = _json_reply_done()
+        assert not done('Plan: {"a": "}"')
+        assert not done('Plan: {"a": "}", "b": {"c": 1}')
+        assert done('Plan: {"a": "}", "b": {"c": 1}}')
+
+    def test_scanner_respects_strings(self, controller):
+        text = '{"reasoning": "use {braces}, and \\"quotes\\",]", "depth": 2,} trailing prose }'
+        assert controller._parse_response(text, "plan") == {
+            "reasoning": 'use {braces}, and "quotes",]', "depth": 2,
+        }
+        # Linear time on malformed output with no closing tag or brace
+        assert controller._parse_response("```json\n{" + " " * 100_000, "plan") == {}
+        assert controller._parse_json_block("<plan>" + "{" * 100_000, "plan") is None
+
+    def test_truncated_response_recovered(self, controller):
+        text = '{"explorations": [{"depth": 2, "moves": ["DUALIZE",], "base_structures": ["Gro'
+        assert controller._parse_response(text, "plan") == {
+            "explorations": [{"depth": 2, "moves": ["DUALIZE"], "base_structures": []}],
+        }
+        assert controller._parse_response('{"depth": 2, "moves": [', "plan") == {
+            "depth": 2, "moves": [],
+        }
+        assert controller._parse_response('{"reasoning": "cut off', "plan") == {}
+
+    def test_missing_or_invalid_block(self, controller):
+        assert controller._parse_json_block("no tags here", "plan") is None
+        assert controller._parse_json_block("<plan>{not json}</plan>", "plan") is None
+        assert controller._parse_json_block('<plan>{"a": 1}</plan>', "decisions") is None
+
+
+STREAMING_CLI = """\
+import json, sys
+def emit(event):
+    print(json.dumps(event), flush=True)
+for line in sys.stdin:
+    prompt = json.loads(line)["message"]["content"]
+    reply = f"<plan>{prompt}</plan> trailing"
+    for i in range(0, len(reply), 3):
+        emit({"type": "stream_event", "event": {"type": "content_block_delta",
+              "delta": {"type": "text_delta", "text": reply[i:i + 3]}}})
+    emit({"type": "result", "is_error": False, "result": reply})
+"""
+
+
+class TestClaudeSession:
+    """Test the persistent stream-json Claude CLI session against a fake CLI."""
+
+    def test_session_reuses_one_process(self, tmp_path):
+        import sys
+        from src.agent.controller import _ClaudeSession
+
+        script = tmp_path / "fake_claude.py"
+        script.write_text(FAKE_STREAM_CLI)
+        session = _ClaudeSession([sys.executable, str(script)])
+        try:
+            assert session.send("plan", timeout=10) == "turn 1: plan"
+            assert session.send("interpret", timeout=10) == "turn 2: interpret"
+        finally:
+            session.close()
+        assert session._proc.returncode == 0
+
+    def test_session_stops_early_and_drains(self, tmp_path):
+        import sys
+        from src.agent.controller import _ClaudeSession
+
+        script = tmp_path / "streaming_claude.py"
+        script.write_text(STREAMING_CLI)
+        session = _ClaudeSession([sys.executable, str(script)])
+        seen = []
+        try:
+            first = session.send("a", timeout=10, stop=lambda t: "</plan>" in t,
+                                 on_text=seen.append)
+            assert first.rstrip().endswith("</plan>")
+            assert "trailing" not in first
+            assert seen[-1] == first
+            # The leftover events of the first turn must not leak into the second
+            assert session.send("b", timeout=10) == "<plan>b</plan> trailing"
+        finally:
+            session.close()
+
+    def test_session_ticks_while_idle(self, tmp_path):
+        import sys
+        from src.agent.controller import _ClaudeSession
+
+        script = tmp_path / "slow_claude.py"
+        script.write_text("import time\ntime.sleep(1.5)\n" + FAKE_STREAM_CLI)
+        session = _ClaudeSession([sys.executable, str(script)])
+        ticks = []
+        try:
+            assert session.send("plan", timeout=10, on_text=ticks.append) == "turn 1: plan"
+        finally:
+            session.close()
+        assert "" in ticks
+
+    def test_sdk_session_keeps_conversation(self):
+        from contextlib import contextmanager
+        from src.agent.controller import _SDKSession
+
+        calls = []
+
+        class FakeMessages:
+            @contextmanager
+            def stream(self, **kwargs):
+                calls.append(kwargs)
+                reply = f"<plan>{kwargs['messages'][-1]['content'][0]['text']}</plan> trailing"
+
+                class Stream:
+                    text_stream = iter([reply[i:i + 4] for i in range(0, len(reply), 4)])
+                yield Stream()
+
+        class FakeClient:
+            messages = FakeMessages()
+
+        session = _SDKSession("claude-test", "sys", client=FakeClient())
+        assert "trailing" not in session.send("a", stop=lambda t: "</plan>" in t)
+        assert session.send("b").endswith("trailing")
+        assert calls[1]["system"][0]["text"] == "sys"
+        assert [m["role"] for m in calls[1]["messages"]] == ["user", "assistant", "user"]
+        # Only the newest turn carries the cache breakpoint
+        assert calls[1]["messages"][0]["content"] == "a"
+        assert calls[1]["messages"][-1]["content"][0]["cache_control"] == {"type": "ephemeral"}
+        assert calls[1]["system"][0]["cache_control"] == {"type": "ephemeral"}
+
+    def test_batch_session_polls_until_ended(self, monkeypatch):
+        from types import SimpleNamespace as NS
+        from src.agent.controller import _BatchSession
+
+        monkeypatch.setattr(_BatchSession, "POLL_SECONDS", 0.0)
+        created = []
+
+        class FakeBatches:
+            polls = 0
+
+            def create(self, requests):
+                created.append(requests[0])
+                return NS(id="b1", processing_status="in_progress")
+
+            def retrieve(self, batch_id):
+                self.polls += 1
+                status = "ended" if self.polls >= 2 else "in_progress"
+                return NS(id=batch_id, processing_status=status)
+
+            def results(self, batch_id):
+                content = created[-1]["params"]["messages"][-1]["content"][0]["text"]
+                message = NS(content=[NS(type="text", text=f"reply to {content}")])
+                yield NS(custom_id="x", result=NS(type="succeeded", message=message))
+
+        client = NS(messages=NS(batches=FakeBatches()))
+        session = _BatchSession("claude-test", "sys", client=client)
+        ticks = []
+        assert session.send("a", on_text=ticks.append) == "reply to a"
+        assert ticks == ["", ""]
+        assert session.send("b") == "reply to b"
+        assert created[1]["params"]["system"][0]["text"] == "sys"
+        assert [m["role"] for m in created[1]["params"]["messages"]] == ["user", "assistant", "user"]
+
+    def test_close_aborts_sdk_and_batch_requests(self):
+        import threading
+        from contextlib import contextmanager
+        from types import SimpleNamespace as NS
+        from src.agent.controller import _BatchSession, _SDKSession
+
+        class BlockingStream:
+            def __init__(self):
+                self.closed = threading.Event()
+
+            @property
+            def text_stream(self):
+                yield "partial"
+                self.closed.wait(10)
+                raise ConnectionError("stream closed")
+
+            def close(self):
+                self.closed.set()
+
+        @contextmanager
+        def stream(**kwargs):
+            yield BlockingStream()
+
+        canceled = []
+        batches = NS(
+            create=lambda requests: NS(id="b1", processing_status="in_progress"),
+            retrieve=lambda batch_id: NS(id=batch_id, processing_status="in_progress"),
+            cancel=canceled.append,
+        )
+        client = NS(messages=NS(stream=stream, batches=batches))
+        for session in (_SDKSession("m", "sys", client=client), _BatchSession("m", "sys", client=client)):
+            errors = []
+
+            def send():
+                try:
+                    session.send("a")
+                except RuntimeError as e:
+                    errors.append(e)
+
+            worker = threading.Thread(target=send)
+            worker.start()
+            time.sleep(0.2)
+            session.close()
+            worker.join(5)
+            assert not worker.is_alive()
+            assert "closed" in str(errors[0])
+        assert canceled == ["b1"]
+
+    def test_run_does_not_wait_for_background_plan_after_error(self, tmp_path, monkeypatch):
+        import threading
+        from src.agent.controller import AgentConfig, AgentController
+
+        controller = AgentController(AgentConfig(), LibraryManager(tmp_path / "lib"))
+        release = threading.Event()
+        monkeypatch.setattr(controller, "_check_claude_available", lambda: None)
+        monkeypatch.setattr(controller, "_get_session", lambda role, system: None)
+
+        def failing_cycle(cycle_num, total):
+            controller._planner.submit(release.wait, 30)
+            raise RuntimeError("boom")
+
+        monkeypatch.setattr(controller, "_run_cycle", failing_cycle)
+        start = time.monotonic()
+        try:
+            with pytest.raises(RuntimeError, match="boom"):
+                controller.run(1)
+            assert time.monotonic() - start < 5
+        finally:
+            release.set()
+
+    def test_session_reports_exit(self, tmp_path):
+        import sys
+        from src.agent.controller import _ClaudeSession
+
+        script = tmp_path / "dead_claude.py"
+        script.write_text("import sys; sys.stderr.write('boom'); sys.exit(3)\n")
+        session = _ClaudeSession([sys.executable, str(script)])
+        try:
+            with pytest.raises(RuntimeError):
+                session.send("plan", timeout=10)
+        finally:
+            session.close()
+
+
 class TestZ3Integration:
     """Test Z3 model finding integrated with the full pipeline."""
 
@@ -120,6 +120,20 @@ class TestLibraryManager:
         assert discovered[0]["name"] == "TestDiscovery"
         assert discovered[0]["score"] == 0.75
 
+    def test_list_with_limit(self, lib):
+        from src.library.known_structures import group, ring, semigroup
+        assert lib.list_known(limit=3) == lib.list_known()[:3]
+        assert lib.count_known() == len(lib.list_known())
+
+        for i, factory in enumerate([semigroup, group, ring]):
+            lib.add_discovery(factory(), f"Disc{i}", "", ScoreBreakdown(total=0.5))
+        assert lib.count_discovered() == 3
+        assert lib.list_discovered(limit=2) == lib.list_discovered()[:2]
+
+        stream = lib.iter_discovered()
+        assert next(stream)["name"] == "Disc0"
+        assert [d["name"] for d in stream] == ["Disc1", "Disc2"]
+
     def test_add_conjecture(self, lib):
         lib.add_conjecture("TestSig", "x*y = y*x", "open")
         conj_file = lib.base_path / "conjectures" / "open.json"
@@ -141,6 +155,40 @@ class TestLibraryManager:
         results = lib.search("custom")
         assert len(results) >= 1
 
+    def test_search_sees_files_added_elsewhere(self, lib):
+        from src.library.known_structures import group, semigroup
+        lib.add_discovery(semigroup(), "FirstFind", "", ScoreBreakdown(total=0.6))
+        assert [r["name"] for r in lib.search("find")] == ["FirstFind"]
+
+        # Another manager (e.g. a second session) writes to the same library
+        other = LibraryManager(lib.base_path)
+        other.add_discovery(group(), "SecondFind", "", ScoreBreakdown(total=0.4))
+        assert [r["name"] for r in lib.search("find")] == ["FirstFind", "SecondFind"]
+        assert [r["name"] for r in lib.search("find", min_score=0.5)] == ["FirstFind"]
+
     def test_known_fingerprints(self, lib):
         fps = lib.known_fingerprints()
         assert len(fps) >= 10
+
+    def test_known_fingerprints_cached_copy(self, lib):
+        fps = lib.known_fingerprints()
+        fps.append("not-a-real-fingerprint")
+        assert lib.known_fingerprints() == fps[:-1]
+        assert "not-a-real-fingerprint" not in lib.all_fingerprints()
+
+    def test_known_fingerprints_frozen_shared(self, lib):
+        known = lib.known_fingerprints_frozen()
+        assert lib.known_fingerprints_frozen() is known
+        assert known == frozenset(lib.known_fingerprints())
+        assert known <= lib.all_fingerprints_frozen()
+
+    def test_fingerprint_set_refreshed_on_add(self, lib):
+        from src.library.known_structures import group
+        before = lib.all_fingerprints_frozen()
+        assert lib.all_fingerprints_frozen() is before
+
+        sig = group()
+        sig.axioms = sig.axioms[:2]
+        assert sig.fingerprint() not in before
+        lib.add_discovery(sig, "TruncatedGroup", "", ScoreBreakdown(total=0.5))
+        assert lib.all_fingerprints_frozen() == before | {sig.fingerprint()}
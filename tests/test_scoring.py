@@ -103,6 +103,19 @@ class TestNovelty:
         score = scorer.score(sig, known_fingerprints={fp})
         assert score.is_novel == 0.0
 
+    def test_excluded_fingerprint_counts_as_novel(self, scorer):
+        sig = Signature(
+            name="Self",
+            sorts=[Sort("S")],
+            operations=[Operation("mul", ["S", "S"], "S")],
+            axioms=[],
+        )
+        fps = frozenset({sig.fingerprint(), "0123456789abcdef"})
+        score = scorer.score(sig, known_fingerprints=fps, exclude_fingerprint=sig.fingerprint())
+        assert score.is_novel == 1.0
+        score = scorer.score(sig, known_fingerprints=fps, exclude_fingerprint="0123456789abcdef")
+        assert score.is_novel == 0.0
+
 
 class TestModelScores:
     def test_has_models(self, scorer):
@@ -224,6 +237,32 @@ class TestTotalScore:
         assert d["richness"] == 0.8
         assert d["total"] == 0.65
 
+    def test_score_many_matches_score(self, scorer):
+        from src.library.known_structures import load_all_known
+        sigs = load_all_known()
+        known = frozenset(s.fingerprint() for s in sigs[:3])
+        excludes = [sigs[0].fingerprint()] + [None] * (len(sigs) - 1)
+
+        batch = scorer.score_many(sigs, known_fingerprints=known, exclude_fingerprints=excludes)
+        assert len(batch) == len(sigs)
+        for sig, exclude, bd in zip(sigs, excludes, batch):
+            single = scorer.score(sig, known_fingerprints=known, exclude_fingerprint=exclude)
+            assert bd.total == pytest.approx(single.total)
+            assert bd.is_novel == single.is_novel
+
+    def test_score_many_empty(self, scorer):
+        assert scorer.score_many([]) == []
+
+    def test_upper_bound_never_below_score(self, scorer):
+        from src.library.known_structures import load_all_known
+        from src.moves.engine import MoveEngine
+        sigs = [r.signature for r in MoveEngine().apply_all_moves(load_all_known())]
+        known = frozenset(s.fingerprint() for s in load_all_known())
+        spectrum = ModelSpectrum("X", spectrum={2: 1, 3: 0, 4: 2})
+        for sig in sigs:
+            for spec, fps in ((None, known), (spectrum, None), (spectrum, known)):
+                assert scorer.upper_bound(sig, spec, fps) >= scorer.score(sig, spec, fps).total
+
 
 class TestEconomySteeper:
     def test_economy_steeper_past_8(self, scorer):
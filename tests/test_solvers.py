@@ -199,6 +199,24 @@ class TestZ3Solver:
         assert 3 in spectrum.spectrum
         assert spectrum.spectrum[2] >= 1
 
+    def test_spectrum_keeps_example_models_only(self, z3_finder):
+        """Counts cover every model found, but only a few tables are kept."""
+        spectrum = z3_finder.compute_spectrum(
+            semigroup(), min_size=2, max_size=2, max_models_per_size=10,
+        )
+        assert spectrum.spectrum[2] > 2
+        assert len(spectrum.models_by_size[2]) == 2
+        assert len(list(spectrum.iter_models(2))) == 2
+        assert list(spectrum.iter_models(3)) == []
+
+    def test_shared_solver_matches_fresh(self, z3_finder):
+        """Reusing one solver across sizes (push/pop) finds the same models."""
+        solver = z3_finder.new_solver()
+        for size in (2, 3, 2):
+            shared = z3_finder.find_models(group(), size, max_models=5, solver=solver)
+            fresh = z3_finder.find_models(group(), size, max_models=5)
+            assert len(shared.models_found) == len(fresh.models_found)
+
     def test_timeout_sets_timed_out_flag(self):
         """When Z3 times out, the result should have timed_out=True."""
         from src.solvers.z3_solver import Z3ModelFinder
@@ -384,6 +402,78 @@ class TestSmartSolverRouter:
         assert len(spectrum.timed_out_sizes) > 0
 
 
+    def test_portfolio_z3_win_kills_mace4(self, tmp_path):
+        """In portfolio mode a definite Z3 answer cancels a slow Mace4 run."""
+        import time
+        from src.solvers.mace4 import Mace4Solver
+        from src.solvers.router import SmartSolverRouter
+
+        slow_mace4 = tmp_path / "mace4"
+        slow_mace4.write_text("#!/bin/sh\nexec sleep 30\n")
+        slow_mace4.chmod(0o755)
+
+        router = SmartSolverRouter(portfolio=True)
+        if not router._z3_normal.is_available():
+            pytest.skip("Z3 not available")
+        router._mace4 = Mace4Solver(str(slow_mace4), timeout=30)
+        router._mace4_available = True
+
+        start = time.monotonic()
+        spectrum = router.compute_spectrum(semigroup(), min_size=2, max_size=2, max_models_per_size=3)
+        assert time.monotonic() - start < 10
+        assert spectrum.spectrum[2] == 3
+        assert spectrum.timed_out_sizes == []
+
+    def test_mace4_spectrum_translates_axioms_once(self, tmp_path, monkeypatch):
+        from src.solvers.mace4 import Mace4Solver
+
+        # Records each input it is fed and reports no models
+        fake_mace4 = tmp_path / "mace4"
+        fake_mace4.write_text(f"#!/bin/sh\ncat > {tmp_path}/input_$2.in\n")
+        fake_mace4.chmod(0o755)
+        solver = Mace4Solver(str(fake_mace4), timeout=10)
+        calls = []
+        translate = solver.translator.mace4_assumptions
+        monkeypatch.setattr(solver.translator, "mace4_assumptions",
+                            lambda sig: calls.append(sig) or translate(sig))
+
+        spectrum = solver.compute_spectrum(semigroup(), min_size=2, max_size=4)
+        assert spectrum.spectrum == {2: 0, 3: 0, 4: 0}
+        assert len(calls) == 1
+        for size in (2, 3, 4):
+            fed = (tmp_path / f"input_{size}.in").read_text()
+            assert fed == FOLTranslator().to_mace4(semigroup(), size)
+
+    def test_prove_many_runs_in_parallel_and_keeps_order(self, tmp_path):
+        import time
+        from src.solvers.prover9 import Prover9Solver, ProofStatus
+
+        fake_prover9 = tmp_path / "prover9"
+        fake_prover9.write_text("#!/bin/sh\ncat > /dev/null\nsleep 0.5\necho 'THEOREM PROVED'\n")
+        fake_prover9.chmod(0o755)
+        conjectures = [make_comm_equation(op) for op in ("a", "b", "c", "d")]
+        start = time.monotonic()
+        results = Prover9Solver(str(fake_prover9)).prove_many(
+            semigroup(), conjectures, max_workers=4,
+        )
+        assert time.monotonic() - start < 1.5
+        assert [r.conjecture for r in results] == [repr(c) for c in conjectures]
+        assert all(r.status == ProofStatus.PROVED for r in results)
+
+    def test_mace4_cancel_returns_timed_out(self, tmp_path):
+        import threading
+        from src.solvers.mace4 import Mace4Solver
+
+        slow_mace4 = tmp_path / "mace4"
+        slow_mace4.write_text("#!/bin/sh\nexec sleep 30\n")
+        slow_mace4.chmod(0o755)
+        cancel = threading.Event()
+        cancel.set()
+        result = Mace4Solver(str(slow_mace4), timeout=30).find_models(semigroup(), 2, cancel=cancel)
+        assert result.timed_out
+        assert result.models_found == []
+
+
 class TestScoringTimeoutAwareness:
     """Test that the scoring engine distinguishes timeout from proven-0."""
 
@@ -473,6 +563,67 @@ class TestParallelComputeSpectra:
         # Both should find the same number of models at each size
         assert sequential[0].spectrum == parallel[0].spectrum
 
+    def test_parallel_single_item_runs_in_process(self, monkeypatch):
+        """A single work item never spins up a process pool."""
+        import src.solvers.parallel as parallel
+        from src.solvers.z3_solver import Z3ModelFinder
+        if not Z3ModelFinder().is_available():
+            pytest.skip("z3-solver not installed")
+
+        def no_pool(*args, **kwargs):
+            raise AssertionError("ProcessPoolExecutor should not be used")
+
+        monkeypatch.setattr(parallel, "ProcessPoolExecutor", no_pool)
+        spectra = parallel.parallel_compute_spectra(
+            [(semigroup(), 2, 3, 5, 10000, 30)], max_workers=8,
+        )
+        assert len(spectra) == 1
+        assert spectra[0].spectrum[2] >= 1
+
+    def test_iter_compute_spectra_indexes_results(self):
+        """Streamed results carry their work-item index, whatever the completion order."""
+        from src.solvers.parallel import iter_compute_spectra
+        from src.solvers.z3_solver import Z3ModelFinder
+        if not Z3ModelFinder().is_available():
+            pytest.skip("z3-solver not installed")
+
+        work_items = [
+            (semigroup(), 2, 3, 5, 10000, 30),
+            (group(), 2, 3, 5, 10000, 30),
+            (magma(), 2, 3, 5, 10000, 30),
+        ]
+        by_index = dict(iter_compute_spectra(work_items, max_workers=2))
+        assert sorted(by_index) == [0, 1, 2]
+        assert by_index[0].signature_name == "Semigroup"
+        assert by_index[1].signature_name == "Group"
+        assert by_index[2].signature_name == "Magma"
+        assert list(iter_compute_spectra([])) == []
+
+    def test_identical_problems_solved_once(self, monkeypatch):
+        """Renamed copies of one signature share a single solver run."""
+        import src.solvers.parallel as parallel
+        from src.solvers.z3_solver import Z3ModelFinder
+        if not Z3ModelFinder().is_available():
+            pytest.skip("z3-solver not installed")
+
+        calls = []
+        worker = parallel._spectrum_worker
+        monkeypatch.setattr(
+            parallel, "_spectrum_worker", lambda item: calls.append(item) or worker(item),
+        )
+        copy = semigroup()
+        copy.name = "SemigroupAgain"
+        spectra = parallel.parallel_compute_spectra([
+            (semigroup(), 2, 3, 5, 10000, 30),
+            (magma(), 2, 3, 5, 10000, 30),
+            (copy, 2, 3, 5, 10000, 30),
+        ], max_workers=1)
+
+        assert len(calls) == 2
+        assert [s.signature_name for s in spectra] == ["Semigroup", "Magma", "SemigroupAgain"]
+        assert spectra[2].spectrum == spectra[0].spectrum
+        assert spectra[2].spectrum is not spectra[0].spectrum
+
     def test_parallel_empty_work_items(self):
         """Empty work items returns empty list."""
         from src.solvers.parallel import parallel_compute_spectra